@@ -0,0 +1,25 @@
+"""
+Benchmark for loading the static GTFS index of the VVS alerts translator:
+scanning the GTFS zip versus loading the persisted index.
+
+    python benchmarks/bench_gtfs_index.py [gtfsfile] [iterations]
+"""
+import sys
+import tempfile
+import timeit
+
+from gtfs_realtime_translators.translators.de_vvs import DeVVSGtfsIdMapper
+
+
+def main(gtfsfile='test/fixtures/de_vvs.gtfs.zip', iterations=5):
+    iterations = int(iterations)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = min(timeit.repeat(lambda: DeVVSGtfsIdMapper(gtfsfile), number=iterations, repeat=3)) / iterations
+        DeVVSGtfsIdMapper(gtfsfile, cache_dir=cache_dir)
+        warm = min(timeit.repeat(lambda: DeVVSGtfsIdMapper(gtfsfile, cache_dir=cache_dir),
+                                 number=iterations, repeat=3)) / iterations
+    print(f'scan {cold * 1e3:8.2f} ms   cached index {warm * 1e3:6.2f} ms')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
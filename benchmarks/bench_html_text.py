@@ -0,0 +1,44 @@
+"""
+Micro-benchmark for converting VVS alert descriptions to text: BeautifulSoup
+with lxml versus `convert_html_to_text` and the memoizing `HtmlTextCache`.
+
+    python benchmarks/bench_html_text.py [iterations]
+"""
+import glob
+import sys
+import timeit
+
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.parsers import HtmlTextCache, convert_html_to_text, html_to_text_reference
+
+
+def load_descriptions():
+    descriptions = []
+    for path in sorted(glob.glob('test/fixtures/de_vvs_gtfsr-alerts_*.pb')):
+        with open(path, 'rb') as f:
+            feed = gtfs_realtime.FeedMessage()
+            feed.ParseFromString(f.read())
+        descriptions.extend(translation.text for entity in feed.entity
+                            for translation in entity.alert.description_text.translation)
+    return descriptions
+
+
+def main(iterations=5):
+    descriptions = load_descriptions()
+    cache = HtmlTextCache()
+    cases = [
+        ('BeautifulSoup', html_to_text_reference),
+        ('HTMLParser', convert_html_to_text),
+        ('cached', cache),
+    ]
+    for name, convert in cases:
+        assert [convert(description) for description in descriptions] == \
+            [html_to_text_reference(description) for description in descriptions]
+        seconds = min(timeit.repeat(lambda: [convert(description) for description in descriptions],
+                                    number=iterations, repeat=3)) / iterations
+        print(f'{name:<14} {seconds * 1e3:8.2f} ms per poll ({len(descriptions)} descriptions)')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,79 @@
+"""
+Cold-start benchmark: eager versus lazy translator imports, each measured in
+a fresh interpreter.
+
+For every scenario the eager variant imports what it needs up front, like
+the registry did before translators were registered lazily, and the lazy
+variant goes through `TranslatorRegistry.get`.
+
+    python benchmarks/bench_import.py [runs]
+"""
+import subprocess
+import sys
+
+IMPORT_ALL = """
+import importlib
+from gtfs_realtime_translators.registry import TranslatorRegistry
+for reference in TranslatorRegistry.TRANSLATORS.values():
+    importlib.import_module(reference.partition(':')[0])
+"""
+
+SCENARIOS = [
+    ('import registry',
+     IMPORT_ALL, """
+import gtfs_realtime_translators.registry
+"""),
+    ('import registry, get cta-bus',
+     IMPORT_ALL + """
+TranslatorRegistry.get('cta-bus')
+""", """
+from gtfs_realtime_translators.registry import TranslatorRegistry
+TranslatorRegistry.get('cta-bus')
+"""),
+    ('import cta-bus class, get cta-bus', """
+from gtfs_realtime_translators.translators.cta_bus import CtaBusGtfsRealtimeTranslator
+""", """
+from gtfs_realtime_translators.registry import TranslatorRegistry
+TranslatorRegistry.get('cta-bus')
+"""),
+    ('import registry, get all translators',
+     IMPORT_ALL + """
+for key in TranslatorRegistry.TRANSLATORS:
+    TranslatorRegistry.get(key)
+""", """
+from gtfs_realtime_translators.registry import TranslatorRegistry
+for key in TranslatorRegistry.TRANSLATORS:
+    TranslatorRegistry.get(key)
+"""),
+]
+
+MEASURE = """
+import sys, time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start, len(sys.modules))
+"""
+
+
+def measure(code):
+    output = subprocess.run([sys.executable, '-c', MEASURE.format(code=code)],
+                            check=True, capture_output=True, text=True).stdout.split()
+    return float(output[-2]), int(output[-1])
+
+
+def best_of(code, runs):
+    results = [measure(code) for _ in range(runs)]
+    return min(elapsed for elapsed, _ in results), results[0][1]
+
+
+def main(runs=5):
+    print(f'{"":<38} {"eager":>20} {"lazy":>20}  {"speedup":>6}')
+    for name, eager_code, lazy_code in SCENARIOS:
+        eager_time, eager_modules = best_of(eager_code, runs)
+        lazy_time, lazy_modules = best_of(lazy_code, runs)
+        print(f'{name:<38} {eager_time * 1e3:7.1f} ms {eager_modules:4d} mods '
+              f'{lazy_time * 1e3:7.1f} ms {lazy_modules:4d} mods  {eager_time / lazy_time:5.1f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
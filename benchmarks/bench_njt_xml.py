@@ -0,0 +1,61 @@
+"""
+Time and peak memory of the NJT translators on full-system sized documents,
+built by repeating the fixture items. When `xmltodict` is installed, parsing
+the document into a dict tree, as the translators used to, is measured for
+comparison.
+
+    python benchmarks/bench_njt_xml.py [scale]
+"""
+import sys
+import time
+import tracemalloc
+
+from gtfs_realtime_translators.translators import NjtBusGtfsRealtimeTranslator, NjtRailGtfsRealtimeTranslator
+
+try:
+    import xmltodict
+except ImportError:
+    xmltodict = None
+
+
+def read_fixture(name):
+    with open(f'test/fixtures/{name}') as f:
+        return f.read()
+
+
+def repeat_elements(document, tag, scale):
+    start = document.index(f'<{tag}>')
+    end = document.rindex(f'</{tag}>') + len(f'</{tag}>')
+    return document[:start] + document[start:end] * scale + document[end:]
+
+
+def measure(function):
+    elapsed = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        function()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(scale=20):
+    for name, translator, raw in [
+            ('NJT rail', NjtRailGtfsRealtimeTranslator(), repeat_elements(read_fixture('njt_rail.xml'), 'ITEM', scale)),
+            ('NJT bus', NjtBusGtfsRealtimeTranslator(stop_list='2916, 39787'),
+             repeat_elements(read_fixture('njt_bus.xml'), 'TRIP', scale * 50)),
+            # a stop filter that none of the stops match
+            ('NJT bus', NjtBusGtfsRealtimeTranslator(stop_list='43283'),
+             repeat_elements(read_fixture('njt_bus.xml'), 'TRIP', scale * 50))]:
+        elapsed, peak = measure(lambda: translator(raw))
+        print(f'{name:<9} {len(raw) / 1e6:5.1f} MB   translate: {elapsed * 1e3:7.1f} ms, {peak / 1e6:6.1f} MB peak')
+        if xmltodict is not None:
+            elapsed, peak = measure(lambda: xmltodict.parse(raw))
+            print(f'{"":<9} {"":<8}   xmltodict.parse: {elapsed * 1e3:7.1f} ms, {peak / 1e6:6.1f} MB peak')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,67 @@
+"""
+Peak memory and time of translating a large MBTA / PATH response as a
+whole document versus with `translate_stream` from a file.
+
+    python benchmarks/bench_streaming.py [scale]
+"""
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+import pendulum
+
+from gtfs_realtime_translators.translators import MbtaGtfsRealtimeTranslator, PathNewGtfsRealtimeTranslator
+
+
+def read_fixture(name):
+    with open(f'test/fixtures/{name}') as f:
+        return json.load(f)
+
+
+def mbta_document(scale):
+    document = read_fixture('mbta_bus.json')
+    predictions, included = document['data'], document['included']
+    document['data'] = [prediction for _ in range(scale) for prediction in predictions]
+    # responses carry many more resources and attributes than the feed uses
+    padding = {'description': 'x' * 200, 'wheelchair_boarding': 1, 'platform_name': None}
+    document['included'] = [dict(entity, attributes={**entity['attributes'], **padding})
+                            for _ in range(scale) for entity in included]
+    return json.dumps(document).encode('utf-8')
+
+
+def path_document(scale):
+    document = read_fixture('path_new.json')
+    document['stations'] = document['stations'] * scale
+    return json.dumps(document).encode('utf-8')
+
+
+def measure(translate):
+    elapsed = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        message = translate()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    # tracing slows allocations down, so peak memory is taken in a second run
+    tracemalloc.start()
+    translate()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return message, elapsed, peak
+
+
+def main(scale=200):
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 35), freeze=True):
+        for name, translator, raw in [('MBTA', MbtaGtfsRealtimeTranslator(), mbta_document(scale)),
+                                      ('PATH new', PathNewGtfsRealtimeTranslator(), path_document(scale))]:
+            whole, whole_time, whole_peak = measure(lambda: translator(io.BytesIO(raw).read()))
+            streamed, stream_time, stream_peak = measure(lambda: translator.translate_stream(io.BytesIO(raw)))
+            assert whole == streamed
+            print(f'{name:<9} {len(raw) / 1e6:6.1f} MB, {len(whole.entity)} entities   '
+                  f'whole: {whole_peak / 1e6:6.1f} MB peak {whole_time * 1e3:7.1f} ms   '
+                  f'streamed: {stream_peak / 1e6:6.1f} MB peak {stream_time * 1e3:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
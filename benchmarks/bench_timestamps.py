@@ -0,0 +1,46 @@
+"""
+Micro-benchmark for vendor timestamp parsing: pendulum versus the
+precompiled parsers in `gtfs_realtime_translators.parsers`.
+
+    python benchmarks/bench_timestamps.py [iterations]
+"""
+import sys
+import timeit
+
+import pendulum
+
+from gtfs_realtime_translators.parsers import FormatParser, parse_iso8601
+
+TIMEZONE = 'America/New_York'
+NJT_RAIL = FormatParser('DD-MMM-YYYY HH:mm:ss A')
+NJT_BUS = FormatParser('DD-MMM-YY HH:mm A')
+
+CASES = [
+    ('CTA bus',
+     lambda: pendulum.parse('20191008 10:38').in_tz('America/Chicago').int_timestamp,
+     lambda: parse_iso8601('20191008 10:38')),
+    ('MBTA',
+     lambda: pendulum.parse('2023-05-03T16:05:15-04:00').in_tz(TIMEZONE).int_timestamp,
+     lambda: parse_iso8601('2023-05-03T16:05:15-04:00')),
+    ('SEPTA',
+     lambda: int(pendulum.parse('2019-04-26 15:12:01.000', tz=TIMEZONE).timestamp()),
+     lambda: parse_iso8601('2019-04-26 15:12:01.000', tz=TIMEZONE)),
+    ('NJT rail',
+     lambda: int(pendulum.from_format('02-Oct-2019 03:02:00 PM', 'DD-MMM-YYYY HH:mm:ss A', tz=TIMEZONE).timestamp()),
+     lambda: NJT_RAIL.timestamp('02-Oct-2019 03:02:00 PM', tz=TIMEZONE)),
+    ('NJT bus',
+     lambda: int(pendulum.from_format('01-Jul-21 8:39 AM', 'DD-MMM-YY HH:mm A', tz=TIMEZONE).timestamp()),
+     lambda: NJT_BUS.timestamp('01-Jul-21 8:39 AM', tz=TIMEZONE)),
+]
+
+
+def main(iterations=2000):
+    for name, slow, fast in CASES:
+        assert slow() == fast()
+        slow_time = min(timeit.repeat(slow, number=iterations, repeat=3)) / iterations
+        fast_time = min(timeit.repeat(fast, number=iterations, repeat=3)) / iterations
+        print(f'{name:<10} pendulum {slow_time * 1e6:8.2f} us   parsers {fast_time * 1e6:6.2f} us')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
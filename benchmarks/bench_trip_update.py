@@ -0,0 +1,55 @@
+"""
+Micro-benchmark for the per-entity cost of the trip update factory.
+
+    python benchmarks/bench_trip_update.py [iterations]
+"""
+import sys
+import timeit
+
+from gtfs_realtime_translators.factories import TripUpdate, FeedMessageBuilder, FeedBytesBuilder
+
+RECORD = dict(entity_id='1',
+              trip_id='55458948-19:45-GovernmentCenterWonderlandSuspend',
+              route_id='Blue',
+              stop_id='70045',
+              direction_id=1,
+              arrival_time=1683144315,
+              departure_time=1683144381,
+              headsign='Bowdoin',
+              route_short_name='BL',
+              route_long_name='Blue Line',
+              route_color='003DA5',
+              route_text_color='FFFFFF',
+              agency_timezone='America/New_York',
+              custom_status='5 min',
+              scheduled_arrival_time=1683144300,
+              scheduled_departure_time=1683144360,
+              stop_name='Maverick',
+              track='1',
+              run_number=415)
+
+
+def bench_create(iterations):
+    return timeit.timeit(lambda: TripUpdate.create(**RECORD), number=iterations)
+
+
+def bench_builder(iterations):
+    builder = FeedMessageBuilder()
+    return timeit.timeit(lambda: builder.add_trip_update(**RECORD), number=iterations)
+
+
+def bench_bytes_builder(iterations):
+    builder = FeedBytesBuilder()
+    return timeit.timeit(lambda: builder.add_trip_update(**RECORD), number=iterations)
+
+
+def main(iterations=20000):
+    for name, bench in [('TripUpdate.create', bench_create),
+                        ('FeedMessageBuilder.add_trip_update', bench_builder),
+                        ('FeedBytesBuilder.add_trip_update', bench_bytes_builder)]:
+        elapsed = min(bench(iterations) for _ in range(3))
+        print(f'{name:<40} {elapsed / iterations * 1e6:8.2f} us/entity')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
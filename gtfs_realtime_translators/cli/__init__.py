@@ -0,0 +1 @@
+from .cli import TranslationStats, read_frames, write_frame, main
@@ -0,0 +1,199 @@
+import argparse
+import inspect
+import json
+import os
+import struct
+import sys
+import time
+
+from google.protobuf.json_format import MessageToJson
+
+from gtfs_realtime_translators.factories import FeedBytesBuilder, FeedJsonBuilder
+from gtfs_realtime_translators.registry import TranslatorRegistry
+
+FRAME_HEADER = struct.Struct('>I')
+
+EXTENSIONS = {'pb': '.pb', 'json': '.json'}
+
+
+def read_frames(stream):
+    """
+    Yields the payloads of a stream of frames, each a 4 byte big-endian
+    length followed by that many bytes.
+    """
+    while True:
+        header = stream.read(FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < FRAME_HEADER.size:
+            raise ValueError('Truncated frame header')
+        length, = FRAME_HEADER.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError(f'Truncated frame: expected {length} bytes, got {len(payload)}')
+        yield payload
+
+
+def write_frame(stream, data):
+    stream.write(FRAME_HEADER.pack(len(data)))
+    stream.write(data)
+
+
+class TranslationStats:
+    """
+    Collects per-payload latencies and sizes and reports throughput and
+    latency percentiles.
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.started_at = time.perf_counter()
+
+    def record(self, latency, bytes_in, bytes_out):
+        self.latencies.append(latency)
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+
+    def record_error(self):
+        self.errors += 1
+
+    def percentile(self, percent):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started_at
+        count = len(self.latencies)
+        return '\n'.join([
+            f'payloads:   {count} translated, {self.errors} failed',
+            f'elapsed:    {elapsed:.3f} s',
+            f'throughput: {count / elapsed if elapsed else 0:.1f} payloads/s, '
+            f'{self.bytes_in / elapsed / 1e6 if elapsed else 0:.2f} MB/s in, '
+            f'{self.bytes_out / elapsed / 1e6 if elapsed else 0:.2f} MB/s out',
+            f'latency:    p50 {self.percentile(50) * 1e3:.2f} ms, p95 {self.percentile(95) * 1e3:.2f} ms, '
+            f'p99 {self.percentile(99) * 1e3:.2f} ms, max {max(self.latencies, default=0) * 1e3:.2f} ms',
+        ])
+
+
+def make_translate(translator, output_format):
+    """
+    Returns a function translating one payload to serialized output. Arrivals
+    translators write through `FeedBytesBuilder` / `FeedJsonBuilder`, other
+    translators are serialized from their `FeedMessage`.
+    """
+    accepts_builder = 'builder' in inspect.signature(translator).parameters
+    if output_format == 'json':
+        if accepts_builder:
+            return lambda payload: translator(payload, builder=FeedJsonBuilder)
+        return lambda payload: MessageToJson(translator(payload)).encode('utf-8')
+    if accepts_builder:
+        return lambda payload: translator(payload, builder=FeedBytesBuilder)
+    return lambda payload: translator(payload).SerializeToString()
+
+
+def translate_all(translate, payloads, write, stats, log):
+    for name, payload in payloads:
+        start = time.perf_counter()
+        try:
+            output = translate(payload)
+        except Exception as e:
+            stats.record_error()
+            log(f'{name}: {type(e).__name__}: {e}')
+            continue
+        stats.record(time.perf_counter() - start, len(payload), len(output))
+        write(name, output)
+
+
+def directory_payloads(directory):
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                yield name, f.read()
+
+
+def parse_config(args):
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config.update(json.load(f).get(args.key, {}))
+    for option in args.option:
+        name, separator, value = option.partition('=')
+        if not separator:
+            raise SystemExit(f'Invalid --option {option!r}, expected NAME=VALUE')
+        config[name] = value
+    return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Translate captured payloads with a registered translator.')
+    parser.add_argument('key', help='registry key of the translator')
+    parser.add_argument('input', nargs='?', help='payload file or directory of payload files')
+    parser.add_argument('--stdin', action='store_true',
+                        help='read length-prefixed payloads (4 byte big-endian length) from stdin')
+    parser.add_argument('-o', '--output',
+                        help='output file, or output directory for a directory input (default: stdout)')
+    parser.add_argument('--format', choices=sorted(EXTENSIONS), default='pb', help='output format')
+    parser.add_argument('--config', help='JSON file mapping registry keys to translator configuration')
+    parser.add_argument('--option', action='append', default=[], metavar='NAME=VALUE',
+                        help='translator configuration option, may be repeated')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not print statistics')
+    args = parser.parse_args(argv)
+
+    if args.stdin == bool(args.input):
+        parser.error('either an input path or --stdin is required')
+
+    translator = TranslatorRegistry.get_instance(args.key, **parse_config(args))
+    if translator is None:
+        parser.error(f'no translator registered for key={args.key}')
+    translate = make_translate(translator, args.format)
+    stats = TranslationStats()
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    if args.input and os.path.isdir(args.input):
+        if not args.output:
+            parser.error('--output directory is required for a directory input')
+        os.makedirs(args.output, exist_ok=True)
+
+        def write(name, output):
+            path = os.path.join(args.output, os.path.splitext(name)[0] + EXTENSIONS[args.format])
+            with open(path, 'wb') as f:
+                f.write(output)
+
+        translate_all(translate, directory_payloads(args.input), write, stats, log)
+    else:
+        out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        try:
+            if args.stdin:
+                payloads = ((f'frame {index}', payload)
+                            for index, payload in enumerate(read_frames(sys.stdin.buffer)))
+                try:
+                    translate_all(translate, payloads, lambda name, output: write_frame(out, output), stats, log)
+                except ValueError as e:
+                    stats.record_error()
+                    log(f'stdin: {e}')
+            else:
+                with open(args.input, 'rb') as f:
+                    payloads = [(args.input, f.read())]
+                translate_all(translate, payloads, lambda name, output: out.write(output), stats, log)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+            else:
+                out.flush()
+
+    if not args.quiet:
+        log(stats.report())
+    return 1 if stats.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1,7 @@
-from .factories import FeedMessage, TripUpdate, Alert
+from .factories import FeedMessage, FeedMessageBuilder, TripUpdate, Alert
+from .extensions import ExtensionWriter, IntersectionExtensions
+from .encoder import FeedBytesBuilder
+from .differential import DifferentialFeedMessage, InMemoryFeedStateStore
+from .arrivals import ArrivalsTable
+from .records import ArrivalRecord
+from .feed_json import FeedJsonBuilder
@@ -0,0 +1,214 @@
+import sys
+from array import array
+
+from .factories import FeedMessageBuilder
+from .encoder import FeedBytesBuilder
+from .records import ArrivalRecord
+
+
+MISSING = -(1 << 63)
+
+
+class IntColumn:
+    """
+    Integer column backed by a signed 64 bit `array`. Missing values are
+    stored as `MISSING`.
+    """
+
+    def __init__(self, codes=None):
+        self.codes = codes if codes is not None else array('q')
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(array('q', [MISSING if value is None else value for value in values]))
+
+    def append(self, value):
+        self.codes.append(MISSING if value is None else value)
+
+    def __getitem__(self, row):
+        value = self.codes[row]
+        return None if value == MISSING else value
+
+    def __len__(self):
+        return len(self.codes)
+
+    def take(self, rows):
+        codes = self.codes
+        return IntColumn(array('q', [codes[row] for row in rows]))
+
+    def where(self, predicate):
+        return [row for row, value in enumerate(self.values()) if predicate(value)]
+
+    def values(self):
+        return [None if value == MISSING else value for value in self.codes]
+
+
+class StringColumn:
+    """
+    Dictionary-encoded string column. Every distinct value is interned once in
+    `pool` and rows only store its index; missing values are stored as -1.
+    Columns derived with `take` start with a copy of the pool of their
+    source, so appending to either does not change the other.
+    """
+
+    def __init__(self, codes=None, pool=None, index=None):
+        self.codes = codes if codes is not None else array('l')
+        self.pool = pool if pool is not None else []
+        self.index = index if index is not None else {}
+
+    @classmethod
+    def from_values(cls, values):
+        column = cls()
+        column.extend(values)
+        return column
+
+    def append(self, value):
+        self.codes.append(self.__encode(value))
+
+    def extend(self, values):
+        encode = self.__encode
+        self.codes.extend(array('l', [encode(value) for value in values]))
+
+    def __encode(self, value):
+        if value is None:
+            return -1
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.pool)
+            self.index[value] = code
+            self.pool.append(sys.intern(value) if type(value) is str else value)
+        return code
+
+    def __getitem__(self, row):
+        code = self.codes[row]
+        return None if code < 0 else self.pool[code]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def take(self, rows):
+        codes = self.codes
+        return StringColumn(array('l', [codes[row] for row in rows]), list(self.pool), dict(self.index))
+
+    def where(self, predicate):
+        # the predicate is evaluated once per distinct value, not once per row
+        matches = [predicate(value) for value in self.pool]
+        missing = predicate(None)
+        return [row for row, code in enumerate(self.codes)
+                if (matches[code] if code >= 0 else missing)]
+
+    def values(self):
+        pool = self.pool
+        return [None if code < 0 else pool[code] for code in self.codes]
+
+
+class ArrivalsTable:
+    """
+    Columnar intermediate representation of arrivals. Times, delays and other
+    integers live in array-backed columns, ids and names in interned string
+    columns.
+
+    `ArrivalsTable` implements the builder interface, so arrivals translators
+    fill it in bulk when it is passed as their builder. The table can then be
+    filtered and sorted column-wise and written to any builder in one batch:
+
+    table = translator(data, builder=ArrivalsTable)
+    table = table.where('stop_id', lambda stop_id: stop_id in stop_ids).sort_by('arrival_time')
+    feed_message = table.to_feed_message()
+    feed_bytes = table.to_bytes()
+    """
+
+    STRING_FIELDS = ('entity_id', 'trip_id', 'route_id', 'stop_id',
+                     'headsign', 'route_short_name', 'route_long_name', 'route_color',
+                     'route_text_color', 'block_id', 'agency_timezone', 'custom_status',
+                     'route_icon', 'track', 'stop_name')
+    INT_FIELDS = ('direction_id', 'arrival_time', 'departure_time', 'arrival_delay',
+                  'departure_delay', 'scheduled_arrival_time', 'scheduled_departure_time',
+                  'scheduled_interval', 'run_number')
+    FIELDS = STRING_FIELDS + INT_FIELDS
+
+    def __init__(self, group_by_trip=False, columns=None):
+        self.group_by_trip = group_by_trip
+        if columns is None:
+            columns = {field: StringColumn() for field in self.STRING_FIELDS}
+            columns.update({field: IntColumn() for field in self.INT_FIELDS})
+        self.columns = columns
+
+    @classmethod
+    def from_columns(cls, columns, group_by_trip=False):
+        """
+        Builds a table from whole columns at once, e.g. values collected per
+        field while parsing a vendor response:
+
+        table = ArrivalsTable.from_columns({'entity_id': entity_ids, 'stop_id': stop_ids,
+                                            'arrival_time': arrival_times})
+
+        `entity_id` and `stop_id` are required, other fields default to
+        missing in every row. All columns must have the same length.
+        """
+        unknown = set(columns) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f'Unknown arrivals table fields: {sorted(unknown)}')
+        for field in ('entity_id', 'stop_id'):
+            if field not in columns:
+                raise ValueError(f'Missing arrivals table field: {field}')
+        columns = {field: list(values) for field, values in columns.items()}
+        length = len(columns['entity_id'])
+        if any(len(values) != length for values in columns.values()):
+            raise ValueError('Arrivals table columns differ in length')
+
+        missing = [None] * length
+        table_columns = {field: StringColumn.from_values(columns.get(field, missing))
+                         for field in cls.STRING_FIELDS}
+        table_columns.update({field: IntColumn.from_values(columns.get(field, missing))
+                              for field in cls.INT_FIELDS})
+        return cls(group_by_trip=group_by_trip, columns=table_columns)
+
+    def add_trip_update(self, *args, **kwargs):
+        record = ArrivalRecord.coerce(*args, **kwargs)
+        for field, column in self.columns.items():
+            column.append(getattr(record, field))
+        return len(self) - 1
+
+    def build(self):
+        return self
+
+    def __len__(self):
+        return len(self.columns['entity_id'])
+
+    def column(self, field):
+        return self.columns[field].values()
+
+    def take(self, rows):
+        rows = list(rows)
+        return ArrivalsTable(group_by_trip=self.group_by_trip,
+                             columns={field: column.take(rows) for field, column in self.columns.items()})
+
+    def where(self, field, predicate):
+        return self.take(self.columns[field].where(predicate))
+
+    def sort_by(self, *fields, reverse=False):
+        keys = [self.column(field) for field in fields]
+        def sort_key(row):
+            return tuple((key[row] is None, key[row]) for key in keys)
+        return self.take(sorted(range(len(self)), key=sort_key, reverse=reverse))
+
+    def rows(self):
+        """
+        Yields every row as an `ArrivalRecord`.
+        """
+        fields = list(self.columns)
+        columns = [column.values() for column in self.columns.values()]
+        for values in zip(*columns):
+            yield ArrivalRecord(**dict(zip(fields, values)))
+
+    def write_to(self, builder):
+        for record in self.rows():
+            builder.add_trip_update(record)
+        return builder.build()
+
+    def to_feed_message(self):
+        return self.write_to(FeedMessageBuilder(group_by_trip=self.group_by_trip))
+
+    def to_bytes(self):
+        return self.write_to(FeedBytesBuilder(group_by_trip=self.group_by_trip))
@@ -0,0 +1,111 @@
+import time
+
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.bindings import intersection_pb2 as intersection_gtfs_realtime
+from .factories import FeedMessage
+
+
+class InMemoryFeedStateStore:
+    """
+    Keeps the last snapshot of every feed in process memory. A snapshot maps
+    entity keys to serialized entities. Any object implementing `get(key)` and
+    `set(key, snapshot)` can be used instead, e.g. to share state between
+    workers.
+    """
+
+    def __init__(self):
+        self.snapshots = {}
+
+    def get(self, key):
+        return self.snapshots.get(key)
+
+    def set(self, key, snapshot):
+        self.snapshots[key] = snapshot
+
+
+class DifferentialFeedMessage:
+    """
+    Turns consecutive FULL_DATASET feeds of a translator into DIFFERENTIAL
+    feeds that only contain added, changed and deleted entities.
+
+    Entities are keyed deterministically instead of by their position in the
+    feed: trip updates by trip (trip_id, else block_id or run_number), route
+    and first stop; alerts and all other entities by their upstream id. The
+    key is used as entity id of the emitted entities. Deleted entities are
+    emitted with `is_deleted` set. Entities that share a key, e.g. trains
+    without trip_id at the same route and stop, are numbered in feed order.
+
+    For feeds built with `group_by_trip=True`, pass the same flag: trip
+    updates are then keyed by trip and route alone, so a trip that drops a
+    passed stop is emitted as an update of the same entity.
+
+    differential = DifferentialFeedMessage()
+    message = differential.create('cta-bus', translator(data))
+    """
+
+    def __init__(self, state_store=None, group_by_trip=False):
+        self.state_store = state_store if state_store is not None else InMemoryFeedStateStore()
+        self.group_by_trip = group_by_trip
+
+    def create(self, key, feed_message):
+        if isinstance(feed_message, bytes):
+            parsed = gtfs_realtime.FeedMessage()
+            parsed.ParseFromString(feed_message)
+            feed_message = parsed
+
+        previous = self.state_store.get(key) or {}
+        snapshot = {}
+
+        message = gtfs_realtime.FeedMessage()
+        message.header.gtfs_realtime_version = FeedMessage.VERSION
+        message.header.incrementality = gtfs_realtime.FeedHeader.DIFFERENTIAL
+        message.header.timestamp = feed_message.header.timestamp or int(time.time())
+
+        for entity in feed_message.entity:
+            entity_key = self.__unique_key(self.entity_key(entity), snapshot)
+            entity_bytes = self.__serialize_with_id(entity, entity_key)
+            snapshot[entity_key] = entity_bytes
+            if previous.get(entity_key) != entity_bytes:
+                message.entity.add().ParseFromString(entity_bytes)
+
+        for entity_key in previous:
+            if entity_key not in snapshot:
+                message.entity.add(id=entity_key, is_deleted=True)
+
+        self.state_store.set(key, snapshot)
+        return message
+
+    def entity_key(self, entity):
+        if not entity.HasField('trip_update'):
+            return entity.id
+
+        trip_update = entity.trip_update
+        trip_key = trip_update.trip.trip_id
+        if not trip_key and trip_update.HasExtension(intersection_gtfs_realtime.intersection_trip_update):
+            trip_key = trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].block_id
+        if not trip_key and trip_update.vehicle.HasExtension(intersection_gtfs_realtime.intersection_vehicle_descriptor):
+            trip_key = str(trip_update.vehicle.Extensions[intersection_gtfs_realtime.intersection_vehicle_descriptor].run_number)
+
+        if self.group_by_trip and trip_key:
+            return f'{trip_key}/{trip_update.trip.route_id}'
+        first_stop_id = trip_update.stop_time_update[0].stop_id if trip_update.stop_time_update else ''
+        return f'{trip_key}/{trip_update.trip.route_id}/{first_stop_id}'
+
+    @staticmethod
+    def __unique_key(entity_key, snapshot):
+        # e.g. two trains without trip_id on the same route and stop
+        unique_key = entity_key
+        occurrence = 1
+        while unique_key in snapshot:
+            occurrence += 1
+            unique_key = f'{entity_key}#{occurrence}'
+        return unique_key
+
+    @staticmethod
+    def __serialize_with_id(entity, entity_id):
+        original_id = entity.id
+        entity.id = entity_id
+        entity_bytes = entity.SerializeToString(deterministic=True)
+        entity.id = original_id
+        return entity_bytes
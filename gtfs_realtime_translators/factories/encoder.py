@@ -0,0 +1,222 @@
+from google.protobuf.descriptor import FieldDescriptor
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.bindings import intersection_pb2 as intersection_gtfs_realtime
+from .factories import Alert, FeedMessage, FeedMessageBuilder
+from .records import ArrivalRecord
+
+
+WIRETYPE_VARINT = 0
+WIRETYPE_LENGTH_DELIMITED = 2
+
+UNSIGNED_TYPES = {FieldDescriptor.TYPE_UINT32, FieldDescriptor.TYPE_UINT64}
+
+
+def encode_varint(value):
+    if value < 0:
+        # negative int32/int64 values are sign-extended to ten bytes
+        value += 1 << 64
+    if value < 0x80:
+        return bytes((value,))
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def tag(field, wire_type):
+    return encode_varint(field.number << 3 | wire_type)
+
+
+def field_tag(message_class, name):
+    field = message_class.DESCRIPTOR.fields_by_name[name]
+    if field.type in (FieldDescriptor.TYPE_STRING, FieldDescriptor.TYPE_MESSAGE):
+        return tag(field, WIRETYPE_LENGTH_DELIMITED)
+    return tag(field, WIRETYPE_VARINT)
+
+
+def encode_length_delimited(field_tag, payload):
+    return field_tag + encode_varint(len(payload)) + payload
+
+
+def encode_string(field_tag, value):
+    return encode_length_delimited(field_tag, value.encode('utf-8'))
+
+
+def encode_integer(field_tag, value, signed=True):
+    if not signed and value < 0:
+        raise ValueError(f'Value out of range: {value}')
+    return field_tag + encode_varint(value)
+
+
+class Tags:
+    FEED_MESSAGE_HEADER = field_tag(gtfs_realtime.FeedMessage, 'header')
+    FEED_MESSAGE_ENTITY = field_tag(gtfs_realtime.FeedMessage, 'entity')
+    ENTITY_ID = field_tag(gtfs_realtime.FeedEntity, 'id')
+    ENTITY_TRIP_UPDATE = field_tag(gtfs_realtime.FeedEntity, 'trip_update')
+    TRIP_UPDATE_TRIP = field_tag(gtfs_realtime.TripUpdate, 'trip')
+    TRIP_UPDATE_STOP_TIME_UPDATE = field_tag(gtfs_realtime.TripUpdate, 'stop_time_update')
+    TRIP_UPDATE_VEHICLE = field_tag(gtfs_realtime.TripUpdate, 'vehicle')
+    TRIP_ID = field_tag(gtfs_realtime.TripDescriptor, 'trip_id')
+    ROUTE_ID = field_tag(gtfs_realtime.TripDescriptor, 'route_id')
+    DIRECTION_ID = field_tag(gtfs_realtime.TripDescriptor, 'direction_id')
+    ARRIVAL = field_tag(gtfs_realtime.TripUpdate.StopTimeUpdate, 'arrival')
+    DEPARTURE = field_tag(gtfs_realtime.TripUpdate.StopTimeUpdate, 'departure')
+    STOP_ID = field_tag(gtfs_realtime.TripUpdate.StopTimeUpdate, 'stop_id')
+    EVENT_DELAY = field_tag(gtfs_realtime.TripUpdate.StopTimeEvent, 'delay')
+    EVENT_TIME = field_tag(gtfs_realtime.TripUpdate.StopTimeEvent, 'time')
+
+
+class ExtensionEncoder:
+    """
+    Encodes the fields of one Intersection extension from a record straight
+    into wire format. Mirrors `ExtensionWriter`: the field list comes from the
+    extension descriptor, falsy values are skipped and `StopTimeEvent` fields
+    are read from `<name>_time`.
+    """
+
+    def __init__(self, extension):
+        self.tag = tag(extension, WIRETYPE_LENGTH_DELIMITED)
+        self.fields = tuple(self.__compile_field(field)
+                            for field in extension.message_type.fields)
+
+    @staticmethod
+    def __compile_field(field):
+        if field.type == FieldDescriptor.TYPE_MESSAGE:
+            message_tag = tag(field, WIRETYPE_LENGTH_DELIMITED)
+            return f'{field.name}_time', lambda value: encode_length_delimited(message_tag, encode_integer(Tags.EVENT_TIME, value))
+        if field.type == FieldDescriptor.TYPE_STRING:
+            string_tag = tag(field, WIRETYPE_LENGTH_DELIMITED)
+            return field.name, lambda value: encode_string(string_tag, value)
+        varint_tag = tag(field, WIRETYPE_VARINT)
+        signed = field.type not in UNSIGNED_TYPES
+        return field.name, lambda value: encode_integer(varint_tag, value, signed=signed)
+
+    def encode(self, record):
+        encoded = []
+        for key, encode_field in self.fields:
+            value = getattr(record, key)
+            if value:
+                encoded.append(encode_field(value))
+        if not encoded:
+            return b''
+        return encode_length_delimited(self.tag, b''.join(encoded))
+
+
+class IntersectionExtensionEncoders:
+    TRIP_UPDATE = ExtensionEncoder(intersection_gtfs_realtime.intersection_trip_update)
+    STOP_TIME_UPDATE = ExtensionEncoder(intersection_gtfs_realtime.intersection_stop_time_update)
+    VEHICLE_DESCRIPTOR = ExtensionEncoder(intersection_gtfs_realtime.intersection_vehicle_descriptor)
+
+
+class TripUpdateEncoder:
+    """
+    Wire-format counterpart of `TripUpdate`. Takes an `ArrivalRecord` and
+    returns the encoded pieces of a trip update instead of populating message
+    objects.
+    """
+
+    @staticmethod
+    def __encode_stop_time_events(arrival, departure, value_tag):
+        arrival_event = b'' if arrival is None else encode_integer(value_tag, arrival)
+        if departure is None:
+            departure_event = arrival_event
+        else:
+            departure_event = encode_integer(value_tag, departure)
+        return (encode_length_delimited(Tags.ARRIVAL, arrival_event) +
+                encode_length_delimited(Tags.DEPARTURE, departure_event))
+
+    @staticmethod
+    def encode_trip(record):
+        """
+        Returns the trip-level fields of the `TripUpdate` that come before and
+        after its stop time updates.
+        """
+        trip_descriptor = []
+        if record.trip_id is not None:
+            trip_descriptor.append(encode_string(Tags.TRIP_ID, record.trip_id))
+        if record.route_id is not None:
+            trip_descriptor.append(encode_string(Tags.ROUTE_ID, record.route_id))
+        if record.direction_id is not None:
+            trip_descriptor.append(encode_integer(Tags.DIRECTION_ID, record.direction_id, signed=False))
+
+        vehicle_descriptor = IntersectionExtensionEncoders.VEHICLE_DESCRIPTOR.encode(record)
+
+        head = encode_length_delimited(Tags.TRIP_UPDATE_TRIP, b''.join(trip_descriptor))
+        tail = (encode_length_delimited(Tags.TRIP_UPDATE_VEHICLE, vehicle_descriptor) +
+                IntersectionExtensionEncoders.TRIP_UPDATE.encode(record))
+        return head, tail
+
+    @staticmethod
+    def encode_stop_time_update(record):
+        if record.uses_delay:
+            stop_time_update = TripUpdateEncoder.__encode_stop_time_events(record.arrival_delay,
+                                                                           record.departure_delay,
+                                                                           Tags.EVENT_DELAY)
+        else:
+            stop_time_update = TripUpdateEncoder.__encode_stop_time_events(record.arrival_time,
+                                                                           record.departure_time,
+                                                                           Tags.EVENT_TIME)
+        if record.stop_id is not None:
+            stop_time_update += encode_string(Tags.STOP_ID, record.stop_id)
+
+        stop_time_update += IntersectionExtensionEncoders.STOP_TIME_UPDATE.encode(record)
+        return encode_length_delimited(Tags.TRIP_UPDATE_STOP_TIME_UPDATE, stop_time_update)
+
+    @staticmethod
+    def encode_entity(entity_id, head, stop_time_updates, tail):
+        trip_update = head + b''.join(stop_time_updates) + tail
+        return (encode_string(Tags.ENTITY_ID, entity_id) +
+                encode_length_delimited(Tags.ENTITY_TRIP_UPDATE, trip_update))
+
+
+class FeedBytesBuilder:
+    """
+    Drop-in alternative to `FeedMessageBuilder` for callers that only need
+    the serialized feed. Trip updates are encoded straight from their records
+    into GTFS-realtime wire format, including the Intersection
+    extensions, without creating protobuf message objects. `build()` returns
+    bytes that parse to the message `FeedMessageBuilder` would have built.
+
+    feed_bytes = translator(data, builder=FeedBytesBuilder)
+    """
+
+    def __init__(self, group_by_trip=False):
+        self.header = gtfs_realtime.FeedHeader(gtfs_realtime_version=FeedMessage.VERSION)
+        self.group_by_trip = group_by_trip
+        self.__entities = []
+        self.__trips = {}
+
+    def add_trip_update(self, *args, **kwargs):
+        record = ArrivalRecord.coerce(*args, **kwargs)
+        trip_key = FeedMessageBuilder.get_trip_key(record) if self.group_by_trip else None
+        stop_time_update = TripUpdateEncoder.encode_stop_time_update(record)
+
+        entity = self.__trips.get(trip_key) if trip_key else None
+        if entity is not None:
+            entity[2].append(stop_time_update)
+            return entity[0]
+
+        head, tail = TripUpdateEncoder.encode_trip(record)
+        entity = [record.entity_id, head, [stop_time_update], tail]
+        self.__entities.append(entity)
+        if trip_key:
+            self.__trips[trip_key] = entity
+        return entity[0]
+
+    def add_alert_from(self, entity, *args, **kwargs):
+        alert = Alert.create_from(entity, *args, **kwargs)
+        self.__entities.append(alert)
+        return alert
+
+    def build(self):
+        encoded = [encode_length_delimited(Tags.FEED_MESSAGE_HEADER, self.header.SerializeToString())]
+        for entity in self.__entities:
+            if isinstance(entity, gtfs_realtime.FeedEntity):
+                encoded_entity = entity.SerializeToString()
+            else:
+                encoded_entity = TripUpdateEncoder.encode_entity(*entity)
+            encoded.append(encode_length_delimited(Tags.FEED_MESSAGE_ENTITY, encoded_entity))
+        return b''.join(encoded)
@@ -0,0 +1,55 @@
+from google.protobuf.descriptor import FieldDescriptor
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.bindings import intersection_pb2 as intersection_gtfs_realtime
+
+
+class ExtensionWriter:
+    """
+    Writes the fields of one Intersection extension from an `ArrivalRecord`
+    onto a message.
+
+    The field list is derived once from the extension's descriptor. Scalar
+    fields are read from the record attribute of the same name.
+    `StopTimeEvent` fields such as `scheduled_arrival` are read from
+    `<name>_time` and written to their `time` field. Falsy values are
+    skipped, and the extension sub-message is only fetched when at least one
+    field is set.
+    """
+
+    def __init__(self, extension):
+        self.extension = extension
+        self.fields = tuple(self.__compile_field(field)
+                            for field in extension.message_type.fields)
+
+    @staticmethod
+    def __compile_field(field):
+        if field.type == FieldDescriptor.TYPE_MESSAGE:
+            if field.message_type.full_name != gtfs_realtime.TripUpdate.StopTimeEvent.DESCRIPTOR.full_name:
+                raise ValueError(f'Unsupported extension field type for {field.full_name}')
+            return f'{field.name}_time', field.name, True
+        return field.name, field.name, False
+
+    @property
+    def keys(self):
+        return tuple(key for key, _, _ in self.fields)
+
+    def write(self, message, record):
+        extension = None
+        for key, name, is_stop_time_event in self.fields:
+            value = getattr(record, key)
+            if not value:
+                continue
+            if extension is None:
+                extension = message.Extensions[self.extension]
+            if is_stop_time_event:
+                getattr(extension, name).time = value
+            else:
+                setattr(extension, name, value)
+        return extension
+
+
+class IntersectionExtensions:
+    TRIP_UPDATE = ExtensionWriter(intersection_gtfs_realtime.intersection_trip_update)
+    STOP_TIME_UPDATE = ExtensionWriter(intersection_gtfs_realtime.intersection_stop_time_update)
+    VEHICLE_DESCRIPTOR = ExtensionWriter(intersection_gtfs_realtime.intersection_vehicle_descriptor)
@@ -1,6 +1,7 @@
 from google.transit import gtfs_realtime_pb2 as gtfs_realtime
 
-from gtfs_realtime_translators.bindings import intersection_pb2 as intersection_gtfs_realtime
+from .extensions import IntersectionExtensions
+from .records import ArrivalRecord
 
 class Entity:
 
@@ -13,120 +14,114 @@ class Alert:
     @staticmethod
     def create_from(entity, *args, **kwargs):
         new_entity = gtfs_realtime.FeedEntity()
+        Alert.populate_from(new_entity, entity, *args, **kwargs)
+        return new_entity
+
+    @staticmethod
+    def populate_from(new_entity, entity, *args, **kwargs):
         new_entity.CopyFrom(entity)
-        
+        return Alert.rewrite(new_entity, *args, **kwargs)
+
+    @staticmethod
+    def rewrite(entity, *args, **kwargs):
+        """
+        Rewrites the alert of `entity` in place, e.g. an entity of a parsed
+        upstream `FeedMessage`, without copying it first.
+        """
         informed_entity = kwargs.get('informed_entity', None)
         if informed_entity is not None:
-            gtfsrt_informed_entity  = [ gtfs_realtime.EntitySelector(**selector) for selector in informed_entity] 
-            new_entity.alert.ClearField('informed_entity')
-            new_entity.alert.informed_entity.extend([ gtfs_realtime.EntitySelector(**selector) for selector in informed_entity] )
-        
-        return new_entity
+            entity.alert.ClearField('informed_entity')
+            for selector in informed_entity:
+                entity.alert.informed_entity.add(**selector)
+
+        return entity
 
 
 class TripUpdate:
 
     @staticmethod
-    def __set_stop_time_events(arrival_time, departure_time):
-        arrival = gtfs_realtime.TripUpdate.StopTimeEvent(time=arrival_time)
+    def __set_stop_time_events(stop_time_update, arrival_time, departure_time):
+        stop_time_update.arrival.SetInParent()
+        if arrival_time is not None:
+            stop_time_update.arrival.time = arrival_time
+        stop_time_update.departure.SetInParent()
         if departure_time is None:
-            departure = arrival
+            stop_time_update.departure.CopyFrom(stop_time_update.arrival)
         else:
-            departure = gtfs_realtime.TripUpdate.StopTimeEvent(time=departure_time)
-
-        return arrival, departure
+            stop_time_update.departure.time = departure_time
 
     @staticmethod
-    def __set_delay_stop_time_events(arrival_delay, departure_delay):
-        arrival = gtfs_realtime.TripUpdate.StopTimeEvent(delay=arrival_delay)
+    def __set_delay_stop_time_events(stop_time_update, arrival_delay, departure_delay):
+        stop_time_update.arrival.SetInParent()
+        if arrival_delay is not None:
+            stop_time_update.arrival.delay = arrival_delay
+        stop_time_update.departure.SetInParent()
         if departure_delay is None:
-            departure = arrival
+            stop_time_update.departure.CopyFrom(stop_time_update.arrival)
         else:
-            departure = gtfs_realtime.TripUpdate.StopTimeEvent(delay=departure_delay)
-        return arrival, departure
+            stop_time_update.departure.delay = departure_delay
 
     @staticmethod
     def create(*args, **kwargs):
-        entity_id = kwargs['entity_id']
-        trip_id = kwargs.get('trip_id', None)
-        route_id = kwargs.get('route_id', None)
-        stop_id = kwargs['stop_id']
-        direction_id = kwargs.get('direction_id', None)
-
-        if 'arrival_delay' in kwargs:
-            arrival_delay = kwargs.get('arrival_delay',None)
-            departure_delay = kwargs.get('departure_delay', None)
-            arrival, departure = TripUpdate.__set_delay_stop_time_events(arrival_delay, departure_delay)
+        """
+        Creates a `FeedEntity` with a single-stop trip update, either from an
+        `ArrivalRecord` or from the keyword arguments of `ArrivalRecord`.
+        """
+        entity = gtfs_realtime.FeedEntity()
+        return TripUpdate.populate(entity, *args, **kwargs)
+
+    @staticmethod
+    def populate(entity, *args, **kwargs):
+        """
+        Fills `entity` (usually a freshly added `FeedEntity` of a `FeedMessage`)
+        in place with a single-stop trip update. Accepts the same arguments as
+        `create`.
+        """
+        record = ArrivalRecord.coerce(*args, **kwargs)
+        entity.id = record.entity_id
+        trip_update = entity.trip_update
+        TripUpdate.populate_trip(trip_update, record)
+        TripUpdate.populate_stop_time_update(trip_update.stop_time_update.add(), record)
+        return entity
+
+    @staticmethod
+    def populate_trip(trip_update, *args, **kwargs):
+        record = ArrivalRecord.coerce(*args, **kwargs)
+
+        trip_descriptor = trip_update.trip
+        trip_descriptor.SetInParent()
+        if record.trip_id is not None:
+            trip_descriptor.trip_id = record.trip_id
+        if record.route_id is not None:
+            trip_descriptor.route_id = record.route_id
+        if record.direction_id is not None:
+            trip_descriptor.direction_id = record.direction_id
+
+        vehicle_descriptor = trip_update.vehicle
+        vehicle_descriptor.SetInParent()
+
+        # Intersection Extensions
+        IntersectionExtensions.VEHICLE_DESCRIPTOR.write(vehicle_descriptor, record)
+        IntersectionExtensions.TRIP_UPDATE.write(trip_update, record)
+
+        return trip_update
+
+    @staticmethod
+    def populate_stop_time_update(stop_time_update, *args, **kwargs):
+        record = ArrivalRecord.coerce(*args, **kwargs)
+
+        if record.uses_delay:
+            TripUpdate.__set_delay_stop_time_events(stop_time_update, record.arrival_delay, record.departure_delay)
         else:
-            arrival_time = kwargs.get('arrival_time', None)
-            departure_time = kwargs.get('departure_time', None)
-            arrival, departure = TripUpdate.__set_stop_time_events(arrival_time, departure_time)
+            TripUpdate.__set_stop_time_events(stop_time_update, record.arrival_time, record.departure_time)
+
+        if record.stop_id is not None:
+            stop_time_update.stop_id = record.stop_id
 
         # Intersection Extensions
-        headsign = kwargs.get('headsign', None)
-        track = kwargs.get('track', None)
-        scheduled_arrival = kwargs.get('scheduled_arrival_time', None)
-        scheduled_departure = kwargs.get('scheduled_departure_time', None)
-        stop_name = kwargs.get('stop_name', None)
-        route_short_name = kwargs.get('route_short_name', None)
-        route_long_name = kwargs.get('route_long_name', None)
-        route_color = kwargs.get('route_color', None)
-        route_text_color = kwargs.get('route_text_color', None)
-        block_id = kwargs.get('block_id', None)
-        agency_timezone = kwargs.get('agency_timezone', None)
-        custom_status = kwargs.get('custom_status', None)
-        scheduled_interval = kwargs.get('scheduled_interval', None)
-        route_icon = kwargs.get('route_icon', None)
-        run_number = kwargs.get('run_number', None)
-
-        trip_descriptor = gtfs_realtime.TripDescriptor(trip_id=trip_id,
-                                                       route_id=route_id,
-                                                       direction_id=direction_id)
-
-        stop_time_update = gtfs_realtime.TripUpdate.StopTimeUpdate(arrival=arrival,
-                                                                   departure=departure,
-                                                                   stop_id=stop_id)
-        
-        vehicle_descriptor = gtfs_realtime.VehicleDescriptor()
-
-        if track:
-            stop_time_update.Extensions[intersection_gtfs_realtime.intersection_stop_time_update].track = track
-        if scheduled_arrival:
-            stop_time_update.Extensions[intersection_gtfs_realtime.intersection_stop_time_update].scheduled_arrival.time = scheduled_arrival
-        if scheduled_departure:
-            stop_time_update.Extensions[intersection_gtfs_realtime.intersection_stop_time_update].scheduled_departure.time = scheduled_departure
-        if stop_name:
-            stop_time_update.Extensions[intersection_gtfs_realtime.intersection_stop_time_update].stop_name = stop_name
-        if run_number:
-            vehicle_descriptor.Extensions[intersection_gtfs_realtime.intersection_vehicle_descriptor].run_number = run_number
-
-        trip_update = gtfs_realtime.TripUpdate(trip=trip_descriptor,
-                                               stop_time_update=[stop_time_update],
-                                               vehicle=vehicle_descriptor)
-
-        if headsign:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].headsign = headsign
-        if route_short_name:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].route_short_name = route_short_name
-        if route_long_name:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].route_long_name = route_long_name
-        if route_color:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].route_color = route_color
-        if route_text_color:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].route_text_color = route_text_color
-        if block_id:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].block_id = block_id
-        if agency_timezone:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].agency_timezone = agency_timezone
-        if custom_status:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].custom_status = custom_status
-        if scheduled_interval:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].scheduled_interval = scheduled_interval
-        if route_icon:
-            trip_update.Extensions[intersection_gtfs_realtime.intersection_trip_update].route_icon = route_icon
-
-        return Entity.create(entity_id,
-                             trip_update=trip_update)
+        IntersectionExtensions.STOP_TIME_UPDATE.write(stop_time_update, record)
+
+        return stop_time_update
 
 
 class FeedMessage:
@@ -139,3 +134,65 @@ class FeedMessage:
         message = gtfs_realtime.FeedMessage(header=header,
                                             entity=entities)
         return message
+
+
+class FeedMessageBuilder:
+    """
+    Builds a single `FeedMessage` in place. Every entity is added directly
+    through `message.entity.add()` and filled there, so the feed is
+    constructed once instead of building standalone `FeedEntity` objects and
+    copying them into the message afterwards.
+
+    builder = FeedMessageBuilder()
+    builder.add_trip_update(entity_id='1', stop_id='2345', arrival_time=1234)
+    feed_message = builder.build()
+
+    With `group_by_trip=True`, trip updates are grouped per trip: the first
+    update of a trip creates its entity, and every further update for the
+    same trip only appends a `StopTimeUpdate` to it. Trips are identified by
+    trip_id, or by block_id / run_number when there is no trip_id. Updates
+    without any of these are never grouped. The trip-level fields (route,
+    direction and Intersection trip extensions) of the first update are kept.
+    """
+
+    TRIP_KEY_FIELDS = ['trip_id', 'block_id', 'run_number']
+
+    def __init__(self, group_by_trip=False):
+        self.message = gtfs_realtime.FeedMessage()
+        self.message.header.gtfs_realtime_version = FeedMessage.VERSION
+        self.group_by_trip = group_by_trip
+        self.__trips = {}
+
+    @property
+    def header(self):
+        return self.message.header
+
+    def add_trip_update(self, *args, **kwargs):
+        record = ArrivalRecord.coerce(*args, **kwargs)
+        if not self.group_by_trip:
+            return TripUpdate.populate(self.message.entity.add(), record)
+
+        trip_key = self.get_trip_key(record)
+        entity = self.__trips.get(trip_key) if trip_key else None
+        if entity is not None:
+            TripUpdate.populate_stop_time_update(entity.trip_update.stop_time_update.add(), record)
+            return entity
+
+        entity = TripUpdate.populate(self.message.entity.add(), record)
+        if trip_key:
+            self.__trips[trip_key] = entity
+        return entity
+
+    def add_alert_from(self, entity, *args, **kwargs):
+        return Alert.populate_from(self.message.entity.add(), entity, *args, **kwargs)
+
+    def build(self):
+        return self.message
+
+    @classmethod
+    def get_trip_key(cls, record):
+        for field in cls.TRIP_KEY_FIELDS:
+            value = getattr(record, field)
+            if value:
+                return (field, value)
+        return None
@@ -0,0 +1,197 @@
+import json
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.json_format import MessageToDict
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.bindings import intersection_pb2 as intersection_gtfs_realtime
+from .factories import Alert, FeedMessage, FeedMessageBuilder
+from .records import ArrivalRecord
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# proto3 JSON mapping: 64 bit integers are written as strings
+INT64_TYPES = {FieldDescriptor.TYPE_INT64, FieldDescriptor.TYPE_UINT64, FieldDescriptor.TYPE_SINT64,
+               FieldDescriptor.TYPE_FIXED64, FieldDescriptor.TYPE_SFIXED64}
+
+
+def default_dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_name(message_class, name):
+    return message_class.DESCRIPTOR.fields_by_name[name].json_name
+
+
+def json_value(field, value):
+    return str(value) if field.type in INT64_TYPES else value
+
+
+class JsonNames:
+    ENTITY_ID = json_name(gtfs_realtime.FeedEntity, 'id')
+    ENTITY_TRIP_UPDATE = json_name(gtfs_realtime.FeedEntity, 'trip_update')
+    TRIP_UPDATE_TRIP = json_name(gtfs_realtime.TripUpdate, 'trip')
+    TRIP_UPDATE_STOP_TIME_UPDATE = json_name(gtfs_realtime.TripUpdate, 'stop_time_update')
+    TRIP_UPDATE_VEHICLE = json_name(gtfs_realtime.TripUpdate, 'vehicle')
+    TRIP_ID = json_name(gtfs_realtime.TripDescriptor, 'trip_id')
+    ROUTE_ID = json_name(gtfs_realtime.TripDescriptor, 'route_id')
+    DIRECTION_ID = json_name(gtfs_realtime.TripDescriptor, 'direction_id')
+    ARRIVAL = json_name(gtfs_realtime.TripUpdate.StopTimeUpdate, 'arrival')
+    DEPARTURE = json_name(gtfs_realtime.TripUpdate.StopTimeUpdate, 'departure')
+    STOP_ID = json_name(gtfs_realtime.TripUpdate.StopTimeUpdate, 'stop_id')
+    EVENT_DELAY = json_name(gtfs_realtime.TripUpdate.StopTimeEvent, 'delay')
+    EVENT_TIME = json_name(gtfs_realtime.TripUpdate.StopTimeEvent, 'time')
+
+
+class ExtensionJsonWriter:
+    """
+    JSON counterpart of `ExtensionWriter`: writes the fields of one
+    Intersection extension from a record into a dict, under the key
+    `MessageToJson` uses for the extension (`[<full name>]`).
+    """
+
+    def __init__(self, extension):
+        self.key = f'[{extension.full_name}]'
+        self.fields = tuple(self.__compile_field(field)
+                            for field in extension.message_type.fields)
+
+    @staticmethod
+    def __compile_field(field):
+        if field.type == FieldDescriptor.TYPE_MESSAGE:
+            time_field = field.message_type.fields_by_name['time']
+            return f'{field.name}_time', field.json_name, \
+                lambda value: {JsonNames.EVENT_TIME: json_value(time_field, value)}
+        return field.name, field.json_name, lambda value: json_value(field, value)
+
+    def write(self, message, record):
+        extension = None
+        for key, name, to_json in self.fields:
+            value = getattr(record, key)
+            if not value:
+                continue
+            if extension is None:
+                extension = message[self.key] = {}
+            extension[name] = to_json(value)
+        return extension
+
+
+class IntersectionJsonExtensions:
+    TRIP_UPDATE = ExtensionJsonWriter(intersection_gtfs_realtime.intersection_trip_update)
+    STOP_TIME_UPDATE = ExtensionJsonWriter(intersection_gtfs_realtime.intersection_stop_time_update)
+    VEHICLE_DESCRIPTOR = ExtensionJsonWriter(intersection_gtfs_realtime.intersection_vehicle_descriptor)
+
+
+class TripUpdateJson:
+    """
+    JSON counterpart of `TripUpdate`. Builds the dicts `MessageToDict` would
+    return for a trip update straight from an `ArrivalRecord`.
+    """
+
+    @staticmethod
+    def __stop_time_events(stop_time_update, arrival, departure, name, to_json):
+        arrival_event = {} if arrival is None else {name: to_json(arrival)}
+        stop_time_update[JsonNames.ARRIVAL] = arrival_event
+        if departure is None:
+            stop_time_update[JsonNames.DEPARTURE] = dict(arrival_event)
+        else:
+            stop_time_update[JsonNames.DEPARTURE] = {name: to_json(departure)}
+
+    @staticmethod
+    def create(record):
+        trip = {}
+        if record.trip_id is not None:
+            trip[JsonNames.TRIP_ID] = record.trip_id
+        if record.route_id is not None:
+            trip[JsonNames.ROUTE_ID] = record.route_id
+        if record.direction_id is not None:
+            trip[JsonNames.DIRECTION_ID] = record.direction_id
+
+        vehicle = {}
+        trip_update = {
+            JsonNames.TRIP_UPDATE_TRIP: trip,
+            JsonNames.TRIP_UPDATE_STOP_TIME_UPDATE: [TripUpdateJson.create_stop_time_update(record)],
+            JsonNames.TRIP_UPDATE_VEHICLE: vehicle,
+        }
+
+        # Intersection Extensions
+        IntersectionJsonExtensions.VEHICLE_DESCRIPTOR.write(vehicle, record)
+        IntersectionJsonExtensions.TRIP_UPDATE.write(trip_update, record)
+
+        return {JsonNames.ENTITY_ID: record.entity_id, JsonNames.ENTITY_TRIP_UPDATE: trip_update}
+
+    @staticmethod
+    def create_stop_time_update(record):
+        stop_time_update = {}
+        if record.uses_delay:
+            TripUpdateJson.__stop_time_events(stop_time_update, record.arrival_delay,
+                                              record.departure_delay, JsonNames.EVENT_DELAY, int)
+        else:
+            TripUpdateJson.__stop_time_events(stop_time_update, record.arrival_time,
+                                              record.departure_time, JsonNames.EVENT_TIME, str)
+
+        if record.stop_id is not None:
+            stop_time_update[JsonNames.STOP_ID] = record.stop_id
+
+        # Intersection Extensions
+        IntersectionJsonExtensions.STOP_TIME_UPDATE.write(stop_time_update, record)
+
+        return stop_time_update
+
+
+class FeedJsonBuilder:
+    """
+    Drop-in alternative to `FeedMessageBuilder` for callers that want JSON.
+    Trip updates are written from their records straight into the dicts
+    `MessageToJson` would produce for the equivalent `FeedMessage`, including
+    the Intersection extensions, and `build()` serializes them in one pass to
+    UTF-8 encoded bytes.
+
+    feed_json = translator(data, builder=FeedJsonBuilder)
+
+    `orjson` is used for serialization when it is installed, the standard
+    library otherwise. Another encoder returning bytes can be passed as
+    `dumps`, e.g. `functools.partial(FeedJsonBuilder, dumps=my_dumps)`.
+    """
+
+    def __init__(self, group_by_trip=False, dumps=None):
+        self.header = gtfs_realtime.FeedHeader(gtfs_realtime_version=FeedMessage.VERSION)
+        self.group_by_trip = group_by_trip
+        self.dumps = dumps if dumps is not None else default_dumps
+        self.__entities = []
+        self.__trips = {}
+
+    def add_trip_update(self, *args, **kwargs):
+        record = ArrivalRecord.coerce(*args, **kwargs)
+        trip_key = FeedMessageBuilder.get_trip_key(record) if self.group_by_trip else None
+
+        entity = self.__trips.get(trip_key) if trip_key else None
+        if entity is not None:
+            stop_time_updates = entity[JsonNames.ENTITY_TRIP_UPDATE][JsonNames.TRIP_UPDATE_STOP_TIME_UPDATE]
+            stop_time_updates.append(TripUpdateJson.create_stop_time_update(record))
+            return entity
+
+        entity = TripUpdateJson.create(record)
+        self.__entities.append(entity)
+        if trip_key:
+            self.__trips[trip_key] = entity
+        return entity
+
+    def add_alert_from(self, entity, *args, **kwargs):
+        alert = MessageToDict(Alert.create_from(entity, *args, **kwargs))
+        self.__entities.append(alert)
+        return alert
+
+    def build_dict(self):
+        feed = {'header': MessageToDict(self.header)}
+        if self.__entities:
+            feed['entity'] = self.__entities
+        return feed
+
+    def build(self):
+        return self.dumps(self.build_dict())
@@ -0,0 +1,95 @@
+class ArrivalRecord:
+    """
+    One arrival (or departure) of a trip at a stop, as consumed by the trip
+    update builders. Holds the core GTFS-realtime fields and the Intersection
+    extension fields; all fields but `entity_id` and `stop_id` are optional.
+
+    Arrivals are given either as times (`arrival_time`, `departure_time`) or
+    as delays (`arrival_delay`, `departure_delay`). Delays take precedence
+    when one of them is set. A missing departure falls back to the arrival.
+    Records built by `coerce` from keyword arguments keep the rule of
+    `TripUpdate.create` instead: delays are used whenever `arrival_delay` is
+    passed, even as None.
+
+    Builders consume a record when it is added, so a translator may build a
+    new record per arrival without any intermediate keyword dicts:
+
+    feed.add_trip_update(ArrivalRecord(entity_id='1', stop_id='2345', arrival_time=1234))
+    """
+
+    FIELDS = ('entity_id', 'stop_id', 'trip_id', 'route_id', 'direction_id',
+              'arrival_time', 'departure_time', 'arrival_delay', 'departure_delay',
+              # Intersection Extensions
+              'headsign', 'route_short_name', 'route_long_name', 'route_color',
+              'route_text_color', 'block_id', 'agency_timezone', 'custom_status',
+              'scheduled_interval', 'route_icon', 'track', 'scheduled_arrival_time',
+              'scheduled_departure_time', 'stop_name', 'run_number')
+
+    __slots__ = FIELDS + ('_uses_delay',)
+
+    def __init__(self, entity_id, stop_id, trip_id=None, route_id=None, direction_id=None,
+                 arrival_time=None, departure_time=None, arrival_delay=None, departure_delay=None,
+                 headsign=None, route_short_name=None, route_long_name=None, route_color=None,
+                 route_text_color=None, block_id=None, agency_timezone=None, custom_status=None,
+                 scheduled_interval=None, route_icon=None, track=None, scheduled_arrival_time=None,
+                 scheduled_departure_time=None, stop_name=None, run_number=None):
+        self.entity_id = entity_id
+        self.stop_id = stop_id
+        self.trip_id = trip_id
+        self.route_id = route_id
+        self.direction_id = direction_id
+        self.arrival_time = arrival_time
+        self.departure_time = departure_time
+        self.arrival_delay = arrival_delay
+        self.departure_delay = departure_delay
+        self.headsign = headsign
+        self.route_short_name = route_short_name
+        self.route_long_name = route_long_name
+        self.route_color = route_color
+        self.route_text_color = route_text_color
+        self.block_id = block_id
+        self.agency_timezone = agency_timezone
+        self.custom_status = custom_status
+        self.scheduled_interval = scheduled_interval
+        self.route_icon = route_icon
+        self.track = track
+        self.scheduled_arrival_time = scheduled_arrival_time
+        self.scheduled_departure_time = scheduled_departure_time
+        self.stop_name = stop_name
+        self.run_number = run_number
+        self._uses_delay = None
+
+    @classmethod
+    def coerce(cls, *args, **kwargs):
+        """
+        Returns the record passed as first positional argument, or builds one
+        from the keyword arguments accepted by `TripUpdate.create`. Unknown
+        keyword arguments are ignored, as they always were by `create`.
+        """
+        if args and isinstance(args[0], cls):
+            return args[0]
+        record = cls(**{field: value for field, value in kwargs.items() if field in cls.FIELDS})
+        record._uses_delay = 'arrival_delay' in kwargs
+        return record
+
+    @property
+    def uses_delay(self):
+        if self._uses_delay is not None:
+            return self._uses_delay
+        return self.arrival_delay is not None or self.departure_delay is not None
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS
+                if getattr(self, field) is not None}
+
+    def __eq__(self, other):
+        if not isinstance(other, ArrivalRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    def __repr__(self):
+        fields = ', '.join(f'{field}={value!r}' for field, value in self.to_dict().items())
+        return f'ArrivalRecord({fields})'
@@ -0,0 +1,37 @@
+import importlib
+
+# Parsers are imported on first access, so a translator only loads the
+# parsers (and their dependencies) it uses.
+PARSER_MODULES = {
+    'available_decoders': '.decoders',
+    'decode_json': '.decoders',
+    'get_decoder': '.decoders',
+    'get_default_decoder': '.decoders',
+    'set_default_decoder': '.decoders',
+    'HtmlTextCache': '.html_text',
+    'convert_html_to_text': '.html_text',
+    'html_to_text_reference': '.html_text',
+    'LocalTimeZone': '.timestamps',
+    'FormatParser': '.timestamps',
+    'get_timezone': '.timestamps',
+    'parse_iso8601': '.timestamps',
+    'JsonStream': '.stream',
+    'iter_xml_elements': '.xml_stream',
+    'xml_dict': '.xml_stream',
+    'xml_text': '.xml_stream',
+}
+
+__all__ = list(PARSER_MODULES)
+
+
+def __getattr__(name):
+    module_name = PARSER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
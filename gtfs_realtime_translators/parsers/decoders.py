@@ -0,0 +1,71 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+DECODERS = {'json': json.loads}
+if ujson is not None:
+    DECODERS['ujson'] = ujson.loads
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+# fastest first
+PREFERRED_DECODERS = ('orjson', 'ujson', 'json')
+
+__default_decoder = next(name for name in PREFERRED_DECODERS if name in DECODERS)
+
+
+def available_decoders():
+    return [name for name in PREFERRED_DECODERS if name in DECODERS]
+
+
+def get_default_decoder():
+    return __default_decoder
+
+
+def set_default_decoder(name):
+    """
+    Selects the JSON backend used by translators that do not choose one.
+    """
+    global __default_decoder
+    get_decoder(name)
+    __default_decoder = name
+
+
+def get_decoder(name=None):
+    if name is None:
+        name = __default_decoder
+    try:
+        return DECODERS[name]
+    except KeyError:
+        raise ValueError(f'JSON decoder {name!r} is not installed, available: {available_decoders()}') from None
+
+
+def decode_json(data, decoder=None):
+    """
+    Decodes a JSON payload (str or bytes) with the named backend, or the
+    default one: the fastest installed of `orjson`, `ujson` and the standard
+    library `json`.
+
+    Translators pass their `JSON_DECODER` class attribute, so a backend can
+    be selected per translator class or instance. A payload the backend
+    rejects is decoded again with the standard library, which accepts more
+    (NaN, lone surrogates, UTF-16 ...) and raises its usual errors for
+    invalid input. Note that `orjson` decodes integers beyond 64 bit as
+    floats; none of the vendor feeds send such values.
+    """
+    loads = get_decoder(decoder)
+    if loads is json.loads:
+        return json.loads(data)
+    try:
+        return loads(data)
+    except ValueError:
+        return json.loads(data)
@@ -0,0 +1,205 @@
+import collections
+import hashlib
+import re
+import threading
+from html.parser import HTMLParser
+
+# elements without end tag
+VOID_TAGS = frozenset(['br', 'img', 'hr', 'wbr'])
+PHRASING_TAGS = frozenset(['a', 'abbr', 'b', 'big', 'br', 'cite', 'code', 'em', 'font', 'i', 'img', 'q', 's',
+                           'small', 'span', 'strike', 'strong', 'sub', 'sup', 'tt', 'u', 'wbr'])
+FLOW_TAGS = frozenset(['blockquote', 'center', 'dd', 'div', 'dl', 'dt', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr',
+                       'li', 'ol', 'p', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul'])
+# elements that only hold phrasing content, the HTML parser closes them
+# implicitly when a block starts
+PHRASING_CONTAINERS = PHRASING_TAGS | frozenset(['dt', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p'])
+REQUIRED_PARENTS = {
+    'li': frozenset(['ol', 'ul']),
+    'dt': frozenset(['dl']),
+    'dd': frozenset(['dl']),
+    'thead': frozenset(['table']),
+    'tbody': frozenset(['table']),
+    'tfoot': frozenset(['table']),
+    'tr': frozenset(['table', 'tbody', 'tfoot', 'thead']),
+    'td': frozenset(['tr']),
+    'th': frozenset(['tr']),
+}
+# elements that must not hold text, other than whitespace, directly
+NO_TEXT_TAGS = frozenset(['dl', 'ol', 'table', 'tbody', 'tfoot', 'thead', 'tr', 'ul'])
+
+ASCII_WHITESPACE = ' \t\n\f\r'
+NEWLINES = re.compile(r'\r\n?')
+# control characters the HTML parser replaces or reports, and a '<' that does
+# not start a tag, which it may treat as text or as a broken tag
+UNSUPPORTED = re.compile(r'[\x00-\x08\x0b\x0e-\x1f\x7f]|<(?![A-Za-z/])|</(?![A-Za-z])')
+NUMERIC_CHARREF = re.compile(r'&#(?:[xX]([0-9a-fA-F]*)|([0-9]*))')
+
+
+def is_plain_codepoint(codepoint):
+    """
+    Whether a character reference to `codepoint` stands for the character
+    itself, other than references to control characters, surrogates and
+    noncharacters, which the HTML parser replaces.
+    """
+    if codepoint < 0x20:
+        return codepoint in (0x09, 0x0a, 0x0c)
+    if 0x7f <= codepoint < 0xa0 or 0xd800 <= codepoint < 0xe000 or 0xfdd0 <= codepoint < 0xfdf0:
+        return False
+    return codepoint <= 0x10ffff and codepoint & 0xfffe != 0xfffe
+
+
+class UnsupportedMarkup(Exception):
+    pass
+
+
+class HtmlTextParser(HTMLParser):
+    """
+    Collects the text of an HTML fragment built from a common subset of
+    markup: well-nested formatting, list and table elements with entity and
+    character references. Raises `UnsupportedMarkup` for anything else, e.g.
+    comments, scripts or tags the HTML parser would close implicitly.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.texts = []
+        self.__data = []
+        self.__open_tags = []
+
+    def handle_starttag(self, tag, attrs):
+        self.__end_data()
+        self.__check_start(tag)
+        if tag not in VOID_TAGS:
+            self.__open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            # the self-closing flag of other elements is ignored
+            raise UnsupportedMarkup(f'<{tag}/>')
+        self.__end_data()
+        self.__check_start(tag)
+
+    def handle_endtag(self, tag):
+        if not self.__open_tags or self.__open_tags[-1] != tag:
+            raise UnsupportedMarkup(f'</{tag}>')
+        self.__end_data()
+        self.__open_tags.pop()
+
+    def handle_data(self, data):
+        self.__data.append(data)
+
+    def handle_comment(self, data):
+        raise UnsupportedMarkup('comment')
+
+    def handle_decl(self, decl):
+        raise UnsupportedMarkup('declaration')
+
+    def handle_pi(self, data):
+        raise UnsupportedMarkup('processing instruction')
+
+    def unknown_decl(self, data):
+        raise UnsupportedMarkup('declaration')
+
+    def close(self):
+        if '<' in self.rawdata:
+            # an incomplete tag at the end of the input
+            raise UnsupportedMarkup('incomplete tag')
+        super().close()
+        self.__end_data()
+
+    def __check_start(self, tag):
+        if tag not in PHRASING_TAGS and tag not in FLOW_TAGS:
+            raise UnsupportedMarkup(f'<{tag}>')
+        parent = self.__open_tags[-1] if self.__open_tags else None
+        if parent in PHRASING_CONTAINERS and tag not in PHRASING_TAGS:
+            raise UnsupportedMarkup(f'<{tag}> in <{parent}>')
+        if tag == 'a' and 'a' in self.__open_tags:
+            raise UnsupportedMarkup('nested <a>')
+        required_parents = REQUIRED_PARENTS.get(tag)
+        if required_parents is not None and parent not in required_parents:
+            raise UnsupportedMarkup(f'<{tag}> in <{parent}>')
+
+    def __end_data(self):
+        if not self.__data:
+            return
+        text = ''.join(self.__data)
+        self.__data = []
+        if text.strip(ASCII_WHITESPACE):
+            if self.__open_tags and self.__open_tags[-1] in NO_TEXT_TAGS:
+                raise UnsupportedMarkup(f'text in <{self.__open_tags[-1]}>')
+            self.texts.append(text)
+        else:
+            # BeautifulSoup collapses whitespace-only strings
+            self.texts.append('\n' if '\n' in text else ' ')
+
+
+def numeric_charrefs(html):
+    for match in NUMERIC_CHARREF.finditer(html):
+        hexadecimal, decimal = match.groups()
+        digits = hexadecimal if hexadecimal is not None else decimal
+        # a reference without digits is text
+        if digits:
+            yield int(digits, 16 if hexadecimal is not None else 10)
+
+
+def html_to_text_reference(html):
+    """
+    Returns the text of an HTML fragment as BeautifulSoup with the lxml
+    parser extracts it. Requires `beautifulsoup4` and `lxml`.
+    """
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, 'lxml').get_text()
+
+
+def convert_html_to_text(html):
+    """
+    Returns the same text as `html_to_text_reference`, without building a
+    document tree for markup `HtmlTextParser` supports.
+    """
+    if UNSUPPORTED.search(html) is None and all(map(is_plain_codepoint, numeric_charrefs(html))):
+        # the HTML parser drops whitespace before the document and normalizes
+        # line breaks
+        parser = HtmlTextParser()
+        try:
+            parser.feed(NEWLINES.sub('\n', html).lstrip(ASCII_WHITESPACE))
+            parser.close()
+        except UnsupportedMarkup:
+            pass
+        else:
+            return ''.join(parser.texts)
+    return html_to_text_reference(html)
+
+
+class HtmlTextCache:
+    """
+    Memoizes `convert_html_to_text` by the SHA-256 digest of the markup, for
+    descriptions that are sent again on every poll. Holds the text of at most
+    `maxsize` fragments and evicts the least recently used.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.__texts = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __call__(self, html):
+        digest = hashlib.sha256(html.encode('utf-8', 'surrogatepass')).digest()
+        with self.__lock:
+            text = self.__texts.get(digest)
+            if text is not None:
+                self.__texts.move_to_end(digest)
+                return text
+
+        text = convert_html_to_text(html)
+        with self.__lock:
+            self.__texts[digest] = text
+            if len(self.__texts) > self.maxsize:
+                self.__texts.popitem(last=False)
+        return text
+
+    def __len__(self):
+        return len(self.__texts)
+
+    def clear(self):
+        with self.__lock:
+            self.__texts.clear()
@@ -0,0 +1,200 @@
+import codecs
+import json
+import re
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+# characters that continue a number, e.g. the '.' after '-71' in '-71.0395'
+NUMBER_CONTINUATION = frozenset('0123456789.eE+-')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunks(source, chunk_size):
+    """
+    Yields the input of a str, bytes, a file-like object or an iterable of
+    chunks piece by piece.
+    """
+    if isinstance(source, (str, bytes, bytearray, memoryview)):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+class JsonStream:
+    """
+    Reads one JSON document incrementally from a str, bytes, a file-like
+    object or an iterable of chunks (e.g. an HTTP response body), so large
+    documents can be walked without holding them in memory.
+
+    stream = JsonStream(response.iter_content(chunk_size=None))
+    for key in stream.iter_object():
+        if key == 'data':
+            for item in stream.iter_items():
+                ...
+    stream.close()
+
+    `iter_object` yields the keys and `iter_array` the indexes of the
+    containers it walks; the caller consumes the value of each with
+    `read_value`, a nested `iter_object` / `iter_array`, or not at all, in
+    which case it is skipped. Only the unread part of the input is buffered.
+    Values are decoded with the standard library decoder, and malformed
+    input raises `json.JSONDecodeError`. Byte chunks must be UTF-8.
+    """
+
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.__chunks = iter_chunks(source, chunk_size)
+        self.__text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.__raw_decode = json.JSONDecoder().raw_decode
+        self.__buffer = ''
+        self.__pos = 0
+        self.__consumed = 0
+        self.__eof = False
+
+    def peek(self):
+        """
+        Returns the next non-whitespace character without consuming it.
+        """
+        self.__skip_whitespace()
+        if self.__pos >= len(self.__buffer):
+            raise self.__error('Expecting value')
+        return self.__buffer[self.__pos]
+
+    def read_value(self):
+        """
+        Decodes and returns the next complete value.
+        """
+        self.__skip_whitespace()
+        while True:
+            try:
+                value, end = self.__raw_decode(self.__buffer, self.__pos)
+            except json.JSONDecodeError:
+                if not self.__eof:
+                    self.__fill(grow=True)
+                    continue
+                raise
+            # a number at the end of the buffer may continue in the next chunk
+            if not self.__eof and (end == len(self.__buffer) or self.__buffer[end] in NUMBER_CONTINUATION):
+                self.__fill()
+                continue
+            self.__pos = end
+            return value
+
+    def skip_value(self):
+        self.read_value()
+
+    def iter_object(self):
+        self.__expect('{')
+        if self.peek() == '}':
+            self.__pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self.__error('Expecting property name enclosed in double quotes')
+            key = self.read_value()
+            self.__expect(':')
+            start = self.__offset()
+            yield key
+            if self.__offset() == start:
+                self.skip_value()
+            if self.__end_of_container('}'):
+                return
+
+    def iter_array(self):
+        self.__expect('[')
+        if self.peek() == ']':
+            self.__pos += 1
+            return
+        index = 0
+        while True:
+            start = self.__offset()
+            yield index
+            if self.__offset() == start:
+                self.skip_value()
+            if self.__end_of_container(']'):
+                return
+            index += 1
+
+    def iter_items(self):
+        """
+        Yields the decoded elements of an array one at a time; `null` yields
+        nothing.
+        """
+        if self.peek() == 'n':
+            if self.read_value() is not None:
+                raise self.__error('Expecting array')
+            return
+        for _ in self.iter_array():
+            yield self.read_value()
+
+    def close(self):
+        """
+        Checks that nothing but whitespace follows the document.
+        """
+        self.__skip_whitespace()
+        if self.__pos < len(self.__buffer):
+            raise self.__error('Extra data')
+
+    def __end_of_container(self, closing):
+        char = self.peek()
+        self.__pos += 1
+        if char == closing:
+            return True
+        if char != ',':
+            self.__pos -= 1
+            raise self.__error("Expecting ',' delimiter")
+        return False
+
+    def __expect(self, char):
+        if self.peek() != char:
+            raise self.__error(f'Expecting {char!r}')
+        self.__pos += 1
+
+    def __skip_whitespace(self):
+        while True:
+            self.__pos = WHITESPACE.match(self.__buffer, self.__pos).end()
+            if self.__pos < len(self.__buffer) or not self.__fill():
+                return
+
+    def __fill(self, grow=False):
+        """
+        Appends input to the buffer and drops the consumed part; returns
+        False at the end of the input. With `grow`, reads until the unread
+        part has doubled, so a value spanning many chunks is decoded in
+        O(log n) attempts.
+        """
+        if self.__eof:
+            return False
+        if self.__pos:
+            self.__consumed += self.__pos
+            self.__buffer = self.__buffer[self.__pos:]
+            self.__pos = 0
+
+        target = max(2 * len(self.__buffer), 1) if grow else len(self.__buffer) + 1
+        added = []
+        size = len(self.__buffer)
+        for chunk in self.__chunks:
+            text = chunk if isinstance(chunk, str) else self.__text_decoder.decode(chunk)
+            added.append(text)
+            size += len(text)
+            if size >= target:
+                break
+        else:
+            added.append(self.__text_decoder.decode(b'', final=True))
+            self.__eof = True
+
+        text = ''.join(added)
+        self.__buffer += text
+        return bool(text)
+
+    def __offset(self):
+        return self.__consumed + self.__pos
+
+    def __error(self, message):
+        return json.JSONDecodeError(message, self.__buffer, self.__pos)
@@ -0,0 +1,208 @@
+import datetime
+import functools
+import re
+import zoneinfo
+
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+          'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
+
+def utc_day_start(year, month, day):
+    return (datetime.date(year, month, day).toordinal() - EPOCH_ORDINAL) * 86400
+
+
+def check_time(hour, minute, second):
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError('Invalid time')
+
+
+class LocalTimeZone:
+    """
+    Converts local wall-clock times of one timezone to epoch seconds.
+
+    The UTC offset is looked up once per calendar day and cached, so most
+    conversions are integer arithmetic. Days with a UTC offset change are
+    converted through `zoneinfo` and resolve ambiguous and non-existent
+    times the way pendulum does: an ambiguous time maps to its second
+    occurrence, a time in a gap is shifted forward by the gap.
+    """
+
+    MAX_CACHED_DAYS = 4096
+
+    def __init__(self, name):
+        self.name = name
+        self.zone = zoneinfo.ZoneInfo(name)
+        self.__day_starts = {}
+
+    def timestamp(self, year, month, day, hour=0, minute=0, second=0):
+        check_time(hour, minute, second)
+        key = (year, month, day)
+        day_start = self.__day_starts.get(key, False)
+        if day_start is False:
+            day_start = self.__day_start(year, month, day)
+            if len(self.__day_starts) >= self.MAX_CACHED_DAYS:
+                self.__day_starts.clear()
+            self.__day_starts[key] = day_start
+
+        if day_start is None:
+            # the later of both folds is the second occurrence of an ambiguous
+            # time, and the time shifted forward by the gap for a missing one
+            return max(int(datetime.datetime(year, month, day, hour, minute, second,
+                                             tzinfo=self.zone, fold=fold).timestamp())
+                       for fold in (0, 1))
+        return day_start + hour * 3600 + minute * 60 + second
+
+    def today(self):
+        return datetime.datetime.now(self.zone).date()
+
+    def __day_start(self, year, month, day):
+        """
+        Returns the epoch seconds of local midnight, or None when the UTC
+        offset is not the same all day.
+        """
+        offsets = {datetime.datetime(year, month, day, hour, minute, second, tzinfo=self.zone, fold=fold).utcoffset()
+                   for hour, minute, second in ((0, 0, 0), (23, 59, 59))
+                   for fold in (0, 1)}
+        if len(offsets) != 1:
+            return None
+        return utc_day_start(year, month, day) - int(offsets.pop().total_seconds())
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone(name):
+    return LocalTimeZone(name)
+
+
+class FormatParser:
+    """
+    Precompiled parser for one pendulum `from_format` format, e.g.
+    `FormatParser('DD-MMM-YYYY HH:mm:ss A')`.
+
+    Supports the tokens YYYY, YY, MMM, MM, DD, HH, mm, ss and A. Strings in
+    the canonical shape of the format are converted with a regular
+    expression and `LocalTimeZone`. Anything else, e.g. unpadded days or
+    invalid dates, is passed to `pendulum.from_format`, so results and errors
+    are always those of pendulum. Missing date parts default like in pendulum
+    (today in `tz` when no date token is present).
+    """
+
+    TOKENS = {
+        'YYYY': r'(?P<year>\d{4})',
+        'YY': r'(?P<short_year>\d{2})',
+        'MMM': '(?P<month_name>' + '|'.join(MONTHS) + ')',
+        'MM': r'(?P<month>\d{2})',
+        'DD': r'(?P<day>\d{2})',
+        'HH': r'(?P<hour>\d{1,2})',
+        'mm': r'(?P<minute>\d{2})',
+        'ss': r'(?P<second>\d{2})',
+        'A': '(?P<meridiem>AM|PM)',
+    }
+    TOKEN_PATTERN = re.compile('|'.join(sorted(TOKENS, key=len, reverse=True)))
+
+    def __init__(self, fmt):
+        self.fmt = fmt
+        pattern = []
+        position = 0
+        for match in self.TOKEN_PATTERN.finditer(fmt):
+            pattern.append(self.__literal(fmt[position:match.start()]))
+            pattern.append(self.TOKENS[match.group(0)])
+            position = match.end()
+        pattern.append(self.__literal(fmt[position:]))
+        self.pattern = re.compile(''.join(pattern))
+
+    def __literal(self, text):
+        if re.search('[A-Za-z]', text):
+            raise ValueError(f'Unsupported token in format {self.fmt!r}: {text!r}')
+        return re.escape(text)
+
+    def timestamp(self, text, tz='UTC'):
+        match = self.pattern.fullmatch(text)
+        if match is not None:
+            try:
+                return self.__timestamp(match.groupdict(), get_timezone(tz))
+            except ValueError:
+                pass
+        import pendulum
+        return int(pendulum.from_format(text, self.fmt, tz=tz).timestamp())
+
+    @staticmethod
+    def __timestamp(parts, timezone):
+        year = parts.get('year')
+        if year is not None:
+            year = int(year)
+        elif parts.get('short_year') is not None:
+            year = int(parts['short_year'])
+            year += 2000 if year <= 68 else 1900
+
+        month = parts.get('month_name')
+        month = MONTHS[month] if month is not None else parts.get('month')
+        month = int(month) if month is not None else None
+        day = int(parts['day']) if parts.get('day') is not None else None
+
+        if year is None or month is None or day is None:
+            today = timezone.today()
+            if year is None:
+                year = today.year
+            if month is None:
+                month = 1 if parts.get('year') or parts.get('short_year') else today.month
+            if day is None:
+                has_date = parts.get('year') or parts.get('short_year') or parts.get('month') or parts.get('month_name')
+                day = 1 if has_date else today.day
+
+        hour = int(parts['hour']) if parts.get('hour') is not None else 0
+        minute = int(parts['minute']) if parts.get('minute') is not None else 0
+        second = int(parts['second']) if parts.get('second') is not None else 0
+
+        meridiem = parts.get('meridiem')
+        if meridiem is not None:
+            if hour >= 13:
+                raise ValueError('Invalid date')
+            hour %= 12
+            if meridiem == 'PM':
+                hour += 12
+
+        return timezone.timestamp(year, month, day, hour, minute, second)
+
+
+ISO8601_PATTERN = re.compile(
+    r'(?P<year>\d{4})(?P<dash>-?)(?P<month>\d{2})(?P=dash)(?P<day>\d{2})'
+    r'[T ](?P<hour>\d{2}):(?P<minute>\d{2})(?::(?P<second>\d{2})(?:\.\d{1,6})?)?'
+    r'(?P<offset>Z|[+-]\d{2}:?\d{2})?')
+
+
+def parse_iso8601(text, tz='UTC'):
+    """
+    Returns the epoch seconds (fractions truncated) of an ISO 8601 date and
+    time such as `2023-05-03T16:05:15-04:00`, `2019-04-26 15:12:01.000` or
+    `20191008 10:38`, as `pendulum.parse(text, tz=tz)` would. Times without
+    UTC offset are local to `tz`. Other shapes are passed to pendulum.
+    """
+    match = ISO8601_PATTERN.fullmatch(text)
+    if match is not None:
+        try:
+            return _iso8601_timestamp(match, tz)
+        except ValueError:
+            pass
+    import pendulum
+    return int(pendulum.parse(text, tz=tz).timestamp())
+
+
+def _iso8601_timestamp(match, tz):
+    year, month, day = int(match.group('year')), int(match.group('month')), int(match.group('day'))
+    hour, minute = int(match.group('hour')), int(match.group('minute'))
+    second = int(match.group('second') or 0)
+
+    offset = match.group('offset')
+    if offset is None:
+        return get_timezone(tz).timestamp(year, month, day, hour, minute, second)
+
+    check_time(hour, minute, second)
+    local_seconds = utc_day_start(year, month, day) + hour * 3600 + minute * 60 + second
+    if offset == 'Z':
+        return local_seconds
+    offset_hours, offset_minutes = int(offset[1:3]), int(offset[-2:])
+    offset_seconds = offset_hours * 3600 + offset_minutes * 60
+    return local_seconds - offset_seconds if offset[0] == '+' else local_seconds + offset_seconds
@@ -0,0 +1,68 @@
+from xml.etree.ElementTree import XMLPullParser
+
+from .stream import CHUNK_SIZE, iter_chunks
+
+
+def iter_xml_elements(source, paths, chunk_size=CHUNK_SIZE):
+    """
+    Parses an XML document from a str, bytes, a file-like object or an
+    iterable of chunks incrementally and yields `(path, element)` for every
+    complete element whose path, the tuple of tags from the root element
+    down, is in `paths`.
+
+    for path, item in iter_xml_elements(data, {('STATION', 'ITEMS', 'ITEM')}):
+        ...
+
+    A yielded element is cleared and detached once the consumer resumes,
+    elements outside `paths` as soon as they end, so memory use does not grow
+    with the size of the document.
+    """
+    path_stack = [()]
+    elements = []
+    open_matches = 0
+    for event, element in iter_xml_events(source, chunk_size):
+        if event == 'start':
+            path = path_stack[-1] + (element.tag,)
+            path_stack.append(path)
+            elements.append(element)
+            if path in paths:
+                open_matches += 1
+            continue
+
+        path = path_stack.pop()
+        elements.pop()
+        if path in paths:
+            open_matches -= 1
+            yield path, element
+        elif open_matches:
+            # part of an element that is yielded once it is complete
+            continue
+        element.clear()
+        if elements:
+            elements[-1].remove(element)
+
+
+def iter_xml_events(source, chunk_size=CHUNK_SIZE):
+    parser = XMLPullParser(events=('start', 'end'))
+    for chunk in iter_chunks(source, chunk_size):
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def xml_text(element):
+    """
+    Returns the text of an element with surrounding whitespace removed, or
+    None when there is none.
+    """
+    if element is None or not element.text:
+        return None
+    return element.text.strip() or None
+
+
+def xml_dict(element):
+    """
+    Maps the tags of an element's children to their `xml_text`.
+    """
+    return {child.tag: xml_text(child) for child in element}
@@ -1 +1,28 @@
+import importlib
+
 from .registry import TranslatorRegistry, TranslatorKeyWarning
+from .memoize import MemoizedTranslator
+
+# The batch executor imports multiprocessing and the async front end asyncio,
+# so they are only imported on first access.
+LAZY_MODULES = {
+    'AsyncTranslator': '.aio',
+    'BatchTranslator': '.executor',
+    'TranslationJob': '.executor',
+    'TranslationResult': '.executor',
+}
+
+__all__ = ['TranslatorRegistry', 'TranslatorKeyWarning', 'MemoizedTranslator', *LAZY_MODULES]
+
+
+def __getattr__(name):
+    module_name = LAZY_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
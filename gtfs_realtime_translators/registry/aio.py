@@ -0,0 +1,76 @@
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .executor import translate_bytes
+from .memoize import MemoizedTranslator
+from .registry import TranslatorRegistry
+
+
+class AsyncTranslator:
+    """
+    asyncio front-end for the registry. Translations run on an executor so
+    the event loop keeps serving while large payloads are parsed.
+
+    translator = AsyncTranslator(max_workers=4, max_concurrency_per_key=2)
+    feed_bytes = await translator.translate('njt-rail', payload)
+    feed_bytes = await translator.translate('la-metro-old', payload, stop_id='80122')
+
+    At most `max_concurrency_per_key` translations of the same key run at
+    once. Concurrent calls with the same key, configuration and payload are
+    coalesced (single-flight): the payload is translated once and every
+    caller receives the same serialized feed, or the same exception.
+    Translators come from the `TranslatorRegistry` instance pool.
+
+    By default a bounded thread pool is used; any `concurrent.futures`
+    executor can be passed instead, e.g. a `ProcessPoolExecutor`.
+    """
+
+    def __init__(self, max_workers=None, max_concurrency_per_key=2, builder=None, executor=None):
+        self.max_concurrency_per_key = max_concurrency_per_key
+        self.builder = builder
+        self.__owns_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_workers)
+        self.__semaphores = {}
+        self.__flights = {}
+
+    async def translate(self, key, payload, **config):
+        translator_klass = TranslatorRegistry.get(key)
+        if translator_klass is None:
+            raise ValueError(f'No translator registered for key={key}')
+
+        flight_key = self.__flight_key(key, translator_klass, config, payload)
+        flight = self.__flights.get(flight_key)
+        if flight is None:
+            flight = asyncio.ensure_future(self.__translate(key, config, payload))
+            self.__flights[flight_key] = flight
+            flight.add_done_callback(lambda _: self.__flights.pop(flight_key, None))
+        # a cancelled caller must not cancel the translation other callers wait for
+        return await asyncio.shield(flight)
+
+    def in_flight(self):
+        return len(self.__flights)
+
+    def close(self):
+        if self.__owns_executor:
+            self.executor.shutdown()
+
+    async def __translate(self, key, config, payload):
+        semaphore = self.__semaphores.get(key)
+        if semaphore is None:
+            semaphore = self.__semaphores[key] = asyncio.Semaphore(self.max_concurrency_per_key)
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, translate_bytes,
+                                              key, config, payload, self.builder)
+
+    @staticmethod
+    def __flight_key(key, translator_klass, config, payload):
+        digest = hashlib.sha256(payload.encode('utf-8') if isinstance(payload, str) else payload).digest()
+        return key, MemoizedTranslator.canonical_config(translator_klass, config), digest
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,121 @@
+import collections
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .registry import TranslatorRegistry
+
+
+TranslationJob = collections.namedtuple('TranslationJob', ['key', 'config', 'payload'])
+
+
+class TranslationResult(collections.namedtuple('TranslationResult', ['key', 'data', 'error'])):
+    """
+    Outcome of one `TranslationJob`: the serialized feed in `data`, or a
+    description of the failure in `error`.
+    """
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def serialize(result):
+    if isinstance(result, bytes):
+        return result
+    return result.SerializeToString()
+
+
+def translate_bytes(key, config, payload, builder=None):
+    """
+    Translates `payload` with the pooled translator instance of the current
+    process and returns the serialized feed.
+    """
+    translator = TranslatorRegistry.get_instance(key, **config)
+    if translator is None:
+        raise ValueError(f'No translator registered for key={key}')
+    if builder is None:
+        return serialize(translator(payload))
+    return serialize(translator(payload, builder=builder))
+
+
+def translate_job(key, config, payload, builder=None):
+    """
+    Runs one job in a worker. Every worker constructs a translator once per
+    configuration; failures are returned as the result's `error`.
+    """
+    try:
+        return TranslationResult(key, translate_bytes(key, config, payload, builder=builder), None)
+    except Exception as e:
+        return TranslationResult(key, None, f'{type(e).__name__}: {e}')
+
+
+class BatchTranslator:
+    """
+    Translates many feeds per call across a pool of worker processes.
+
+    Jobs are `(key, config, payload)` tuples: the registry key, the
+    translator configuration and the raw upstream payload. Each worker keeps
+    its translators in the `TranslatorRegistry` instance pool, so they stay
+    warm between batches. Results come back as serialized feeds in
+    submission order; a failing job only fails its own result.
+
+    with BatchTranslator(max_workers=4) as batch:
+        results = batch.translate([('cta-bus', {}, cta_payload),
+                                   ('njt-rail', {}, njt_payload)])
+
+    Passing a builder such as `FeedBytesBuilder` as `builder` is forwarded
+    to the arrivals translators, which then serialize without building
+    protobuf objects. Workers must be able to pickle the jobs, the builder
+    and the results.
+    """
+
+    def __init__(self, max_workers=None, builder=None, mp_context=None):
+        self.max_workers = max_workers
+        self.builder = builder
+        self.mp_context = mp_context
+        self.__executor = None
+
+    def translate(self, jobs):
+        jobs = [TranslationJob(*job) for job in jobs]
+        executor = self.__get_executor()
+        try:
+            futures = [executor.submit(translate_job, *job, builder=self.builder) for job in jobs]
+        except BrokenProcessPool:
+            # a worker died after the previous batch
+            self.__discard_executor(executor)
+            executor = self.__get_executor()
+            futures = [executor.submit(translate_job, *job, builder=self.builder) for job in jobs]
+
+        results = []
+        for job, future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool as e:
+                # a worker died; start a fresh pool for the next batch
+                self.__discard_executor(executor)
+                results.append(TranslationResult(job.key, None, f'{type(e).__name__}: {e}'))
+            except Exception as e:
+                results.append(TranslationResult(job.key, None, f'{type(e).__name__}: {e}'))
+        return results
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def __discard_executor(self, executor):
+        # stops the management thread and remaining workers of a broken pool
+        if self.__executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
+
+    def __get_executor(self):
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context)
+        return self.__executor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,88 @@
+import collections
+import hashlib
+import json
+import threading
+import time
+
+
+class MemoizedTranslator:
+    """
+    Wraps a translator and returns the cached result when the same raw
+    payload is translated again with the same configuration.
+
+    Cache keys are a hash of the payload, the translator configuration and
+    the builder used for the call. Entries are evicted least recently used
+    once `max_size` is reached, and expire `ttl` seconds after they were
+    stored.
+
+    Translators whose output depends on the wall clock set `CLOCK_DEPENDENT`
+    and can only be memoized with an explicit `clock_resolution` (seconds):
+    the current time, truncated to that resolution, becomes part of the key,
+    so results are only reused within the same time slot.
+
+    translator = MemoizedTranslator(CtaBusGtfsRealtimeTranslator)
+    translator = MemoizedTranslator(SwiftlyGtfsRealtimeTranslator, clock_resolution=60, stop_id='1')
+
+    Cached results are shared between calls and must not be modified.
+    """
+
+    def __init__(self, translator_klass, max_size=128, ttl=60, clock_resolution=None, **config):
+        if getattr(translator_klass, 'CLOCK_DEPENDENT', False) and not clock_resolution:
+            raise ValueError(f'{translator_klass.__name__} depends on the wall clock, '
+                             'clock_resolution is required to memoize it.')
+        self.translator = translator_klass(**config)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock_resolution = clock_resolution
+        self.config_key = self.canonical_config(translator_klass, config)
+        self.hits = 0
+        self.misses = 0
+        self.__cache = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def canonical_config(translator_klass, config):
+        klass_name = f'{translator_klass.__module__}.{translator_klass.__qualname__}'
+        return json.dumps([klass_name, config], sort_keys=True, default=repr)
+
+    def __call__(self, data, **kwargs):
+        key = self.__cache_key(data, kwargs)
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__cache.get(key)
+            if entry is not None and entry[0] > now:
+                self.__cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        result = self.translator(data, **kwargs)
+
+        with self.__lock:
+            self.__cache[key] = (now + self.ttl, result)
+            self.__cache.move_to_end(key)
+            while len(self.__cache) > self.max_size:
+                self.__cache.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self.__lock:
+            self.__cache.clear()
+
+    def __len__(self):
+        return len(self.__cache)
+
+    def __cache_key(self, data, kwargs):
+        digest = hashlib.sha256(self.config_key.encode('utf-8'))
+        digest.update(json.dumps(kwargs, sort_keys=True, default=self.__qualified_name).encode('utf-8'))
+        if self.clock_resolution:
+            digest.update(str(int(time.time() // self.clock_resolution)).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(data.encode('utf-8') if isinstance(data, str) else data)
+        return digest.digest()
+
+    @staticmethod
+    def __qualified_name(value):
+        if isinstance(value, type):
+            return f'{value.__module__}.{value.__qualname__}'
+        return repr(value)
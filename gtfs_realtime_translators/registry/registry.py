@@ -1,11 +1,9 @@
+import collections
+import importlib
+import threading
 import warnings
 
-from gtfs_realtime_translators.translators import LaMetroGtfsRealtimeTranslator, \
-    SeptaRegionalRailTranslator, MtaSubwayGtfsRealtimeTranslator, NjtRailGtfsRealtimeTranslator, \
-    CtaSubwayGtfsRealtimeTranslator, CtaBusGtfsRealtimeTranslator, PathGtfsRealtimeTranslator, \
-    PathNewGtfsRealtimeTranslator, SwiftlyGtfsRealtimeTranslator, WcdotGtfsRealTimeTranslator, \
-    NjtBusGtfsRealtimeTranslator, MbtaGtfsRealtimeTranslator, MnmtGtfsRealtimeTranslator, \
-    DeVVSAlertGtfsRealtimeTranslator
+from .memoize import MemoizedTranslator
 
 
 class TranslatorKeyWarning(Warning):
@@ -13,26 +11,146 @@ class TranslatorKeyWarning(Warning):
 
 
 class TranslatorRegistry:
+    """
+    Maps feed keys to translator classes.
+
+    Translators are registered as lazy references ('module:ClassName') and
+    only imported on the first `get` of their key, so a worker serving one
+    feed does not import the dependencies of all other translators. Resolved
+    classes are cached. Translator classes may also be registered directly.
+
+    Third-party packages register translators under the entry-point group
+    `ENTRY_POINT_GROUP`, with the feed key as entry-point name. Installed
+    entry points are discovered once, on the first lookup of a key that is
+    not in `TRANSLATORS`, and loaded lazily like the built-in translators.
+    Built-in keys take precedence. `clear_cache()` forces a rescan.
+
+    `get_instance` returns configured translator instances from a pool
+    instead of classes, so expensive constructors (e.g. loading a static
+    GTFS feed) only run once per configuration. Pooled instances are shared
+    between callers.
+    """
+
+    ENTRY_POINT_GROUP = 'gtfs_realtime_translators'
+    INSTANCE_POOL_SIZE = 32
+
     TRANSLATORS = {
-        'la-metro-old': LaMetroGtfsRealtimeTranslator,
-        'septa-regional-rail': SeptaRegionalRailTranslator,
-        'cta-subway': CtaSubwayGtfsRealtimeTranslator,
-        'cta-bus': CtaBusGtfsRealtimeTranslator,
-        'de-vvs-alerts': DeVVSAlertGtfsRealtimeTranslator,
-        'mta-subway': MtaSubwayGtfsRealtimeTranslator,
-        'njt-rail': NjtRailGtfsRealtimeTranslator,
-        'njt-bus': NjtBusGtfsRealtimeTranslator,
-        'path-old': PathGtfsRealtimeTranslator,
-        'path-new': PathNewGtfsRealtimeTranslator,
-        'swiftly': SwiftlyGtfsRealtimeTranslator,
-        'wcdot-bus': WcdotGtfsRealTimeTranslator,
-        'mbta': MbtaGtfsRealtimeTranslator,
-        'mnmt': MnmtGtfsRealtimeTranslator
+        'la-metro-old': 'gtfs_realtime_translators.translators.la_metro:LaMetroGtfsRealtimeTranslator',
+        'septa-regional-rail': 'gtfs_realtime_translators.translators.septa_regional_rail:SeptaRegionalRailTranslator',
+        'cta-subway': 'gtfs_realtime_translators.translators.cta_subway:CtaSubwayGtfsRealtimeTranslator',
+        'cta-bus': 'gtfs_realtime_translators.translators.cta_bus:CtaBusGtfsRealtimeTranslator',
+        'de-vvs-alerts': 'gtfs_realtime_translators.translators.de_vvs:DeVVSAlertGtfsRealtimeTranslator',
+        'mta-subway': 'gtfs_realtime_translators.translators.mta_subway:MtaSubwayGtfsRealtimeTranslator',
+        'njt-rail': 'gtfs_realtime_translators.translators.njt_rail:NjtRailGtfsRealtimeTranslator',
+        'njt-bus': 'gtfs_realtime_translators.translators.njt_bus:NjtBusGtfsRealtimeTranslator',
+        'path-old': 'gtfs_realtime_translators.translators.path_rail:PathGtfsRealtimeTranslator',
+        'path-new': 'gtfs_realtime_translators.translators.path_new:PathNewGtfsRealtimeTranslator',
+        'swiftly': 'gtfs_realtime_translators.translators.swiftly:SwiftlyGtfsRealtimeTranslator',
+        'wcdot-bus': 'gtfs_realtime_translators.translators.wcdot_bus:WcdotGtfsRealTimeTranslator',
+        'mbta': 'gtfs_realtime_translators.translators.mbta:MbtaGtfsRealtimeTranslator',
+        'mnmt': 'gtfs_realtime_translators.translators.mnmt:MnmtGtfsRealtimeTranslator'
     }
 
+    __resolved = {}
+    __plugins = None
+    __instances = collections.OrderedDict()
+    __instances_lock = threading.Lock()
+    instance_hits = 0
+    instance_misses = 0
+
     @classmethod
     def get(cls, key):
         if key in cls.TRANSLATORS:
-            return cls.TRANSLATORS[key]
+            return cls.resolve(cls.TRANSLATORS[key])
+        plugins = cls.plugins()
+        if key in plugins:
+            return cls.load_entry_point(plugins[key])
         else:
             warnings.warn(f'No translator registered for key={key}', TranslatorKeyWarning)
+
+    @classmethod
+    def get_instance(cls, key, **config):
+        """
+        Returns a translator for `key` constructed with `config`, reusing the
+        pooled instance for an equal configuration. The least recently used
+        instance is dropped once `INSTANCE_POOL_SIZE` is reached.
+        """
+        translator_klass = cls.get(key)
+        if translator_klass is None:
+            return None
+
+        instance_key = (key, MemoizedTranslator.canonical_config(translator_klass, config))
+        with cls.__instances_lock:
+            translator = cls.__instances.get(instance_key)
+            if translator is not None:
+                cls.__instances.move_to_end(instance_key)
+                cls.instance_hits += 1
+                return translator
+            cls.instance_misses += 1
+
+        translator = translator_klass(**config)
+
+        with cls.__instances_lock:
+            translator = cls.__instances.setdefault(instance_key, translator)
+            cls.__instances.move_to_end(instance_key)
+            while len(cls.__instances) > cls.INSTANCE_POOL_SIZE:
+                cls.__instances.popitem(last=False)
+        return translator
+
+    @classmethod
+    def invalidate(cls, key=None):
+        """
+        Drops the pooled instances of `key`, or of all keys.
+        """
+        with cls.__instances_lock:
+            for instance_key in list(cls.__instances):
+                if key is None or instance_key[0] == key:
+                    del cls.__instances[instance_key]
+
+    @classmethod
+    def plugins(cls):
+        """
+        Returns the entry points of all translators published under
+        `ENTRY_POINT_GROUP`, keyed by entry-point name. They are loaded on the
+        first `get` of their key.
+        """
+        if cls.__plugins is None:
+            # only needed for keys that are not built in
+            import importlib.metadata
+            entry_points = importlib.metadata.entry_points()
+            if hasattr(entry_points, 'select'):
+                entry_points = entry_points.select(group=cls.ENTRY_POINT_GROUP)
+            else:
+                entry_points = entry_points.get(cls.ENTRY_POINT_GROUP, [])
+            cls.__plugins = {entry_point.name: entry_point for entry_point in entry_points}
+        return cls.__plugins
+
+    @classmethod
+    def clear_cache(cls):
+        cls.__resolved.clear()
+        cls.__plugins = None
+        cls.invalidate()
+
+    @classmethod
+    def resolve(cls, reference):
+        if not isinstance(reference, str):
+            return reference
+        translator_klass = cls.__resolved.get(reference)
+        if translator_klass is None:
+            module_name, _, klass_name = reference.partition(':')
+            translator_klass = getattr(importlib.import_module(module_name), klass_name)
+            cls.__resolved[reference] = translator_klass
+        return translator_klass
+
+    @classmethod
+    def load_entry_point(cls, entry_point):
+        """
+        Loads the translator of an entry point once; unlike the built-in
+        'module:ClassName' references, entry-point values may name nested
+        attributes or carry extras.
+        """
+        translator_klass = cls.__resolved.get(entry_point)
+        if translator_klass is None:
+            translator_klass = entry_point.load()
+            cls.__resolved[entry_point] = translator_klass
+        return translator_klass
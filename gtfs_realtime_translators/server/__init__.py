@@ -0,0 +1,2 @@
+from .sources import FileSource, DirectorySource, UrlSource
+from .server import FeedApp, FeedRequestHandler, FeedNotFound, create_server, main
@@ -0,0 +1,189 @@
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gtfs_realtime_translators.registry import TranslatorRegistry
+from gtfs_realtime_translators.registry.executor import translate_bytes
+from .sources import DirectorySource, FileSource, UrlSource
+
+
+class FeedNotFound(Exception):
+    pass
+
+
+class CachedFeed:
+
+    def __init__(self, payload_digest, body, created_at):
+        self.payload_digest = payload_digest
+        self.body = body
+        self.gzip_body = gzip.compress(body, mtime=0)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+        self.created_at = created_at
+
+
+class FeedApp:
+    """
+    Translates the payloads of a source on request and caches the serialized
+    feeds. A cached feed is reused while the source returns the same payload
+    and it is younger than `cache_ttl` seconds; the TTL bounds the staleness
+    of translators whose output depends on the wall clock.
+
+    `config` maps registry keys to translator configuration, e.g.
+    `{'la-metro-old': {'stop_id': '80122'}}`.
+    """
+
+    def __init__(self, source, config=None, cache_ttl=15):
+        self.source = source
+        self.config = config or {}
+        self.cache_ttl = cache_ttl
+        self.__cache = {}
+        self.__lock = threading.Lock()
+
+    def get_feed(self, key):
+        if key not in TranslatorRegistry.TRANSLATORS and key not in TranslatorRegistry.plugins():
+            raise FeedNotFound(f'No translator registered for key={key}')
+        payload = self.source.get(key)
+        if payload is None:
+            raise FeedNotFound(f'No payload for key={key}')
+
+        payload_digest = hashlib.sha256(payload).digest()
+        now = time.monotonic()
+        with self.__lock:
+            feed = self.__cache.get(key)
+        if feed is not None and feed.payload_digest == payload_digest and now - feed.created_at < self.cache_ttl:
+            return feed
+
+        body = translate_bytes(key, self.config.get(key, {}), payload)
+        feed = CachedFeed(payload_digest, body, now)
+        with self.__lock:
+            self.__cache[key] = feed
+        return feed
+
+
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves `GET /feeds/<registry-key>` as serialized GTFS-realtime with a
+    strong ETag, `304 Not Modified` for a matching `If-None-Match` and the
+    precompressed gzip body for clients accepting it.
+    """
+
+    PREFIX = '/feeds/'
+    CONTENT_TYPE = 'application/x-protobuf'
+    app = None
+
+    def do_GET(self):
+        self.__serve(include_body=True)
+
+    def do_HEAD(self):
+        self.__serve(include_body=False)
+
+    def __serve(self, include_body):
+        path = self.path.split('?', 1)[0]
+        if not path.startswith(self.PREFIX):
+            return self.__send_error(HTTPStatus.NOT_FOUND, 'Not found', include_body)
+
+        try:
+            feed = self.app.get_feed(path[len(self.PREFIX):])
+        except FeedNotFound as e:
+            return self.__send_error(HTTPStatus.NOT_FOUND, str(e), include_body)
+        except Exception as e:
+            self.log_error('Translation failed: %r', e)
+            return self.__send_error(HTTPStatus.BAD_GATEWAY, f'{type(e).__name__}: {e}', include_body)
+
+        use_gzip = self.__accepts_gzip()
+        etag = feed.gzip_etag if use_gzip else feed.etag
+        if self.__matches(etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        body = feed.gzip_body if use_gzip else feed.body
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', self.CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def __accepts_gzip(self):
+        for coding in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = coding.strip().partition(';')
+            if name.strip().lower() == 'gzip':
+                return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+        return False
+
+    def __matches(self, etag):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is None:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        # If-None-Match uses the weak comparison
+        candidates = (candidate.strip() for candidate in if_none_match.split(','))
+        return any((candidate[2:] if candidate.startswith('W/') else candidate) == etag for candidate in candidates)
+
+    def __send_error(self, status, message, include_body):
+        body = message.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+
+def create_server(app, host='127.0.0.1', port=8080):
+    handler = type('BoundFeedRequestHandler', (FeedRequestHandler,), {'app': app})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve translated GTFS-realtime feeds at /feeds/<registry-key>.')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--file', help='payload file, served for --key or for every key')
+    source.add_argument('--directory', help='directory with one <key>.<extension> payload file per key')
+    source.add_argument('--url', help='upstream URL template with a {key} placeholder')
+    parser.add_argument('--key', help='registry key the --file payload is served for')
+    parser.add_argument('--config', help='JSON file mapping registry keys to translator configuration')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--cache-ttl', type=float, default=15, help='seconds a translated feed is reused')
+    args = parser.parse_args(argv)
+
+    if args.file:
+        source = FileSource(args.file, key=args.key)
+    elif args.directory:
+        source = DirectorySource(args.directory)
+    else:
+        source = UrlSource(args.url)
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+
+    server = create_server(FeedApp(source, config=config, cache_ttl=args.cache_ttl), args.host, args.port)
+    print(f'Serving feeds on http://{args.host}:{server.server_port}/feeds/<registry-key>')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+import glob
+import os
+import urllib.request
+
+
+class FileSource:
+    """
+    Serves the payload of a single file, for `key` only or, without a key,
+    for every key.
+    """
+
+    def __init__(self, path, key=None):
+        self.path = path
+        self.key = key
+
+    def get(self, key):
+        if self.key is not None and key != self.key:
+            return None
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+
+class DirectorySource:
+    """
+    Serves `<directory>/<key>.<extension>`, e.g. `cta-bus.json` for the
+    registry key `cta-bus`.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def get(self, key):
+        if os.sep in key or key.startswith('.'):
+            return None
+        paths = sorted(glob.glob(os.path.join(glob.escape(self.directory), f'{glob.escape(key)}.*')))
+        if not paths:
+            return None
+        with open(paths[0], 'rb') as f:
+            return f.read()
+
+
+class UrlSource:
+    """
+    Fetches payloads from a URL template such as
+    `http://localhost:9000/upstream/{key}`.
+    """
+
+    def __init__(self, url_template, timeout=10):
+        self.url_template = url_template
+        self.timeout = timeout
+
+    def get(self, key):
+        with urllib.request.urlopen(self.url_template.format(key=key), timeout=self.timeout) as response:
+            return response.read()
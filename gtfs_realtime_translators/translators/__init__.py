@@ -1,14 +1,35 @@
-from .la_metro import LaMetroGtfsRealtimeTranslator
-from .septa_regional_rail import SeptaRegionalRailTranslator
-from .mta_subway import MtaSubwayGtfsRealtimeTranslator
-from .njt_rail import NjtRailGtfsRealtimeTranslator
-from .njt_bus import NjtBusGtfsRealtimeTranslator
-from .cta_subway import CtaSubwayGtfsRealtimeTranslator
-from .cta_bus import CtaBusGtfsRealtimeTranslator
-from .path_rail import PathGtfsRealtimeTranslator
-from .path_new import PathNewGtfsRealtimeTranslator
-from .swiftly import SwiftlyGtfsRealtimeTranslator
-from .wcdot_bus import WcdotGtfsRealTimeTranslator
-from .mbta import MbtaGtfsRealtimeTranslator
-from .mnmt import MnmtGtfsRealtimeTranslator
-from .de_vvs import DeVVSAlertGtfsRealtimeTranslator
\ No newline at end of file
+import importlib
+
+# Translators are imported on first access, so importing one of them does not
+# pull in the dependencies (pendulum, bs4, ...) of all others.
+TRANSLATOR_MODULES = {
+    'LaMetroGtfsRealtimeTranslator': '.la_metro',
+    'SeptaRegionalRailTranslator': '.septa_regional_rail',
+    'MtaSubwayGtfsRealtimeTranslator': '.mta_subway',
+    'NjtRailGtfsRealtimeTranslator': '.njt_rail',
+    'NjtBusGtfsRealtimeTranslator': '.njt_bus',
+    'CtaSubwayGtfsRealtimeTranslator': '.cta_subway',
+    'CtaBusGtfsRealtimeTranslator': '.cta_bus',
+    'PathGtfsRealtimeTranslator': '.path_rail',
+    'PathNewGtfsRealtimeTranslator': '.path_new',
+    'SwiftlyGtfsRealtimeTranslator': '.swiftly',
+    'WcdotGtfsRealTimeTranslator': '.wcdot_bus',
+    'MbtaGtfsRealtimeTranslator': '.mbta',
+    'MnmtGtfsRealtimeTranslator': '.mnmt',
+    'DeVVSAlertGtfsRealtimeTranslator': '.de_vvs',
+}
+
+__all__ = list(TRANSLATOR_MODULES)
+
+
+def __getattr__(name):
+    module_name = TRANSLATOR_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    translator_klass = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = translator_klass
+    return translator_klass
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,27 +1,27 @@
-import json
-
-import pendulum
-
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import parse_iso8601, decode_json
 
 
 class CtaBusGtfsRealtimeTranslator:
     TIMEZONE = 'America/Chicago'
+    JSON_DECODER = None
 
-    def __call__(self, data):
-        json_data = json.loads(data)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
         predictions = json_data['bustime-response']['prd']
-        entities = [self.__make_trip_update(idx, arr) for idx, arr in enumerate(predictions)]
+        feed = builder()
+        for idx, arr in enumerate(predictions):
+            self.__make_trip_update(feed, idx, arr)
 
-        return FeedMessage.create(entities=entities)
+        return feed.build()
 
 
     @classmethod
     def __to_unix_time(cls, time):
-        return pendulum.parse(time).in_tz(cls.TIMEZONE).int_timestamp
+        return parse_iso8601(time)
 
     @classmethod
-    def __make_trip_update(cls, _id, prediction):
+    def __make_trip_update(cls, feed, _id, prediction):
         entity_id = str(_id + 1)
         route_id = prediction['rt']
         stop_id = prediction['stpid']
@@ -34,14 +34,14 @@ class CtaBusGtfsRealtimeTranslator:
         headsign = prediction['des']
         custom_status = cls.__get_custom_status(prediction['prdctdn'])
 
-        return TripUpdate.create(entity_id=entity_id,
-                                 route_id=route_id,
-                                 stop_id=stop_id,
-                                 stop_name=stop_name,
-                                 trip_id=trip_id,
-                                 arrival_time=arrival_time,
-                                 headsign=headsign,
-                                 custom_status=custom_status)
+        return feed.add_trip_update(ArrivalRecord(entity_id=entity_id,
+                                                  route_id=route_id,
+                                                  stop_id=stop_id,
+                                                  stop_name=stop_name,
+                                                  trip_id=trip_id,
+                                                  arrival_time=arrival_time,
+                                                  headsign=headsign,
+                                                  custom_status=custom_status))
 
     @classmethod
     def __get_custom_status(cls, prediction_time):
@@ -1,12 +1,10 @@
-import json
-
-import pendulum
-
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import parse_iso8601, decode_json
 
 
 class CtaSubwayGtfsRealtimeTranslator:
     TIMEZONE = 'America/Chicago'
+    JSON_DECODER = None
 
     def __init__(self, **kwargs):
         stop_list = kwargs.get('stop_list')
@@ -15,25 +13,25 @@ class CtaSubwayGtfsRealtimeTranslator:
         else:
             self.stop_list = None
 
-    def __call__(self, data):
-        json_data = json.loads(data)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
         predictions = json_data['ctatt']['eta']
 
-        entities = []
+        feed = builder()
         for idx, prediction in enumerate(predictions):
             stop_id = prediction['stpId']
             if not self.stop_list or stop_id in self.stop_list:
-                entities.append(self.__make_trip_update(idx, prediction))
+                self.__make_trip_update(feed, idx, prediction)
 
-        return FeedMessage.create(entities=entities)
+        return feed.build()
 
 
     @classmethod
     def __to_unix_time(cls, time):
-        return pendulum.parse(time).in_tz(cls.TIMEZONE).int_timestamp
+        return parse_iso8601(time)
 
     @classmethod
-    def __make_trip_update(cls, _id, prediction):
+    def __make_trip_update(cls, feed, _id, prediction):
         entity_id = str(_id + 1)
         route_id = prediction['rt']
         stop_id = prediction['stpId']
@@ -55,17 +53,17 @@ class CtaSubwayGtfsRealtimeTranslator:
         route_icon = cls.__get_route_icon(prediction['flags'], headsign)
         run_number = int(prediction['rn'])
 
-        return TripUpdate.create(entity_id=entity_id,
-                                 route_id=route_id,
-                                 stop_id=stop_id,
-                                 arrival_time=arrival_time,
-                                 headsign=headsign,
-                                 scheduled_arrival_time=scheduled_arrival_time,
-                                 custom_status=custom_status,
-                                 agency_timezone=cls.TIMEZONE,
-                                 scheduled_interval=scheduled_interval,
-                                 route_icon=route_icon,
-                                 run_number=run_number)
+        return feed.add_trip_update(ArrivalRecord(entity_id=entity_id,
+                                                  route_id=route_id,
+                                                  stop_id=stop_id,
+                                                  arrival_time=arrival_time,
+                                                  headsign=headsign,
+                                                  scheduled_arrival_time=scheduled_arrival_time,
+                                                  custom_status=custom_status,
+                                                  agency_timezone=cls.TIMEZONE,
+                                                  scheduled_interval=scheduled_interval,
+                                                  route_icon=route_icon,
+                                                  run_number=run_number))
 
     @classmethod
     def __get_custom_status(cls, arrival_time, prediction_time):
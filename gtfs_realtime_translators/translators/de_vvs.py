@@ -1,22 +1,160 @@
+import collections
+import contextlib
 import csv
 import datetime
+import functools
+import hashlib
 import io
 import json
 import logging
+import os
 import pendulum
+import tempfile
 import zipfile
-from bs4 import BeautifulSoup
+import zlib
 from google.transit import gtfs_realtime_pb2 as gtfs_realtime
 from gtfs_realtime_translators.factories import Alert, FeedMessage
+from gtfs_realtime_translators.parsers import HtmlTextCache
 
 logger = logging.getLogger(__name__)
 
+# Keyword rules guessing the effect, cause and severity of an alert. A rule
+# matches if one of its keywords is contained in the alert's header, its
+# description or, for 'text', either of both. A list of keywords matches if
+# all of them are contained in the same field. The first matching effect and
+# cause rule wins, their keywords are matched against the lower-cased texts.
+# Severity rules only apply to alerts starting within a week, the highest
+# severity of all matching rules is set; their keywords are case-sensitive.
+DEFAULT_ALERT_RULES = {
+    'effect': [
+        {'value': 'STOP_MOVED', 'header': ['verleg', 'bahnen halten'], 'description': ['ersatzhalt']},
+        {'value': 'NO_SERVICE', 'header': ['nicht angefahren', 'entfall', 'entfällt', 'gesperrt', 'ausfall']},
+        {'value': 'ACCESSIBILITY_ISSUE', 'header': ['kein barrierefrei', ['aufzug', 'betrieb']]},
+        # or reduced?
+        {'value': 'MODIFIED_SERVICE', 'header': ['fahrplanänderung', 'umleitung', 'verlängerung']},
+        # wild guessing, all cases I've seen add additional trips
+        {'value': 'ADDITIONAL_SERVICE', 'header': ['sportveranstaltung', 'konzert', 'neue haltestelle']},
+        # wild guessing, all cases I've seen announce restore of regular service
+        {'value': 'NO_EFFECT', 'header': ['regulär']},
+    ],
+    'cause': [
+        {'value': 'CONSTRUCTION', 'text': ['bauarbeiten', 'baustelle']},
+        # IMHO a cause EVENT would make sense
+        {'value': 'OTHER_CAUSE', 'text': ['konzert', 'veranstaltung']},
+        # maybe one day, there'll be a Cause NATURAL_DISASTER
+        {'value': 'WEATHER', 'text': ['erdrutsch', 'hangrutsch', 'unwetter']},
+        {'value': 'ACCIDENT', 'text': ['unfall']},
+    ],
+    'severity': [],
+}
+
+
+def load_alert_rules(rules=None):
+    """
+    Returns the rule table for `rules`: the path of a JSON file or a dict
+    shaped like `DEFAULT_ALERT_RULES`. Sections it does not contain keep
+    their default rules.
+    """
+    if isinstance(rules, str):
+        with open(rules, encoding='utf-8') as f:
+            rules = json.load(f)
+    return {section: list((rules or {}).get(section, default_rules))
+            for section, default_rules in DEFAULT_ALERT_RULES.items()}
+
+
+AlertRuleHits = collections.namedtuple('AlertRuleHits', ['effect', 'cause', 'severity'])
+
+
+class AlertRules:
+    """
+    Compiled alert rule table. The keywords of all rules are collected per
+    field, so matching an alert searches each field once for each distinct
+    keyword, and only the rules of the keywords found are evaluated. The
+    hits of the `maxsize` most recently matched header and description pairs
+    are memoized, as most alerts are sent unchanged on every poll.
+    """
+
+    SECTIONS = {
+        'effect': (gtfs_realtime.Alert.Effect, False),
+        'cause': (gtfs_realtime.Alert.Cause, False),
+        'severity': (gtfs_realtime.Alert.SeverityLevel, True),
+    }
+    FIELDS = {'header': ('header',), 'description': ('description',), 'text': ('header', 'description')}
+
+    def __init__(self, table, maxsize=1024):
+        # (field, case-sensitive) -> {keyword: term}, a term is a keyword in a field
+        self.__terms = {}
+        # term -> [(section, rule index, terms that must be found as well)]
+        self.__triggers = []
+        self.__values = {}
+        for section, (enum, case_sensitive) in self.SECTIONS.items():
+            self.__values[section] = [self.__compile(section, index, rule, enum, case_sensitive)
+                                      for index, rule in enumerate(table.get(section, []))]
+        self.__no_hits = AlertRuleHits((), (), ())
+        self.match = functools.lru_cache(maxsize=maxsize)(self.__match)
+
+    def __match(self, header, description):
+        """
+        Returns the values of all matching rules per section as
+        `AlertRuleHits`, e.g. `AlertRuleHits(effect=(9,), cause=(), severity=(4,))`.
+        """
+        texts = {'header': header, 'description': description}
+        found = set()
+        for (field, case_sensitive), terms in self.__terms.items():
+            text = texts[field] if case_sensitive else texts[field].lower()
+            found.update(map(terms.__getitem__, filter(text.__contains__, terms)))
+        if not found:
+            return self.__no_hits
+
+        hits = {}
+        for term in found:
+            for section, index, required in self.__triggers[term]:
+                if required <= found:
+                    hits.setdefault(section, set()).add(index)
+        return AlertRuleHits(*(tuple(map(self.__values[section].__getitem__, sorted(hits[section])))
+                               if section in hits else () for section in self.SECTIONS))
+
+    def __compile(self, section, index, rule, enum, case_sensitive):
+        value = rule['value']
+        if isinstance(value, str):
+            value = enum.Value(value)
+        elif value not in enum.values():
+            raise ValueError(f'Enum {enum.DESCRIPTOR.name} has no value {value!r}')
+
+        for name, entries in rule.items():
+            if name == 'value':
+                continue
+            if name not in self.FIELDS:
+                raise ValueError(f'Unknown alert rule field {name!r}')
+            if isinstance(entries, str):
+                raise ValueError(f'Alert rule field {name!r} must be a list of keywords')
+            for entry in entries:
+                keywords = [entry] if isinstance(entry, str) else list(entry)
+                if not all(keywords):
+                    raise ValueError(f'Empty keyword in alert rule {rule!r}')
+                if not case_sensitive:
+                    keywords = [keyword.lower() for keyword in keywords]
+                for field in self.FIELDS[name]:
+                    terms = [self.__term(field, case_sensitive, keyword) for keyword in keywords]
+                    self.__triggers[terms[0]].append((section, index, frozenset(terms[1:])))
+        return value
+
+    def __term(self, field, case_sensitive, keyword):
+        terms = self.__terms.setdefault((field, case_sensitive), {})
+        if keyword not in terms:
+            terms[keyword] = len(self.__triggers)
+            self.__triggers.append([])
+        return terms[keyword]
+
+
 class DeVVSAlertGtfsRealtimeTranslator:
     ''' 
     Fixes VVS GTFS-RT-Alert feed (available via https://gtfsr-servicealerts.vvs.de) by:
     * converting route_ids to their current form in the static GTFS feed
+      (the index of the static feed is persisted in `index_cache_dir`, if given)
     * explodes parent stop ids, which are not explicitly provided in GTFS (TODO: filter based on route_id/direction_id)
-    * guesses cause and effect from partial string matching of headers and description
+    * guesses cause and effect from partial string matching of headers and description,
+      following the rules of `DEFAULT_ALERT_RULES` or a JSON file passed as `rules`
     * converting the alert description from it's html encoded from into plain text
     * TODO: sets severity_level (need to figure out appropriate levels)
 
@@ -26,42 +164,69 @@ class DeVVSAlertGtfsRealtimeTranslator:
     '''
 
     TIMEZONE = 'Europe/Berlin'
-
-    def __init__(self, gtfsfile, high_prio_keywords = [], high_prio_route_ids = []):
-        self.id_mapper = DeVVSGtfsIdMapper(gtfsfile)
+    # severity depends on how soon an alert becomes active
+    CLOCK_DEPENDENT = True
+    # descriptions mostly stay the same between polls, their text and rule hits are memoized
+    DESCRIPTION_CACHE_SIZE = 1024
+    DEFAULT_SEVERITY_LEVEL = gtfs_realtime.Alert.SeverityLevel.WARNING
+    HIGH_PRIO_SEVERITY_LEVEL = gtfs_realtime.Alert.SeverityLevel.SEVERE
+
+    def __init__(self, gtfsfile, high_prio_keywords = [], high_prio_route_ids = [], rules = None, index_cache_dir = None):
+        self.id_mapper = DeVVSGtfsIdMapper(gtfsfile, cache_dir=index_cache_dir)
+        self.html_to_text = HtmlTextCache(self.DESCRIPTION_CACHE_SIZE)
         self.high_prio_keywords = high_prio_keywords
         self.high_prio_route_ids = high_prio_route_ids
 
-    def __call__(self, data):
+        table = load_alert_rules(rules)
+        if high_prio_keywords:
+            table['severity'].append({'value': self.HIGH_PRIO_SEVERITY_LEVEL, 'description': list(high_prio_keywords)})
+        self.rules = AlertRules(table, self.DESCRIPTION_CACHE_SIZE)
+
+    def __call__(self, data, builder=None):
+        # The parsed upstream feed is rewritten in place and returned, so each
+        # poll costs one parse and one serialization, without copying entities.
+        # A builder such as `FeedJsonBuilder` receives the rewritten alerts.
         feed = gtfs_realtime.FeedMessage()
         feed.ParseFromString(data)
-        entities = [self.__map_alert(idx, feedEntity) for idx, feedEntity in enumerate(feed.entity)]
-        message = FeedMessage.create(entities=entities)
-        message.header.incrementality = feed.header.incrementality
-        message.header.timestamp = feed.header.timestamp
-        return message
-
-    def __map_alert(self, _id, entity):
-        informed_entity = self.__map_informed_entities(entity.alert.informed_entity)
-        feedEntity = Alert.create_from(entity, informed_entity = informed_entity)
-
-        
-        header = entity.alert.header_text.translation[0].text.lower() if entity.alert.HasField('header_text') else ''
-        if entity.alert.HasField('description_text'):
-            html_encoded_description = entity.alert.description_text.translation[0].text
-            soup = BeautifulSoup(html_encoded_description, "lxml")
-            description = soup.get_text()
+        for feedEntity in feed.entity:
+            self.__map_alert(feedEntity)
+
+        incrementality = feed.header.incrementality
+        timestamp = feed.header.timestamp
+        feed.header.Clear()
+        feed.header.gtfs_realtime_version = FeedMessage.VERSION
+        feed.header.incrementality = incrementality
+        feed.header.timestamp = timestamp
+        if builder is None:
+            return feed
+
+        feed_builder = builder()
+        feed_builder.header.CopyFrom(feed.header)
+        for feedEntity in feed.entity:
+            feed_builder.add_alert_from(feedEntity)
+        return feed_builder.build()
+
+    def __map_alert(self, feedEntity):
+        informed_entity = self.__map_informed_entities(feedEntity.alert.informed_entity)
+        header = feedEntity.alert.header_text.translation[0].text if feedEntity.alert.HasField('header_text') else ''
+        Alert.rewrite(feedEntity, informed_entity = informed_entity)
+
+        if feedEntity.alert.HasField('description_text'):
+            html_encoded_description = feedEntity.alert.description_text.translation[0].text
+            description = self.html_to_text(html_encoded_description)
             feedEntity.alert.description_text.translation[0].text = description
         else:
             description = ''
 
+        hits = self.rules.match(header, description)
+
         if not feedEntity.alert.HasField('effect') or feedEntity.alert.effect == gtfs_realtime.Alert.Effect.UNKNOWN_EFFECT:
-            feedEntity.alert.effect = self.__map_effect(header, description.lower())
+            feedEntity.alert.effect = self.__map_effect(header, hits.effect)
 
         if not feedEntity.alert.HasField('cause') or feedEntity.alert.cause == gtfs_realtime.Alert.Cause.UNKNOWN_CAUSE:
-            feedEntity.alert.cause = self.__map_cause(header, description.lower())
+            feedEntity.alert.cause = self.__map_cause(header, hits.cause)
         
-        self.__set_severity_level(feedEntity)
+        self.__set_severity_level(feedEntity, description, hits.severity)
 
         if feedEntity.alert.HasField('url') and feedEntity.alert.url.translation[0].text == 'https://www.vvs.de':
             # if url is vvs homepage, we deem it not specific and remove it
@@ -69,7 +234,7 @@ class DeVVSAlertGtfsRealtimeTranslator:
         
         return feedEntity
 
-    def __map_effect(self, header, description) -> int:
+    def __map_effect(self, header, effects) -> int:
         """
         NO_SERVICE = 1;
         REDUCED_SERVICE = 2;
@@ -83,24 +248,13 @@ class DeVVSAlertGtfsRealtimeTranslator:
         NO_EFFECT = 10;
         ACCESSIBILITY_ISSUE = 11;
         """
-        
-        if any(map(header.__contains__, ['verleg', 'bahnen halten'])) or any(map(description.__contains__, ['ersatzhalt'])):
-            return gtfs_realtime.Alert.Effect.STOP_MOVED
-        if 'nicht angefahren' in header or 'entfall' in header or 'entfällt' in header or 'gesperrt' in header or 'ausfall' in header:
-            return gtfs_realtime.Alert.Effect.NO_SERVICE
-        if 'kein barrierefrei' in header or ('aufzug' in header and 'betrieb' in header):
-            return gtfs_realtime.Alert.Effect.ACCESSIBILITY_ISSUE
-        if any(map(header.__contains__, ['fahrplanänderung', 'umleitung', 'verlängerung'])):
-            return gtfs_realtime.Alert.Effect.MODIFIED_SERVICE # or reduced?
-        if any(map(header.__contains__, ['sportveranstaltung', 'konzert', 'neue haltestelle'])):
-            return gtfs_realtime.Alert.Effect.ADDITIONAL_SERVICE # wild guessing, all cases I've seen add additional trips
-        if 'regulär' in header:
-            return gtfs_realtime.Alert.Effect.NO_EFFECT # wild guessing, all cases I've seen announce restore of regular service
-    
-        logger.info(f'Unknown effect for: {header}')
+        if effects:
+            return effects[0]
+
+        logger.info(f'Unknown effect for: {header.lower()}')
         return gtfs_realtime.Alert.Effect.UNKNOWN_EFFECT
 
-    def __map_cause(self, header, description) -> int:
+    def __map_cause(self, header, causes) -> int:
         """
         UNKNOWN_CAUSE = 1;
         OTHER_CAUSE = 2;        // Not machine-representable.
@@ -115,22 +269,11 @@ class DeVVSAlertGtfsRealtimeTranslator:
         POLICE_ACTIVITY = 11;
         MEDICAL_EMERGENCY = 12;
         """
+        if causes:
+            return causes[0]
 
-        if self.__header_or_desc_contains_any(header, description, ['bauarbeiten', 'baustelle']):
-            return gtfs_realtime.Alert.Cause.CONSTRUCTION
-        if self.__header_or_desc_contains_any(header, description, ['konzert', 'veranstaltung']):
-            return gtfs_realtime.Alert.Cause.OTHER_CAUSE # IMHO a cause EVENT would make sense
-        if self.__header_or_desc_contains_any(header, description, ['erdrutsch', 'hangrutsch', 'unwetter']):
-            return gtfs_realtime.Alert.Cause.WEATHER # maybe one day, there'll be a Cause NATURAL_DISASTER
-        if self.__header_or_desc_contains_any(header, description, ['unfall']):
-            return gtfs_realtime.Alert.Cause.ACCIDENT
-
-        logger.info(f'Unknown cause for: {header}')
+        logger.info(f'Unknown cause for: {header.lower()}')
         return gtfs_realtime.Alert.Cause.UNKNOWN_CAUSE
-     
-    @staticmethod
-    def __header_or_desc_contains_any(header, desc, substring_list):
-        return any(map(header.__contains__, substring_list)) or any(map(desc.__contains__, substring_list))
 
     def __map_informed_entities(self, informed_entities):
         mapped_entities = []
@@ -157,22 +300,19 @@ class DeVVSAlertGtfsRealtimeTranslator:
                  
         return mapped_entities
 
-    def __set_severity_level(self, entity):
+    def __set_severity_level(self, entity, description, severities):
         # set default severity
-        entity.alert.severity_level = 3
+        entity.alert.severity_level = self.DEFAULT_SEVERITY_LEVEL
         if self.__starts_latest_in(entity, datetime.timedelta(weeks=1)):
-            # if one of keywords is contained in message, set prio to 1
-            if entity.alert.HasField('description_text'):#
-                description = entity.alert.description_text.translation[0].text
-                for high_prio_keyword in self.high_prio_keywords:      
-                    if high_prio_keyword in description:
-                        logger.debug(f'Set severity for: {description}')
-                        entity.alert.severity_level = 4
+            # if a severity rule matches, e.g. one of the high_prio_keywords is contained in the description
+            if severities:
+                logger.debug(f'Set severity for: {description}')
+                entity.alert.severity_level = max(entity.alert.severity_level, *severities)
             # if at least one of informed entity route_ids is contained in this set, set prio to 1
             for informed_entity in entity.alert.informed_entity:
                 if informed_entity.HasField('route_id') and informed_entity.route_id in self.high_prio_route_ids:
                     logger.debug(f'Set severity for: {informed_entity.route_id}')
-                    entity.alert.severity_level = 4
+                    entity.alert.severity_level = max(entity.alert.severity_level, self.HIGH_PRIO_SEVERITY_LEVEL)
 
     def __now(self):
         return datetime.datetime.now()
@@ -185,49 +325,163 @@ class DeVVSAlertGtfsRealtimeTranslator:
                 return True
         return False
 
+def file_digest(path, chunk_size=1024 * 1024):
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
 class DeVVSGtfsIdMapper:
+    """
+    Maps the stop and route ids of the VVS GTFS-RT feed to those of the
+    static GTFS feed `gtfsfile`.
+
+    The index derived from `stops.txt` and `routes.txt` can be persisted in
+    `cache_dir`. A cached index is used as long as the size and mtime of the
+    GTFS zip, or otherwise its SHA-256 digest, are unchanged, so a restarted
+    process does not scan the static feed again. The cache holds plain JSON,
+    so loading it never runs code, but whoever can write to `cache_dir` can
+    still change the mapping.
+    """
+
+    # bump when the derived index or its cache format changes
+    INDEX_VERSION = 2
+
+    def __init__(self, gtfsfile, cache_dir=None):
+        if cache_dir is not None and isinstance(gtfsfile, (str, os.PathLike)):
+            index = self._load_cached_index(gtfsfile, cache_dir)
+        else:
+            index = self._load_index(gtfsfile)
+        self.parent_stations_stops, self.route_ids = index
 
-    def __init__(self, gtfsfile):
-        self._load_stops(gtfsfile)
-        self._load_routes(gtfsfile)
+    def _load_index(self, gtfsfile):
+        with zipfile.ZipFile(gtfsfile) as zf:
+            return self._load_stops(zf), self._load_routes(zf)
 
-    def _for_each_row_in_gtfs_file(self, gtfsfile, feature_file, handle_row):
-        zf = zipfile.ZipFile(gtfsfile)
-        parent_stations_stops = {}
+    def _load_cached_index(self, gtfsfile, cache_dir):
+        """
+        Returns the index cached for `gtfsfile` if it is still valid, else
+        scans the feed and caches its index.
+        """
+        cache_file = self._index_cache_file(gtfsfile, cache_dir)
+        stat = os.stat(gtfsfile)
+        digest = None
+        try:
+            with open(cache_file, 'rb') as f:
+                version, size, mtime_ns, cached_digest = json.loads(f.readline())
+                if version == self.INDEX_VERSION and size == stat.st_size:
+                    if mtime_ns != stat.st_mtime_ns:
+                        # e.g. the same feed downloaded again
+                        digest = file_digest(gtfsfile)
+                    if mtime_ns == stat.st_mtime_ns or digest == cached_digest:
+                        index = self._decode_index(zlib.decompress(f.read()))
+                        if digest is not None:
+                            self._write_index_cache(cache_file, stat, digest, index)
+                        return index
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, zlib.error) as e:
+            logger.warning(f'Ignoring invalid GTFS index cache {cache_file}: {e!r}')
+
+        # hashed before the scan, a zip replaced meanwhile does not match the cache
+        if digest is None:
+            digest = file_digest(gtfsfile)
+        index = self._load_index(gtfsfile)
+        self._write_index_cache(cache_file, stat, digest, index)
+        return index
+
+    @staticmethod
+    def _index_cache_file(gtfsfile, cache_dir):
+        path_digest = hashlib.sha256(os.path.abspath(gtfsfile).encode('utf-8', 'surrogateescape')).hexdigest()
+        return os.path.join(cache_dir, f'de_vvs_{path_digest[:16]}.index')
+
+    def _write_index_cache(self, cache_file, stat, digest, index):
+        """
+        Writes the cache file atomically: a JSON header line with the version
+        of the index and the size, mtime and digest of the GTFS zip, followed
+        by the zlib-compressed JSON index.
+        """
+        temp_file = None
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_file), suffix='.tmp', delete=False) as f:
+                temp_file = f.name
+                header = [self.INDEX_VERSION, stat.st_size, stat.st_mtime_ns, digest]
+                f.write(json.dumps(header).encode('utf-8') + b'\n')
+                f.write(zlib.compress(self._encode_index(index), 1))
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            logger.warning(f'Could not write GTFS index cache {cache_file}: {e!r}')
+            if temp_file is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(temp_file)
+
+    @staticmethod
+    def _encode_index(index):
+        # JSON has neither sets nor null keys, so stations are stored as pairs
+        parent_stations_stops, route_ids = index
+        return json.dumps([[[parent_station, list(stops)] for parent_station, stops in parent_stations_stops.items()],
+                           list(route_ids)]).encode('utf-8')
+
+    @staticmethod
+    def _decode_index(data):
+        parent_stations_stops, route_ids = json.loads(data)
+        return ({parent_station: set(stops) for parent_station, stops in parent_stations_stops},
+                set(route_ids))
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _open_csv(zf, feature_file):
+        """
+        Yields the column indexes by name and a reader for the remaining rows
+        of a GTFS file.
+        """
         with zf.open(feature_file, 'r') as csvfile:
-            csvreader = csv.DictReader(io.TextIOWrapper(csvfile, 'utf-8-sig'), delimiter=',', quotechar='"')
-            for row in csvreader:
-                handle_row(row)
-
-    def _parent_station(self, stop):
-        parent_station = stop.get('parent_station')
-        if parent_station is None or parent_station == '':
-            pos = self.find_nth(stop['stop_id'], ':', 3)
-            if pos > 0:
-                parent_station = stop['stop_id'][:pos]
-        
-        return parent_station
-        
-    def _load_stops(self, gtfsfile):
+            csvreader = csv.reader(io.TextIOWrapper(csvfile, 'utf-8-sig'), delimiter=',', quotechar='"')
+            header = next(csvreader, [])
+            yield {name: index for index, name in enumerate(header)}, csvreader
+
+    @staticmethod
+    def _column(row, index):
+        # like csv.DictReader, missing trailing values are None
+        try:
+            return row[index]
+        except (IndexError, TypeError):
+            return None
+
+    def _load_stops(self, zf):
         parent_stations_stops = {}
-        def handle_stop(stop):
-            if stop['location_type'] is not None and stop['location_type'] not in ['', '0']:
-                return
-            parent_station = self._parent_station(stop)
-            if parent_station not in parent_stations_stops:
-                parent_stations_stops[parent_station] = set()
-            parent_stations_stops[parent_station].add(stop['stop_id'])
-
-        self._for_each_row_in_gtfs_file(gtfsfile, 'stops.txt', handle_stop)
-        self.parent_stations_stops = parent_stations_stops
-
-    def _load_routes(self, gtfsfile):
-        route_ids = set()
-        def handle_route(route):
-            route_ids.add(route['route_id'])
-
-        self._for_each_row_in_gtfs_file(gtfsfile, 'routes.txt', handle_route)
-        self.route_ids = route_ids
+        column = self._column
+        find_nth = self.find_nth
+        with self._open_csv(zf, 'stops.txt') as (columns, csvreader):
+            stop_id_column = columns['stop_id']
+            location_type_column = columns['location_type']
+            parent_station_column = columns.get('parent_station')
+            for row in csvreader:
+                if not row:
+                    continue
+                location_type = column(row, location_type_column)
+                if location_type is not None and location_type != '' and location_type != '0':
+                    continue
+                stop_id = column(row, stop_id_column)
+                parent_station = column(row, parent_station_column)
+                if parent_station is None or parent_station == '':
+                    # implied by the first three components of the stop_id
+                    pos = find_nth(stop_id, ':', 3)
+                    if pos > 0:
+                        parent_station = stop_id[:pos]
+                stops = parent_stations_stops.get(parent_station)
+                if stops is None:
+                    stops = parent_stations_stops[parent_station] = set()
+                stops.add(stop_id)
+        return parent_stations_stops
+
+    def _load_routes(self, zf):
+        with self._open_csv(zf, 'routes.txt') as (columns, csvreader):
+            route_id_column = columns['route_id']
+            return {self._column(row, route_id_column) for row in csvreader if row}
 
     @staticmethod
     def find_nth(wholestring: str, pattern: str, n: int) -> int:
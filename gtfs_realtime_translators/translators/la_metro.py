@@ -1,21 +1,27 @@
-import json
 import math
 
 import pendulum
 
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import decode_json
 from gtfs_realtime_translators.validators import RequiredFieldValidator
 
 
 class LaMetroGtfsRealtimeTranslator:
+    # arrival times are computed relative to the current time
+    CLOCK_DEPENDENT = True
+    JSON_DECODER = None
+
     def __init__(self, stop_id=None):
         RequiredFieldValidator.validate_field_value('stop_id', stop_id)
         self.stop_id = stop_id
 
-    def __call__(self, data):
-        json_data = json.loads(data)
-        entities = [ self.__make_trip_update(idx, self.stop_id, arrival) for idx, arrival in enumerate(json_data['items']) ]
-        return FeedMessage.create(entities=entities)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
+        feed = builder()
+        for idx, arrival in enumerate(json_data['items']):
+            self.__make_trip_update(feed, idx, self.stop_id, arrival)
+        return feed.build()
 
     @classmethod
     def calculate_trip_id(cls, trip_id):
@@ -29,15 +35,15 @@ class LaMetroGtfsRealtimeTranslator:
             return trip_id
 
     @classmethod
-    def __make_trip_update(cls, _id, stop_id, arrival):
+    def __make_trip_update(cls, feed, _id, stop_id, arrival):
         entity_id = str(_id + 1)
         now = int(pendulum.now().timestamp())
         arrival_time = now + math.floor(arrival['seconds'] / 60) * 60
         trip_id = cls.calculate_trip_id(arrival['trip_id'])
         route_id = arrival.get('route_id','')
 
-        return TripUpdate.create(entity_id=entity_id,
-                                 arrival_time=arrival_time,
-                                 trip_id=trip_id,
-                                 route_id=route_id,
-                                 stop_id=stop_id)
+        return feed.add_trip_update(ArrivalRecord(entity_id=entity_id,
+                                                  arrival_time=arrival_time,
+                                                  trip_id=trip_id,
+                                                  route_id=route_id,
+                                                  stop_id=stop_id))
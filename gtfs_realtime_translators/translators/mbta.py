@@ -1,94 +1,160 @@
-import json
+import collections
 import warnings
 
-import pendulum
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import JsonStream, parse_iso8601, decode_json
 
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+
+# the fields of a prediction the feed is built from
+Prediction = collections.namedtuple('Prediction', [
+    'stop_id', 'route_id', 'trip_id', 'arrival_time', 'departure_time', 'direction_id', 'schedule'])
 
 
 class MbtaGtfsRealtimeTranslator:
     TIMEZONE = 'America/New_York'
+    JSON_DECODER = None
 
-    def __call__(self, data):
-        json_data = json.loads(data)
-        entities = []
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
+        feed = builder(group_by_trip=True)
         predictions = json_data.get('data')
         static_relationships = json_data.get('included')
         if predictions and static_relationships:
             static_data = self.__get_static_data(static_relationships)
-            entities = self.__make_trip_updates(predictions, static_data)
-        return FeedMessage.create(entities=entities)
+            self.__make_trip_updates(feed, predictions, static_data)
+        return feed.build()
+
+    def translate_stream(self, source, builder=FeedMessageBuilder):
+        """
+        Translates a response read incrementally from `source`, a file-like
+        object or an iterable of byte chunks such as an HTTP response body,
+        to the same feed as `__call__`.
+
+        Predictions and `included` resources are reduced to the fields the
+        feed needs while they are read, so the parsed document is never held
+        in memory. Predictions can only be turned into entities once the
+        static data in `included` is complete. The MBTA API sends `data`
+        before `included`, so in practice every reduced prediction is
+        buffered until the end of the document and memory still grows with
+        the number of predictions; only a document with `included` first is
+        translated while its predictions are read.
+        """
+        stream = JsonStream(source)
+        feed = builder(group_by_trip=True)
+        predictions = []
+        prediction_count = 0
+        static_data = None
+        for key in stream.iter_object():
+            if key == 'data':
+                for prediction in stream.iter_items():
+                    prediction = self.__get_prediction(prediction)
+                    prediction_count += 1
+                    if static_data is None:
+                        predictions.append(prediction)
+                    elif static_data:
+                        self.__make_trip_update(feed, str(prediction_count), prediction, static_data)
+            elif key == 'included':
+                static_data = self.__new_static_data()
+                has_static_data = False
+                for entity in stream.iter_items():
+                    self.__add_static_entry(static_data, entity)
+                    has_static_data = True
+                if not has_static_data:
+                    static_data = {}
+        stream.close()
+
+        if static_data:
+            for idx, prediction in enumerate(predictions):
+                self.__make_trip_update(feed, str(idx + 1), prediction, static_data)
+        return feed.build()
 
     @classmethod
     def __to_unix_time(cls, time):
-        return pendulum.parse(time).in_tz(cls.TIMEZONE).int_timestamp
+        return parse_iso8601(time)
 
     @classmethod
-    def __make_trip_updates(cls, predictions, static_data):
-        trip_updates = []
+    def __make_trip_updates(cls, feed, predictions, static_data):
         for idx, prediction in enumerate(predictions):
-            entity_id = str(idx + 1)
-            relationships = prediction['relationships']
-            attributes = prediction['attributes']
-            stop_id = relationships['stop']['data']['id']
-            route_id = relationships['route']['data']['id']
-            trip_id = relationships['trip']['data']['id']
-            raw_arrival_time = attributes['arrival_time']
-            raw_departure_time = attributes['departure_time']
-            direction_id = attributes['direction_id']
-
-            route_color = static_data['routes'][route_id]['color']
-            route_text_color = static_data['routes'][route_id]['text_color']
-            route_long_name = static_data['routes'][route_id]['long_name']
-            route_short_name = static_data['routes'][route_id]['short_name']
-
-            headsign = static_data['trips'][trip_id]['headsign']
-
-            scheduled_arrival_time, scheduled_departure_time = \
-                cls.__get_scheduled_data(relationships['schedule'].get('data'),
-                                         static_data['schedules'])
-
-            stop_name = cls.__get_stop_data(stop_id,
-                                            static_data['stops'])
-
-            if cls.__should_capture_prediction(raw_departure_time):
-                arrival_time, departure_time = cls.__set_arrival_and_departure_times(
-                    raw_arrival_time, raw_departure_time)
-                trip_update = TripUpdate.create(
-                    entity_id=entity_id,
-                    route_id=route_id,
-                    stop_id=stop_id,
-                    trip_id=trip_id,
-                    arrival_time=arrival_time,
-                    departure_time=departure_time,
-                    direction_id=direction_id,
-                    route_color=route_color,
-                    route_text_color=route_text_color,
-                    route_long_name=route_long_name,
-                    route_short_name=route_short_name,
-                    scheduled_arrival_time=scheduled_arrival_time,
-                    scheduled_departure_time=scheduled_departure_time,
-                    stop_name=stop_name,
-                    headsign=headsign,
-                    agency_timezone=cls.TIMEZONE
-                )
-                trip_updates.append(trip_update)
-
-        return trip_updates
+            cls.__make_trip_update(feed, str(idx + 1), cls.__get_prediction(prediction), static_data)
 
     @classmethod
-    def __get_static_data(cls, static_relationships):
+    def __get_prediction(cls, prediction):
+        relationships = prediction['relationships']
+        attributes = prediction['attributes']
+        return Prediction(stop_id=relationships['stop']['data']['id'],
+                          route_id=relationships['route']['data']['id'],
+                          trip_id=relationships['trip']['data']['id'],
+                          arrival_time=attributes['arrival_time'],
+                          departure_time=attributes['departure_time'],
+                          direction_id=attributes['direction_id'],
+                          schedule=relationships['schedule'].get('data'))
+
+    @classmethod
+    def __make_trip_update(cls, feed, entity_id, prediction, static_data):
+        stop_id = prediction.stop_id
+        route_id = prediction.route_id
+        trip_id = prediction.trip_id
+        raw_arrival_time = prediction.arrival_time
+        raw_departure_time = prediction.departure_time
+        direction_id = prediction.direction_id
+
+        route_color = static_data['routes'][route_id]['color']
+        route_text_color = static_data['routes'][route_id]['text_color']
+        route_long_name = static_data['routes'][route_id]['long_name']
+        route_short_name = static_data['routes'][route_id]['short_name']
+
+        headsign = static_data['trips'][trip_id]['headsign']
+
+        scheduled_arrival_time, scheduled_departure_time = \
+            cls.__get_scheduled_data(prediction.schedule,
+                                     static_data['schedules'])
+
+        stop_name = cls.__get_stop_data(stop_id,
+                                        static_data['stops'])
+
+        if cls.__should_capture_prediction(raw_departure_time):
+            arrival_time, departure_time = cls.__set_arrival_and_departure_times(
+                raw_arrival_time, raw_departure_time)
+            feed.add_trip_update(ArrivalRecord(
+                entity_id=entity_id,
+                route_id=route_id,
+                stop_id=stop_id,
+                trip_id=trip_id,
+                arrival_time=arrival_time,
+                departure_time=departure_time,
+                direction_id=direction_id,
+                route_color=route_color,
+                route_text_color=route_text_color,
+                route_long_name=route_long_name,
+                route_short_name=route_short_name,
+                scheduled_arrival_time=scheduled_arrival_time,
+                scheduled_departure_time=scheduled_departure_time,
+                stop_name=stop_name,
+                headsign=headsign,
+                agency_timezone=cls.TIMEZONE
+            ))
+
+    @classmethod
+    def __new_static_data(cls):
         static_data = {}
         for subclass in StaticData.__subclasses__():
             static_data[subclass.NAME] = {}
+        return static_data
 
+    @classmethod
+    def __add_static_entry(cls, static_data, entity):
+        entity_type = entity['type']
+        static_data_type = StaticDataTypeRegistry.get(entity_type)
+        static_data[static_data_type.NAME][entity['id']] = \
+            static_data_type.create_entry(entity['id'],
+                                          entity['attributes'],
+                                          static_data_type.FIELDS)
+
+    @classmethod
+    def __get_static_data(cls, static_relationships):
+        static_data = cls.__new_static_data()
         for entity in static_relationships:
-            entity_type = entity['type']
-            static_data_type = StaticDataTypeRegistry.get(entity_type)
-            static_data[static_data_type.NAME][entity['id']] = \
-                static_data_type.create_entry(entity['id'],
-                                              entity['attributes'],
-                                              static_data_type.FIELDS)
+            cls.__add_static_entry(static_data, entity)
         return static_data
 
     @classmethod
@@ -1,28 +1,27 @@
-import json
-
 import pendulum
 
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import decode_json
 
 
 class MnmtGtfsRealtimeTranslator:
     TIMEZONE = 'America/Chicago'
+    JSON_DECODER = None
 
-    def __call__(self, data):
-        json_data = json.loads(data)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
 
         stops_list = json_data.get('stops')
         departures_list = json_data.get('departures')
 
-        entities = []
+        feed = builder(group_by_trip=True)
         if stops_list and departures_list:
-            entities = self.__make_trip_updates(stops_list, departures_list)
+            self.__make_trip_updates(feed, stops_list, departures_list)
 
-        return FeedMessage.create(entities=entities)
+        return feed.build()
 
     @classmethod
-    def __make_trip_updates(cls, stops_list, departures_list):
-        trip_updates = []
+    def __make_trip_updates(cls, feed, stops_list, departures_list):
         stop_name = stops_list[0].get("description")
 
         for index, departure in enumerate(departures_list):
@@ -49,24 +48,20 @@ class MnmtGtfsRealtimeTranslator:
 
             route_short_name = cls.__get_route_short_name(departure)
 
-            trip_update = TripUpdate.create(entity_id=entity_id,
-                                            departure_time=departure_time,
-                                            arrival_time=arrival_time,
-                                            scheduled_departure_time=scheduled_departure_time,
-                                            scheduled_arrival_time=scheduled_arrival_time,
-                                            trip_id=trip_id,
-                                            route_id=route_id,
-                                            route_short_name=route_short_name,
-                                            stop_id=stop_id,
-                                            stop_name=stop_name,
-                                            headsign=headsign,
-                                            direction_id=direction_id,
-                                            agency_timezone=cls.TIMEZONE
-                                            )
-
-            trip_updates.append(trip_update)
-
-        return trip_updates
+            feed.add_trip_update(ArrivalRecord(entity_id=entity_id,
+                                               departure_time=departure_time,
+                                               arrival_time=arrival_time,
+                                               scheduled_departure_time=scheduled_departure_time,
+                                               scheduled_arrival_time=scheduled_arrival_time,
+                                               trip_id=trip_id,
+                                               route_id=route_id,
+                                               route_short_name=route_short_name,
+                                               stop_id=stop_id,
+                                               stop_name=stop_name,
+                                               headsign=headsign,
+                                               direction_id=direction_id,
+                                               agency_timezone=cls.TIMEZONE
+                                 ))
 
     @classmethod
     def __is_realtime_departure(cls, departure):
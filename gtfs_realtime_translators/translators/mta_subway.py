@@ -1,20 +1,21 @@
-import json
-
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import decode_json
 
 
 class MtaSubwayGtfsRealtimeTranslator:
-    def __call__(self, data):
-        json_data = json.loads(data)
-        entities = []
+    JSON_DECODER = None
+
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
+        feed = builder()
         for stop in json_data:
             for group in stop["groups"]:
                 for idx, arrival in enumerate(group["times"]):
                     route_id = self.parse_id(group['route']['id'])
                     stop_name = stop['stop']['name']
-                    entities.append(self.__make_trip_update(idx, route_id, stop_name, arrival))
+                    self.__make_trip_update(feed, idx, route_id, stop_name, arrival)
 
-        return FeedMessage.create(entities=entities)
+        return feed.build()
 
     @classmethod
     def parse_id(cls, value):
@@ -28,7 +29,7 @@ class MtaSubwayGtfsRealtimeTranslator:
             return value
 
     @classmethod
-    def __make_trip_update(cls, _id, route_id, stop_name, arrival):
+    def __make_trip_update(cls, feed, _id, route_id, stop_name, arrival):
         entity_id = str(_id + 1)
         arrival_time = arrival['serviceDay'] + arrival['realtimeArrival']
         departure_time = arrival['serviceDay'] + arrival['realtimeDeparture']
@@ -41,14 +42,14 @@ class MtaSubwayGtfsRealtimeTranslator:
         scheduled_departure_time = arrival['serviceDay'] + arrival['scheduledDeparture']
         track = arrival.get('track', '')
 
-        return TripUpdate.create(entity_id=entity_id,
-                                arrival_time=arrival_time,
-                                departure_time=departure_time,
-                                trip_id=trip_id,
-                                route_id=route_id,
-                                stop_id=stop_id,
-                                stop_name=stop_name,
-                                headsign=headsign,
-                                scheduled_arrival_time=scheduled_arrival_time,
-                                scheduled_departure_time=scheduled_departure_time,
-                                track=track)
+        return feed.add_trip_update(ArrivalRecord(entity_id=entity_id,
+                                                  arrival_time=arrival_time,
+                                                  departure_time=departure_time,
+                                                  trip_id=trip_id,
+                                                  route_id=route_id,
+                                                  stop_id=stop_id,
+                                                  stop_name=stop_name,
+                                                  headsign=headsign,
+                                                  scheduled_arrival_time=scheduled_arrival_time,
+                                                  scheduled_departure_time=scheduled_departure_time,
+                                                  track=track))
@@ -1,98 +1,88 @@
-import pendulum
-import xmltodict
-from gtfs_realtime_translators.factories import FeedMessage, TripUpdate
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import FormatParser, iter_xml_elements, xml_dict, xml_text
 
 
 class NjtBusGtfsRealtimeTranslator:
 
     TIMEZONE = 'America/New_York'
+    TIME_FORMAT = FormatParser('DD-MMM-YY HH:mm A')
+    TRIP_PATH = ('SCHEDULEROWSET', 'TRIP')
+    STOP_PATH = ('SCHEDULEROWSET', 'TRIP', 'STOP')
 
     def __init__(self, stop_list):
         self.filtered_stops = stop_list.split(',')
         if self.filtered_stops is None:
             raise ValueError('filtered_stops is required.')
+        # the stop filter translated to the stop codes of the feed
+        self.filtered_stop_codes = NJTBusStopCodeIdMappings.get_stop_codes(self.filtered_stops)
 
-    def __call__(self, data):
-        station_data = xmltodict.parse(data)
-        entities = self.__make_trip_updates(station_data, self.filtered_stops)
-        return FeedMessage.create(entities=entities)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        feed = builder(group_by_trip=True)
+        self.__make_trip_updates(feed, data, self.filtered_stop_codes)
+        return feed.build()
 
     @classmethod
     def __to_unix_time(cls, time):
-        dt = pendulum.from_format(time, 'DD-MMM-YY HH:mm A', tz=cls.TIMEZONE).in_tz('UTC')
-        return dt
+        return cls.TIME_FORMAT.timestamp(time, tz=cls.TIMEZONE)
 
     @classmethod
-    def __skip_processing(cls, stop_id, filtered_stops):
-        # Skip Stop if stop_id is not found
-        if stop_id is None:
-            return True
-        # Skip Stop if stop_id is not in filtered stops
-        if stop_id not in filtered_stops:
-            return True
-        return False
+    def __make_trip_updates(cls, feed, data, filtered_stop_codes):
+        """
+        Parses the document incrementally. Every <STOP> is checked against
+        the stop filter as soon as it is read and discarded unless it
+        matches; the matching stops of a <TRIP> are translated once the trip
+        is complete.
+        """
+        stops = []
+        trip_count = 0
+        for path, element in iter_xml_elements(data, {cls.TRIP_PATH, cls.STOP_PATH}):
+            if path == cls.STOP_PATH:
+                if xml_text(element.find('gtfs_stop_Code')) in filtered_stop_codes:
+                    stops.append(xml_dict(element))
+                continue
+
+            trip_count += 1
+            if stops:
+                cls.__make_stop_trip_updates(feed, str(trip_count), xml_dict(element), stops)
+                stops = []
 
     @classmethod
-    def __make_trip_updates(cls, data, filtered_stops):
-        trip_updates = []
-        schedule_row_set = data.get('SCHEDULEROWSET')
-
-        trips = []
-        if schedule_row_set:
-            trips = schedule_row_set.values()
-
-        for value in trips:
-            for idx, item_entry in enumerate(value):
-                # Intersection Extensions
-                headsign = item_entry['busheader']
-                trip_id = item_entry['gtfs_trip_id']
-                route_id = item_entry['gtfs_route_id']
-                if item_entry.get('STOP', None) is not None:
-                    stops = item_entry['STOP']
-
-                    # If there is only one <STOP> for the <TRIP> we have to explicitly create a list
-                    if not isinstance(stops, list):
-                       stops = [stops]
-
-                    # Process Stops
-                    for stop in stops:
-                        stop_code = stop['gtfs_stop_Code']
-                        # Get Stop ID for the given Stop Code From the Mapping
-                        stop_id = NJTBusStopCodeIdMappings.get_stop_id(stop_code)
-
-                        if cls.__skip_processing(stop_id, filtered_stops):
-                            continue
-
-                        stop_name = stop['stopname']
-                        track = stop['manual_lane_gate']
-                        if not track:
-                            track = stop['scheduled_lane_gate']
-
-                        scheduleddeparturedate = stop['scheduleddeparturedate']
-                        scheduleddeparturetime = stop['scheduleddeparturetime']
-                        scheduled_datetime = cls.__to_unix_time("{} {}".format(scheduleddeparturedate.title(), scheduleddeparturetime))
-                        scheduled_departure_time = int(scheduled_datetime.timestamp())
-
-                        sec_late = 0
-                        if stop['sec_late']:
-                            sec_late = int(stop['sec_late'])
-                        arrival_time = int(scheduled_datetime.add(seconds=sec_late).timestamp())
-
-                        trip_update = TripUpdate.create(entity_id=str(idx + 1),
-                                                        route_id=route_id,
-                                                        trip_id=trip_id,
-                                                        stop_id=stop_id,
-                                                        headsign=headsign,
-                                                        stop_name=stop_name,
-                                                        track=track,
-                                                        arrival_time=arrival_time,
-                                                        departure_time=arrival_time,
-                                                        scheduled_departure_time=scheduled_departure_time,
-                                                        scheduled_arrival_time=scheduled_departure_time,
-                                                        agency_timezone=cls.TIMEZONE)
-                        trip_updates.append(trip_update)
-
-        return trip_updates
+    def __make_stop_trip_updates(cls, feed, entity_id, item_entry, stops):
+        # Intersection Extensions
+        headsign = item_entry['busheader']
+        trip_id = item_entry['gtfs_trip_id']
+        route_id = item_entry['gtfs_route_id']
+
+        # Process Stops
+        for stop in stops:
+            stop_id = NJTBusStopCodeIdMappings.get_stop_id(stop['gtfs_stop_Code'])
+            stop_name = stop['stopname']
+            track = stop['manual_lane_gate']
+            if not track:
+                track = stop['scheduled_lane_gate']
+
+            scheduleddeparturedate = stop['scheduleddeparturedate']
+            scheduleddeparturetime = stop['scheduleddeparturetime']
+            scheduled_datetime = cls.__to_unix_time("{} {}".format(scheduleddeparturedate.title(), scheduleddeparturetime))
+            scheduled_departure_time = scheduled_datetime
+
+            sec_late = 0
+            if stop['sec_late']:
+                sec_late = int(stop['sec_late'])
+            arrival_time = scheduled_datetime + sec_late
+
+            feed.add_trip_update(ArrivalRecord(entity_id=entity_id,
+                                               route_id=route_id,
+                                               trip_id=trip_id,
+                                               stop_id=stop_id,
+                                               headsign=headsign,
+                                               stop_name=stop_name,
+                                               track=track,
+                                               arrival_time=arrival_time,
+                                               departure_time=arrival_time,
+                                               scheduled_departure_time=scheduled_departure_time,
+                                               scheduled_arrival_time=scheduled_departure_time,
+                                               agency_timezone=cls.TIMEZONE))
 
 
 class NJTBusStopCodeIdMappings:
@@ -130,3 +120,11 @@ class NJTBusStopCodeIdMappings:
             return cls.stops[stop_code]
         except KeyError:
             return None
+
+    @classmethod
+    def get_stop_codes(cls, stop_ids):
+        """
+        Returns the set of stop codes mapped to any of `stop_ids`.
+        """
+        stop_ids = set(stop_ids)
+        return frozenset(stop_code for stop_code, stop_id in cls.stops.items() if stop_id in stop_ids)
@@ -1,7 +1,5 @@
-import pendulum
-
-from gtfs_realtime_translators.factories import FeedMessage, TripUpdate
-import xmltodict
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import FormatParser, iter_xml_elements, xml_dict, xml_text
 
 
 class NjtRailGtfsRealtimeTranslator:
@@ -20,70 +18,92 @@ class NjtRailGtfsRealtimeTranslator:
     """
 
     TIMEZONE = 'America/New_York'
+    TIME_FORMAT = FormatParser('DD-MMM-YYYY HH:mm:ss A')
+    STATION_FIELDS = ('STATION_2CHAR', 'STATIONNAME')
+    ELEMENT_PATHS = {('STATION', 'STATION_2CHAR'), ('STATION', 'STATIONNAME'), ('STATION', 'ITEMS', 'ITEM')}
 
-    def __call__(self, data):
-        station_data = xmltodict.parse(data)
-        entities = self.__make_trip_updates(station_data)
-        return FeedMessage.create(entities=entities)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        feed = builder()
+        self.__make_trip_updates(feed, data)
+        return feed.build()
 
     @classmethod
     def __to_unix_time(cls, time):
-        datetime = pendulum.from_format(time, 'DD-MMM-YYYY HH:mm:ss A', tz=cls.TIMEZONE).in_tz('UTC')
-        return datetime
+        return cls.TIME_FORMAT.timestamp(time, tz=cls.TIMEZONE)
+
+    @classmethod
+    def __make_trip_updates(cls, feed, data):
+        """
+        Parses the document incrementally, one <ITEM> at a time. Items are
+        only held back while the station fields have not been read.
+        """
+        station = {}
+        pending_items = []
+        item_count = 0
+        for path, element in iter_xml_elements(data, cls.ELEMENT_PATHS):
+            if path[-1] != 'ITEM':
+                station[path[-1]] = xml_text(element)
+                continue
+            pending_items.append((item_count, cls.__get_item_entry(element)))
+            item_count += 1
+            if all(field in station for field in cls.STATION_FIELDS):
+                for idx, item_entry in pending_items:
+                    cls.__make_trip_update(feed, station, idx, item_entry)
+                pending_items = []
+        for idx, item_entry in pending_items:
+            cls.__make_trip_update(feed, station, idx, item_entry)
 
     @classmethod
-    def __make_trip_updates(cls, data):
-        trip_updates = []
-
-        station_data_item = data['STATION']['ITEMS'].values()
-        for value in station_data_item:
-            for idx, item_entry in enumerate(value):
-                origin_and_destination = None
-                stops = item_entry['STOPS']
-                if stops:
-                    for stop in stops.values():
-                        origin_and_destination = [stop[i] for i in (0, -1)]
-
-                    route_id = cls.__get_route_id(item_entry,
-                                                  origin_and_destination)
-                    if route_id:
-                        # Intersection Extensions
-                        headsign = item_entry['DESTINATION']
-                        route_short_name = cls.__get_route_short_name(item_entry)
-                        route_long_name = cls.__get_route_long_name(item_entry)
-                        route_color = cls.__get_route_color(item_entry, route_id)
-                        route_text_color = cls.__get_route_text_color(item_entry, route_id)
-                        block_id = item_entry['TRAIN_ID']
-                        track = item_entry['TRACK']
-                        stop_id = data['STATION']['STATION_2CHAR']
-                        stop_name = data['STATION']['STATIONNAME']
-                        scheduled_datetime = cls.__to_unix_time(item_entry['SCHED_DEP_DATE'])
-                        departure_time = int(scheduled_datetime.add(seconds=int(item_entry['SEC_LATE'])).timestamp())
-                        scheduled_departure_time = int(scheduled_datetime.timestamp())
-                        custom_status = item_entry['STATUS']
-                        route_icon = cls.__get_route_icon(headsign)
-
-                        trip_update = TripUpdate.create(entity_id=str(idx + 1),
-                                                    departure_time=departure_time,
-                                                    scheduled_departure_time=scheduled_departure_time,
-                                                    arrival_time=departure_time,
-                                                    scheduled_arrival_time=scheduled_departure_time,
-                                                    route_id=route_id,
-                                                    route_short_name=route_short_name,
-                                                    route_long_name=route_long_name,
-                                                    route_color=route_color,
-                                                    route_text_color=route_text_color,
-                                                    stop_id=stop_id,
-                                                    stop_name=stop_name,
-                                                    headsign=headsign,
-                                                    track=track,
-                                                    block_id=block_id,
-                                                    agency_timezone=cls.TIMEZONE,
-                                                    custom_status=custom_status,
-                                                    route_icon=route_icon)
-                        trip_updates.append(trip_update)
-
-        return trip_updates
+    def __get_item_entry(cls, element):
+        item_entry = xml_dict(element)
+        # the origin and destination are the first and last stop
+        stops = element.findall('STOPS/STOP')
+        item_entry['STOPS'] = [xml_dict(stops[i]) for i in (0, -1)] if stops else None
+        return item_entry
+
+    @classmethod
+    def __make_trip_update(cls, feed, station, idx, item_entry):
+        origin_and_destination = item_entry['STOPS']
+        if not origin_and_destination:
+            return
+
+        route_id = cls.__get_route_id(item_entry,
+                                      origin_and_destination)
+        if route_id:
+            # Intersection Extensions
+            headsign = item_entry['DESTINATION']
+            route_short_name = cls.__get_route_short_name(item_entry)
+            route_long_name = cls.__get_route_long_name(item_entry)
+            route_color = cls.__get_route_color(item_entry, route_id)
+            route_text_color = cls.__get_route_text_color(item_entry, route_id)
+            block_id = item_entry['TRAIN_ID']
+            track = item_entry['TRACK']
+            stop_id = station['STATION_2CHAR']
+            stop_name = station['STATIONNAME']
+            scheduled_datetime = cls.__to_unix_time(item_entry['SCHED_DEP_DATE'])
+            departure_time = scheduled_datetime + int(item_entry['SEC_LATE'])
+            scheduled_departure_time = scheduled_datetime
+            custom_status = item_entry['STATUS']
+            route_icon = cls.__get_route_icon(headsign)
+
+            feed.add_trip_update(ArrivalRecord(entity_id=str(idx + 1),
+                                               departure_time=departure_time,
+                                               scheduled_departure_time=scheduled_departure_time,
+                                               arrival_time=departure_time,
+                                               scheduled_arrival_time=scheduled_departure_time,
+                                               route_id=route_id,
+                                               route_short_name=route_short_name,
+                                               route_long_name=route_long_name,
+                                               route_color=route_color,
+                                               route_text_color=route_text_color,
+                                               stop_id=stop_id,
+                                               stop_name=stop_name,
+                                               headsign=headsign,
+                                               track=track,
+                                               block_id=block_id,
+                                               agency_timezone=cls.TIMEZONE,
+                                               custom_status=custom_status,
+                                               route_icon=route_icon))
 
     @classmethod
     def __get_route_id(cls, data, origin_and_destination):
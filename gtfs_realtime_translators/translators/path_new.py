@@ -1,11 +1,17 @@
-import json
-import pendulum
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import FormatParser, JsonStream, decode_json
 
-from gtfs_realtime_translators.factories import FeedMessage, TripUpdate
+# markers for values not seen yet and values handled while streaming
+MISSING = object()
+STREAMED = object()
 
 
 class PathNewGtfsRealtimeTranslator:
     TIMEZONE = 'America/New_York'
+    TIME_FORMAT = FormatParser('HH:mm')
+    # scheduled times are given as HH:mm of the current day
+    CLOCK_DEPENDENT = True
+    JSON_DECODER = None
 
     GREY_TRAIN_SERVICE_NUMBER = 0
 
@@ -146,16 +152,39 @@ class PathNewGtfsRealtimeTranslator:
        Keys are based off the "serviceID" field while also using a second lookup to determine the stop_id based on the track for a particular station
     """
 
-    def __call__(self, data):
-        json_data = json.loads(data)
-        entities = self.__make_trip_updates(json_data)
-        return FeedMessage.create(entities=entities)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
+        feed = builder()
+        self.__make_trip_updates(feed, json_data)
+        return feed.build()
+
+    def translate_stream(self, source, builder=FeedMessageBuilder):
+        """
+        Translates a response read incrementally from `source`, a file-like
+        object or an iterable of byte chunks such as an HTTP response body,
+        to the same feed as `__call__`.
+
+        `stations[].tracks[].trains[]` is walked while it is read and every
+        train becomes an entity right away, so only one train is decoded at
+        a time. A station's `tracks` (a track's `trains`) are decoded as a
+        whole only when they precede its `abbrv` (`trackId`).
+        """
+        stream = JsonStream(source)
+        feed = builder()
+        has_stations = False
+        for key in stream.iter_object():
+            if key == 'stations':
+                has_stations = True
+                for _ in stream.iter_array():
+                    self.__stream_station(feed, stream)
+        stream.close()
+        if not has_stations:
+            raise KeyError('stations')
+        return feed.build()
 
     @classmethod
     def __to_unix_time(cls, time):
-        datetime = int(pendulum.from_format(
-            time, 'HH:mm').in_tz(cls.TIMEZONE).timestamp())
-        return datetime
+        return cls.TIME_FORMAT.timestamp(time)
 
     @classmethod
     def __route_lookup(cls, service_id, station_shortkey, track_id, destination):
@@ -186,8 +215,7 @@ class PathNewGtfsRealtimeTranslator:
         return service_id == cls.GREY_TRAIN_SERVICE_NUMBER
 
     @classmethod
-    def __make_trip_updates(cls, data):
-        trip_updates = []
+    def __make_trip_updates(cls, feed, data):
         stations = data['stations']
         for station in stations:
             station_shortkey = station['abbrv']
@@ -195,35 +223,75 @@ class PathNewGtfsRealtimeTranslator:
             if station_shortkey == 'systemwide':
                 continue
             for track in tracks:
-                track_id = track.get('trackId')
-                trains = track.get('trains', {})
-                for idx, train in enumerate(trains):
-                    if not train.get('trainId'):
-                        continue
-                    train_info = train.get('trainId').split('_')
-                    service_id = train.get('service')
-                    if cls.__is_grey_train(service_id):
-                        continue
-                    destination = train.get('destination')
-                    arrival_time = train.get('depArrTime')
-                    scheduled_arrival_time = cls.__to_unix_time(train_info[0])
-                    arrival_data = cls.__route_lookup(
-                        service_id, station_shortkey, track_id, destination)
-                    if cls.__should_skip_update(arrival_data):
-                        continue
-                    trip_update = TripUpdate.create(entity_id=train.get('trainId').strip(),
-                                                    departure_time=arrival_time,
-                                                    arrival_time=arrival_time,
-                                                    scheduled_arrival_time=scheduled_arrival_time,
-                                                    scheduled_departure_time=scheduled_arrival_time,
-                                                    track=track_id,
-                                                    route_id=arrival_data.get(
-                                                        'route_id'),
-                                                    stop_id=arrival_data.get(
-                                                        'stop_id'),
-                                                    headsign=arrival_data.get(
-                                                        'headsign'),
-                                                    stop_name=arrival_data.get('stop_name'))
-                    trip_updates.append(trip_update)
-
-        return trip_updates
+                cls.__make_track_updates(feed, station_shortkey, track.get('trackId'), track.get('trains', {}))
+
+    @classmethod
+    def __make_track_updates(cls, feed, station_shortkey, track_id, trains):
+        for train in trains:
+            cls.__make_train_update(feed, station_shortkey, track_id, train)
+
+    @classmethod
+    def __make_train_update(cls, feed, station_shortkey, track_id, train):
+        if not train.get('trainId'):
+            return
+        train_info = train.get('trainId').split('_')
+        service_id = train.get('service')
+        if cls.__is_grey_train(service_id):
+            return
+        destination = train.get('destination')
+        arrival_time = train.get('depArrTime')
+        scheduled_arrival_time = cls.__to_unix_time(train_info[0])
+        arrival_data = cls.__route_lookup(
+            service_id, station_shortkey, track_id, destination)
+        if cls.__should_skip_update(arrival_data):
+            return
+        feed.add_trip_update(ArrivalRecord(entity_id=train.get('trainId').strip(),
+                                           departure_time=arrival_time,
+                                           arrival_time=arrival_time,
+                                           scheduled_arrival_time=scheduled_arrival_time,
+                                           scheduled_departure_time=scheduled_arrival_time,
+                                           track=track_id,
+                                           route_id=arrival_data.get(
+                                               'route_id'),
+                                           stop_id=arrival_data.get(
+                                               'stop_id'),
+                                           headsign=arrival_data.get(
+                                               'headsign'),
+                                           stop_name=arrival_data.get('stop_name')))
+
+    @classmethod
+    def __stream_station(cls, feed, stream):
+        station_shortkey = MISSING
+        tracks = None
+        for key in stream.iter_object():
+            if key == 'abbrv':
+                station_shortkey = stream.read_value()
+            elif key == 'tracks':
+                if station_shortkey is MISSING:
+                    tracks = stream.read_value()
+                elif station_shortkey != 'systemwide':
+                    tracks = STREAMED
+                    for _ in stream.iter_array():
+                        cls.__stream_track(feed, station_shortkey, stream)
+        if station_shortkey is MISSING:
+            raise KeyError('abbrv')
+        if station_shortkey == 'systemwide' or tracks is STREAMED:
+            return
+        for track in tracks:
+            cls.__make_track_updates(feed, station_shortkey, track.get('trackId'), track.get('trains', {}))
+
+    @classmethod
+    def __stream_track(cls, feed, station_shortkey, stream):
+        track_id = MISSING
+        trains = {}
+        for key in stream.iter_object():
+            if key == 'trackId':
+                track_id = stream.read_value()
+            elif key == 'trains':
+                if track_id is MISSING:
+                    trains = stream.read_value()
+                else:
+                    trains = {}
+                    for _ in stream.iter_array():
+                        cls.__make_train_update(feed, station_shortkey, track_id, stream.read_value())
+        cls.__make_track_updates(feed, station_shortkey, None if track_id is MISSING else track_id, trains)
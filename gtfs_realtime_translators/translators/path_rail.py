@@ -1,10 +1,10 @@
-import json
 import math
 import warnings
 
 import pendulum
 
-from gtfs_realtime_translators.factories import FeedMessage, TripUpdate
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import decode_json
 
 
 class PathGtfsRealtimeTranslatorWarning(Warning):
@@ -13,6 +13,9 @@ class PathGtfsRealtimeTranslatorWarning(Warning):
 
 class PathGtfsRealtimeTranslator:
     TIMEZONE = 'America/New_York'
+    # arrival times are computed relative to the current time
+    CLOCK_DEPENDENT = True
+    JSON_DECODER = None
 
     ROUTE_ID_LOOKUP = {
         '#4D92FB': '859',
@@ -103,14 +106,14 @@ class PathGtfsRealtimeTranslator:
        current station for which the request has been made.
     """
 
-    def __call__(self, data):
-        json_data = json.loads(data)
-        entities = self.__make_trip_updates(json_data)
-        return FeedMessage.create(entities=entities)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
+        feed = builder()
+        self.__make_trip_updates(feed, json_data)
+        return feed.build()
 
     @classmethod
-    def __make_trip_updates(cls, data):
-        trip_updates = []
+    def __make_trip_updates(cls, feed, data):
         now = int(pendulum.now().timestamp())
 
         arrivals = data['results']
@@ -127,15 +130,12 @@ class PathGtfsRealtimeTranslator:
                     arrival_time = now + math.floor(update['secondsToArrival'] / 60) * 60
                     headsign = update['headSign']
 
-                    trip_update = TripUpdate.create(entity_id=str(idx + 1),
-                                                    departure_time=arrival_time,
-                                                    arrival_time=arrival_time,
-                                                    route_id=route_id,
-                                                    stop_id=stop_id,
-                                                    headsign=headsign)
-                    trip_updates.append(trip_update)
+                    feed.add_trip_update(ArrivalRecord(entity_id=str(idx + 1),
+                                                       departure_time=arrival_time,
+                                                       arrival_time=arrival_time,
+                                                       route_id=route_id,
+                                                       stop_id=stop_id,
+                                                       headsign=headsign))
                 except KeyError:
                     warnings.warn(f'Could not generate trip_update for update [{update}] in arrival [{arrival}]',
-                                  PathGtfsRealtimeTranslatorWarning)
-
-        return trip_updates
\ No newline at end of file
+                                  PathGtfsRealtimeTranslatorWarning)
\ No newline at end of file
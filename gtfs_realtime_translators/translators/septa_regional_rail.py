@@ -1,15 +1,17 @@
-import json
 import re
 import copy
 
 import pendulum
 
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import parse_iso8601, decode_json
 from gtfs_realtime_translators.validators import RequiredFieldValidator
 
 
 class SeptaRegionalRailTranslator:
     TIMEZONE = 'America/New_York'
+    # arrivals are filtered relative to the current time
+    CLOCK_DEPENDENT = True
     STATUS_PATTERN = re.compile(r'(?P<delay>\d*) min')
     ROUTE_ID_LOOKUP = {
         'Airport': 'AIR',
@@ -26,6 +28,7 @@ class SeptaRegionalRailTranslator:
         'Wilmington/Newark': 'WIL',
         'West Trenton': 'WTR',
     }
+    JSON_DECODER = None
 
     def __init__(self, **kwargs):
         self.stop_id = kwargs.get('stop_id')
@@ -33,8 +36,8 @@ class SeptaRegionalRailTranslator:
         filter_seconds = kwargs.get('filter_seconds', 10800) # default 10800s => 3hrs
         self.latest_valid_time = self.calculate_time_at(seconds=filter_seconds)
 
-    def __call__(self, data):
-        json_data = json.loads(data)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
         root_key = next(iter([*json_data]), None)
 
         if root_key is None:
@@ -48,8 +51,10 @@ class SeptaRegionalRailTranslator:
         transformed_arrivals = [ self.transform_arrival(arrival) for arrival in arrivals ]
         filtered_arrivals = [ arrival for arrival in transformed_arrivals if arrival['sched_time'] <= self.latest_valid_time ]
 
-        entities = [ self.__make_trip_update(idx, self.stop_id, arrival) for idx, arrival in enumerate(filtered_arrivals) ]
-        return FeedMessage.create(entities=entities)
+        feed = builder()
+        for idx, arrival in enumerate(filtered_arrivals):
+            self.__make_trip_update(feed, idx, self.stop_id, arrival)
+        return feed.build()
 
     @classmethod
     def get_arrivals_from_direction_list(cls, direction_string, arrivals_body):
@@ -72,8 +77,7 @@ class SeptaRegionalRailTranslator:
 
     @classmethod
     def to_unix_timestamp(cls, time):
-        time_obj = pendulum.parse(time, tz=cls.TIMEZONE)
-        return int(time_obj.timestamp())
+        return parse_iso8601(time, tz=cls.TIMEZONE)
 
     @classmethod
     def transform_arrival(cls, arrival):
@@ -93,21 +97,21 @@ class SeptaRegionalRailTranslator:
             return time
 
         delay_in_minutes = int(matches.group('delay'))
-        return int((pendulum.from_timestamp(time).add(minutes=delay_in_minutes)).timestamp())
+        return time + delay_in_minutes * 60
 
     @classmethod
-    def __make_trip_update(cls, _id, stop_id, arrival):
+    def __make_trip_update(cls, feed, _id, stop_id, arrival):
         entity_id = str(_id + 1)
         route_id = cls.ROUTE_ID_LOOKUP.get(arrival['line'], None)
         arrival_time = cls.calculate_realtime(arrival['sched_time'], arrival['status'])
         departure_time = cls.calculate_realtime(arrival['depart_time'], arrival['status'])
 
-        return TripUpdate.create(entity_id=entity_id,
-                                 arrival_time=arrival_time,
-                                 departure_time=departure_time,
-                                 stop_id=stop_id,
-                                 route_id=route_id,
-                                 scheduled_arrival_time=arrival['sched_time'],
-                                 scheduled_departure_time=arrival['depart_time'],
-                                 track=arrival['track'],
-                                 headsign=arrival['destination'])
+        return feed.add_trip_update(ArrivalRecord(entity_id=entity_id,
+                                                  arrival_time=arrival_time,
+                                                  departure_time=departure_time,
+                                                  stop_id=stop_id,
+                                                  route_id=route_id,
+                                                  scheduled_arrival_time=arrival['sched_time'],
+                                                  scheduled_departure_time=arrival['depart_time'],
+                                                  track=arrival['track'],
+                                                  headsign=arrival['destination']))
@@ -1,13 +1,17 @@
-import json
 import math
 
 import pendulum
 
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import decode_json
 from gtfs_realtime_translators.validators import RequiredFieldValidator
 
 
 class SwiftlyGtfsRealtimeTranslator:
+    # arrival times are computed relative to the current time
+    CLOCK_DEPENDENT = True
+    JSON_DECODER = None
+
     # stop_id is not required in constructor as it is being sent as a part of feed but
     # vta feeds are already configured with stop_id in all environment so remove it when
     # get a chance to clean up the feed
@@ -15,20 +19,18 @@ class SwiftlyGtfsRealtimeTranslator:
         RequiredFieldValidator.validate_field_value('stop_id', stop_id)
         self.stop_id = stop_id
 
-    def __call__(self, data):
-        json_data = json.loads(data)
-        entities = []
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
+        feed = builder()
         for data in json_data["data"]["predictionsData"]:
             stop_id = data.get("stopId", None)
             RequiredFieldValidator.validate_field_value('stop_id', stop_id)
-            trip_updates = self.__make_trip_updates(data, stop_id)
-            entities.extend(trip_updates)
+            self.__make_trip_updates(feed, data, stop_id)
 
-        return FeedMessage.create(entities=entities)
+        return feed.build()
 
     @classmethod
-    def __make_trip_updates(cls, data, stop_id):
-        trip_updates = []
+    def __make_trip_updates(cls, feed, data, stop_id):
         route_id = data.get("routeId")
 
         # Intersection Extensions
@@ -49,19 +51,15 @@ class SwiftlyGtfsRealtimeTranslator:
                     math.floor(arrival.get("sec") / 60) * 60
                 trip_id = arrival.get('tripId')
 
-                trip_update = TripUpdate.create(entity_id=entity_id,
-                                                arrival_time=arrival_or_departure_time,
-                                                departure_time=arrival_or_departure_time,
-                                                trip_id=trip_id,
-                                                route_id=route_id,
-                                                route_short_name=route_short_name,
-                                                route_long_name=route_long_name,
-                                                stop_id=stop_id,
-                                                stop_name=stop_name,
-                                                headsign=headsign,
-                                                direction_id=direction_id,
-                                                )
-
-                trip_updates.append(trip_update)
-
-        return trip_updates
+                feed.add_trip_update(ArrivalRecord(entity_id=entity_id,
+                                                   arrival_time=arrival_or_departure_time,
+                                                   departure_time=arrival_or_departure_time,
+                                                   trip_id=trip_id,
+                                                   route_id=route_id,
+                                                   route_short_name=route_short_name,
+                                                   route_long_name=route_long_name,
+                                                   stop_id=stop_id,
+                                                   stop_name=stop_name,
+                                                   headsign=headsign,
+                                                   direction_id=direction_id,
+                                     ))
@@ -1,22 +1,24 @@
-import json
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+from gtfs_realtime_translators.factories import ArrivalRecord, FeedMessageBuilder
+from gtfs_realtime_translators.parsers import decode_json
 from gtfs_realtime_translators.validators import RequiredFieldValidator
 
 
 class WcdotGtfsRealTimeTranslator:
+    JSON_DECODER = None
+
     def __init__(self, stop_id=None):
         RequiredFieldValidator.validate_field_value('stop_id', stop_id)
         self.stop_id = stop_id
         self.filtered_stops = None
 
-    def __call__(self,data):
-        json_data = json.loads(data)
+    def __call__(self, data, builder=FeedMessageBuilder):
+        json_data = decode_json(data, self.JSON_DECODER)
         entities = json_data["entity"]
-        trip_updates = self.generate_trip_updates(entities)
-        return FeedMessage.create(entities=trip_updates)
+        feed = builder(group_by_trip=True)
+        self.generate_trip_updates(feed, entities)
+        return feed.build()
 
-    def generate_trip_updates(self, entities):
-        trip_updates = []
+    def generate_trip_updates(self, feed, entities):
         for idx, entity in enumerate(entities):
             entity_id = str(idx+1)
             trip_update = entity['trip_update']
@@ -37,13 +39,11 @@ class WcdotGtfsRealTimeTranslator:
                         arrival_delay = arrival.get('delay',None)
                     if departure:
                         departure_delay = departure.get('delay',None)
-                    trip_update = TripUpdate.create(
+                    feed.add_trip_update(ArrivalRecord(
                         entity_id=entity_id,
                         arrival_delay=arrival_delay,
                         departure_delay=departure_delay,
                         trip_id=trip_id,
                         route_id=route_id,
                         stop_id=stop_id
-                    )
-                    trip_updates.append(trip_update)
-        return trip_updates
+                    ))
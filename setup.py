@@ -14,7 +14,6 @@ with io.open(f'{PACKAGE_ROOT}/__version__.py', 'r', encoding='utf-8') as f:
 requirements = [
     'gtfs-realtime-bindings==1.0.0',
     'pendulum==3.0.0',
-    'xmltodict==0.13.0',
 ]
 
 setup(
@@ -32,7 +31,16 @@ setup(
         f'{PACKAGE_ROOT}.registry',
         f'{PACKAGE_ROOT}.bindings',
         f'{PACKAGE_ROOT}.validators',
+        f'{PACKAGE_ROOT}.parsers',
+        f'{PACKAGE_ROOT}.server',
+        f'{PACKAGE_ROOT}.cli',
     ],
     license=about['__license__'],
     install_requires=requirements,
+    entry_points={
+        'console_scripts': [
+            'gtfs-realtime-translators = gtfs_realtime_translators.cli:main',
+            'gtfs-realtime-translators-server = gtfs_realtime_translators.server:main',
+        ],
+    },
 )
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gtfs_realtime_translators.registry import AsyncTranslator, TranslatorRegistry
+from translator_cases import read_fixture
+
+
+class SlowTranslator:
+    lock = threading.Lock()
+    calls = 0
+    running = 0
+    max_running = 0
+
+    def __call__(self, data):
+        with SlowTranslator.lock:
+            SlowTranslator.calls += 1
+            SlowTranslator.running += 1
+            SlowTranslator.max_running = max(SlowTranslator.max_running, SlowTranslator.running)
+        time.sleep(0.05)
+        with SlowTranslator.lock:
+            SlowTranslator.running -= 1
+        if data == 'fail':
+            raise ValueError('bad payload')
+        return data.encode('utf-8')
+
+
+@pytest.fixture
+def slow_translator():
+    TranslatorRegistry.TRANSLATORS['slow'] = SlowTranslator
+    SlowTranslator.calls = SlowTranslator.running = SlowTranslator.max_running = 0
+    yield
+    del TranslatorRegistry.TRANSLATORS['slow']
+    TranslatorRegistry.invalidate('slow')
+
+
+def test_async_translate_matches_sync_translation():
+    payload = read_fixture('cta_bus.json')
+
+    async def translate():
+        async with AsyncTranslator(max_workers=2) as translator:
+            return await translator.translate('cta-bus', payload)
+
+    expected = TranslatorRegistry.get('cta-bus')()(payload).SerializeToString()
+    assert asyncio.run(translate()) == expected
+
+
+def test_async_translate_coalesces_identical_requests(slow_translator):
+    async def translate():
+        async with AsyncTranslator(max_workers=4) as translator:
+            results = await asyncio.gather(*[translator.translate('slow', 'payload') for _ in range(5)])
+            assert translator.in_flight() == 0
+            return results
+
+    assert asyncio.run(translate()) == [b'payload'] * 5
+    assert SlowTranslator.calls == 1
+
+
+def test_async_translate_limits_concurrency_per_key(slow_translator):
+    async def translate():
+        async with AsyncTranslator(max_workers=8, max_concurrency_per_key=2) as translator:
+            return await asyncio.gather(*[translator.translate('slow', str(i)) for i in range(6)])
+
+    assert asyncio.run(translate()) == [str(i).encode('utf-8') for i in range(6)]
+    assert SlowTranslator.calls == 6
+    assert SlowTranslator.max_running == 2
+
+
+def test_async_translate_propagates_errors_to_coalesced_callers(slow_translator):
+    async def translate():
+        async with AsyncTranslator() as translator:
+            with pytest.raises(ValueError, match='No translator registered'):
+                await translator.translate('unknown-translator', 'payload')
+            return await asyncio.gather(*[translator.translate('slow', 'fail') for _ in range(3)],
+                                        return_exceptions=True)
+
+    with pytest.warns(Warning):
+        results = asyncio.run(translate())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert SlowTranslator.calls == 1
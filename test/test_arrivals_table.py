@@ -0,0 +1,110 @@
+import pendulum
+import pytest
+
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.factories import ArrivalsTable
+from gtfs_realtime_translators.translators import MtaSubwayGtfsRealtimeTranslator
+from translator_cases import TRANSLATOR_FIXTURES, read_fixture
+
+
+@pytest.mark.parametrize('make_translator,fixture', TRANSLATOR_FIXTURES)
+def test_arrivals_table_matches_message_builder(make_translator, fixture):
+    raw = read_fixture(fixture)
+    translator = make_translator()
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 35), freeze=True):
+        message = translator(raw)
+        table = translator(raw, builder=ArrivalsTable)
+
+    assert isinstance(table, ArrivalsTable)
+    assert table.to_feed_message() == message
+
+    parsed = gtfs_realtime.FeedMessage()
+    parsed.ParseFromString(table.to_bytes())
+    assert parsed == message
+
+
+def test_arrivals_table_columns():
+    table = ArrivalsTable()
+    table.add_trip_update(entity_id='1', trip_id='A', stop_id='10', arrival_time=300)
+    table.add_trip_update(entity_id='2', trip_id='B', stop_id='11', arrival_time=100)
+    table.add_trip_update(entity_id='3', trip_id='A', stop_id='12')
+
+    assert len(table) == 3
+    assert table.column('arrival_time') == [300, 100, None]
+    assert table.column('trip_id') == ['A', 'B', 'A']
+    assert table.columns['trip_id'].pool == ['A', 'B']
+
+
+def test_arrivals_table_filter_and_sort():
+    translator = MtaSubwayGtfsRealtimeTranslator()
+    table = translator(read_fixture('mta_subway.json'), builder=ArrivalsTable)
+    stop_id = table.column('stop_id')[0]
+
+    filtered = table.where('stop_id', lambda value: value == stop_id).sort_by('arrival_time', 'trip_id')
+
+    arrival_times = filtered.column('arrival_time')
+    assert len(filtered) == table.column('stop_id').count(stop_id)
+    assert arrival_times == sorted(arrival_times)
+
+    message = filtered.to_feed_message()
+    assert [entity.trip_update.stop_time_update[0].arrival.time for entity in message.entity] == arrival_times
+
+
+def test_arrivals_table_keeps_delay_mode():
+    table = ArrivalsTable()
+    table.add_trip_update(entity_id='1', trip_id='A', stop_id='10', arrival_delay=-60, departure_delay=None)
+
+    stop_time_update = table.to_feed_message().entity[0].trip_update.stop_time_update[0]
+    assert stop_time_update.arrival.delay == -60
+    assert stop_time_update.departure.delay == -60
+
+
+def test_arrivals_table_ignores_unknown_fields():
+    table = ArrivalsTable()
+    table.add_trip_update(entity_id='1', stop_id='10', platform='2')
+    assert list(table.column('stop_id')) == ['10']
+
+
+def test_arrivals_table_derived_tables_do_not_share_appends():
+    table = ArrivalsTable()
+    table.add_trip_update(entity_id='1', trip_id='A', stop_id='10', arrival_time=300)
+    table.add_trip_update(entity_id='2', trip_id='B', stop_id='11', arrival_time=100)
+
+    derived = table.where('trip_id', lambda trip_id: trip_id == 'A').sort_by('arrival_time')
+    derived.add_trip_update(entity_id='3', trip_id='C', stop_id='12')
+
+    assert derived.column('trip_id') == ['A', 'C']
+    assert table.column('trip_id') == ['A', 'B']
+    assert table.columns['trip_id'].pool == ['A', 'B']
+    assert 'C' not in table.columns['trip_id'].index
+
+
+def test_arrivals_table_from_columns_matches_rows():
+    rows = [
+        dict(entity_id='1', trip_id='A', stop_id='10', arrival_time=300, track='2'),
+        dict(entity_id='2', trip_id='B', stop_id='11', arrival_delay=-60),
+        dict(entity_id='3', trip_id='A', stop_id='12'),
+    ]
+    table = ArrivalsTable(group_by_trip=True)
+    for row in rows:
+        table.add_trip_update(**row)
+
+    fields = ['entity_id', 'trip_id', 'stop_id', 'arrival_time', 'arrival_delay', 'track']
+    columns = {field: [row.get(field) for row in rows] for field in fields}
+    bulk = ArrivalsTable.from_columns(columns, group_by_trip=True)
+
+    assert len(bulk) == 3
+    assert bulk.column('trip_id') == ['A', 'B', 'A']
+    assert bulk.column('run_number') == [None, None, None]
+    assert bulk.to_feed_message() == table.to_feed_message()
+
+
+def test_arrivals_table_from_columns_rejects_invalid_columns():
+    with pytest.raises(ValueError):
+        ArrivalsTable.from_columns({'entity_id': ['1', '2'], 'stop_id': ['10']})
+    with pytest.raises(ValueError):
+        ArrivalsTable.from_columns({'entity_id': ['1'], 'stop_id': ['10'], 'platform': ['2']})
+    with pytest.raises(ValueError):
+        ArrivalsTable.from_columns({'entity_id': ['1']})
+
@@ -0,0 +1,74 @@
+import io
+import json
+import shutil
+import sys
+
+from google.protobuf.json_format import MessageToJson
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.cli import main, read_frames, write_frame
+from gtfs_realtime_translators.registry import TranslatorRegistry
+from translator_cases import read_fixture
+
+
+def translate(key, fixture, **config):
+    return TranslatorRegistry.get(key)(**config)(read_fixture(fixture))
+
+
+def parse(data):
+    message = gtfs_realtime.FeedMessage()
+    message.ParseFromString(data)
+    return message
+
+
+def test_cli_translates_single_file(tmp_path, capsys):
+    output = tmp_path / 'cta_bus.pb'
+    assert main(['cta-bus', 'test/fixtures/cta_bus.json', '-o', str(output)]) == 0
+
+    assert parse(output.read_bytes()) == translate('cta-bus', 'cta_bus.json')
+    assert 'payloads:   1 translated, 0 failed' in capsys.readouterr().err
+
+
+def test_cli_translates_directory_to_json(tmp_path, capsys):
+    captures = tmp_path / 'captures'
+    captures.mkdir()
+    shutil.copy('test/fixtures/njt_bus.xml', captures / '0001.xml')
+    shutil.copy('test/fixtures/njt_bus.xml', captures / '0002.xml')
+    (captures / '0003.xml').write_text('<broken')
+    output = tmp_path / 'feeds'
+
+    status = main(['njt-bus', str(captures), '-o', str(output), '--format', 'json',
+                   '--option', 'stop_list=2916, 39787'])
+
+    expected = json.loads(MessageToJson(translate('njt-bus', 'njt_bus.xml', stop_list='2916, 39787')))
+    assert status == 1
+    assert sorted(path.name for path in output.iterdir()) == ['0001.json', '0002.json']
+    assert json.loads((output / '0001.json').read_bytes()) == expected
+    err = capsys.readouterr().err
+    assert '0003.xml: ParseError' in err
+    assert 'payloads:   2 translated, 1 failed' in err
+
+
+def test_cli_streams_length_prefixed_payloads(tmp_path, monkeypatch, capsys):
+    frames = io.BytesIO()
+    for fixture in ['cta_bus.json', 'cta_bus.json']:
+        write_frame(frames, read_fixture(fixture).encode('utf-8'))
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(frames.getvalue())))
+    output = tmp_path / 'feeds.bin'
+
+    assert main(['cta-bus', '--stdin', '-o', str(output), '--quiet']) == 0
+
+    with open(output, 'rb') as f:
+        feeds = [parse(data) for data in read_frames(f)]
+    assert feeds == [translate('cta-bus', 'cta_bus.json')] * 2
+    assert capsys.readouterr().err == ''
+
+
+def test_cli_reads_config_file_for_key(tmp_path):
+    config = tmp_path / 'config.json'
+    config.write_text(json.dumps({'wcdot-bus': {'stop_id': '5142'}}))
+    output = tmp_path / 'wcdot.pb'
+
+    assert main(['wcdot-bus', 'test/fixtures/wcdot_bus.json', '--config', str(config),
+                 '-o', str(output), '--quiet']) == 0
+    assert parse(output.read_bytes()) == translate('wcdot-bus', 'wcdot_bus.json', stop_id='5142')
@@ -1,9 +1,19 @@
+import glob
+import json
+import os
+import pickle
+import zipfile
+
 import pytest
 import pendulum
 
-from gtfs_realtime_translators.translators.de_vvs import DeVVSAlertGtfsRealtimeTranslator, DeVVSGtfsIdMapper
+from gtfs_realtime_translators.translators.de_vvs import DeVVSAlertGtfsRealtimeTranslator, DeVVSGtfsIdMapper, \
+    AlertRules, load_alert_rules
 from gtfs_realtime_translators.bindings import intersection_pb2 as intersection_gtfs_realtime
-from gtfs_realtime_translators.factories import FeedMessage
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.factories import Alert, FeedMessage
+from gtfs_realtime_translators.parsers.html_text import HtmlTextParser, convert_html_to_text, html_to_text_reference
 
 
 @pytest.fixture
@@ -36,3 +46,194 @@ def test_de_vvs_stop_id_mapping_returns_implicit_parent_stop_id():
     #"de:08111:109:0:4","Zuffenhausen Friedhof","48.8358995841783","9.18146663215316","",""
     # map_stop_id should nevertheless return these for their implicitly known parent stop id
     assert {'de:08111:109:0:3', 'de:08111:109:0:4'} == mapper.map_stop_id('de:08111:109')
+
+def test_de_vvs_alerts_rewritten_in_place(de_vvs_alerts):
+    upstream = gtfs_realtime.FeedMessage()
+    upstream.ParseFromString(de_vvs_alerts)
+
+    translator = DeVVSAlertGtfsRealtimeTranslator('test/fixtures/de_vvs.gtfs.zip')
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 00, 14, 35)):
+        message = translator(de_vvs_alerts)
+
+    assert message.header.gtfs_realtime_version == FeedMessage.VERSION
+    assert message.header.timestamp == upstream.header.timestamp
+    assert [entity.id for entity in message.entity] == [entity.id for entity in upstream.entity]
+    assert all(entity.alert.severity_level in (3, 4) for entity in message.entity)
+
+def test_alert_rewrite_replaces_informed_entities():
+    entity = gtfs_realtime.FeedEntity(id='1')
+    entity.alert.informed_entity.add(stop_id='de:08111:109')
+
+    rewritten = Alert.rewrite(entity, informed_entity=[{'stop_id': 'de:08111:109:0:3'},
+                                                       {'stop_id': 'de:08111:109:0:4'}])
+
+    assert rewritten is entity
+    assert [selector.stop_id for selector in entity.alert.informed_entity] == ['de:08111:109:0:3',
+                                                                               'de:08111:109:0:4']
+
+def test_de_vvs_description_text_matches_beautifulsoup():
+    descriptions = set()
+    for path in sorted(glob.glob('test/fixtures/de_vvs_gtfsr-alerts_*.pb')):
+        with open(path, 'rb') as f:
+            feed = gtfs_realtime.FeedMessage()
+            feed.ParseFromString(f.read())
+        descriptions.update(translation.text for entity in feed.entity
+                            for translation in entity.alert.description_text.translation)
+
+    assert descriptions
+    for description in descriptions:
+        # all fixture descriptions are converted without BeautifulSoup
+        parser = HtmlTextParser()
+        parser.feed(description.replace('\r\n', '\n').lstrip())
+        parser.close()
+
+        assert convert_html_to_text(description) == html_to_text_reference(description)
+
+def test_de_vvs_description_text_is_memoized(de_vvs_alerts):
+    translator = DeVVSAlertGtfsRealtimeTranslator('test/fixtures/de_vvs.gtfs.zip')
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 00, 14, 35)):
+        first = translator(de_vvs_alerts)
+        cached = len(translator.html_to_text)
+        second = translator(de_vvs_alerts)
+
+    assert 0 < cached <= len(first.entity)
+    assert len(translator.html_to_text) == cached
+    assert first == second
+
+def test_alert_rules_return_all_hits_in_rule_order():
+    rules = AlertRules(load_alert_rules())
+
+    hits = rules.match('Umleitung wegen Bauarbeiten, Haltestelle verlegt', 'Ersatzhalt nach dem Konzert')
+
+    Effect = gtfs_realtime.Alert.Effect
+    Cause = gtfs_realtime.Alert.Cause
+    assert hits.effect == (Effect.STOP_MOVED, Effect.MODIFIED_SERVICE)
+    assert hits.cause == (Cause.CONSTRUCTION, Cause.OTHER_CAUSE)
+    assert hits.severity == ()
+
+def test_alert_rules_keyword_lists_match_if_all_keywords_are_contained():
+    rules = AlertRules(load_alert_rules())
+
+    assert rules.match('Aufzug außer Betrieb', '').effect == (gtfs_realtime.Alert.Effect.ACCESSIBILITY_ISSUE,)
+    assert rules.match('Aufzug', 'außer Betrieb').effect == ()
+
+def test_alert_rules_severity_keywords_are_case_sensitive():
+    rules = AlertRules(load_alert_rules({'severity': [{'value': 'SEVERE', 'description': ['Sperrung']}]}))
+
+    assert rules.match('', 'Sperrung der Strecke').severity == (gtfs_realtime.Alert.SeverityLevel.SEVERE,)
+    assert rules.match('Sperrung', 'SPERRUNG der Strecke').severity == ()
+
+@pytest.mark.parametrize('rule', [
+    {'value': 'NO_SUCH_EFFECT', 'header': ['streik']},
+    {'value': 'NO_SERVICE', 'title': ['streik']},
+    {'value': 'NO_SERVICE', 'header': ['']},
+    {'value': 'NO_SERVICE', 'header': 'streik'},
+])
+def test_alert_rules_reject_invalid_rules(rule):
+    with pytest.raises(ValueError):
+        AlertRules(load_alert_rules({'effect': [rule]}))
+
+def test_de_vvs_alert_rules_from_json_file(de_vvs_alerts, tmp_path):
+    rules = load_alert_rules()
+    rules['cause'].insert(0, {'value': 'STRIKE', 'text': ['fahrten']})
+    rules_file = tmp_path / 'rules.json'
+    rules_file.write_text(json.dumps({'cause': rules['cause']}), encoding='utf-8')
+
+    translator = DeVVSAlertGtfsRealtimeTranslator('test/fixtures/de_vvs.gtfs.zip', rules=str(rules_file))
+    default_translator = DeVVSAlertGtfsRealtimeTranslator('test/fixtures/de_vvs.gtfs.zip')
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 00, 14, 35)):
+        message = translator(de_vvs_alerts)
+        default_message = default_translator(de_vvs_alerts)
+
+    causes = [entity.alert.cause for entity in message.entity]
+    assert gtfs_realtime.Alert.Cause.STRIKE in causes
+    assert [entity.alert.effect for entity in message.entity] == \
+        [entity.alert.effect for entity in default_message.entity]
+
+def write_gtfs_zip(path, stops):
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('stops.txt', stops)
+        zf.writestr('routes.txt', '﻿route_id,agency_id\r\n"de:vvs:31263_:","VVS"\r\n"de:vvs:34048_:","VVS"\r\n')
+
+def test_de_vvs_id_mapper_scans_columns_like_dict_reader(tmp_path):
+    gtfsfile = tmp_path / 'gtfs.zip'
+    write_gtfs_zip(gtfsfile, '﻿stop_name,parent_station,stop_id,location_type\r\n'
+                             '"Stammheim","","de:08111:100:1:1",""\r\n'
+                             '"Stammheim, Bahnhof","de:08111:100","de:08111:100:2:3","0"\r\n'
+                             '"Stammheim","","de:08111:100","1"\r\n'
+                             '\r\n'
+                             '"Zuffenhausen","de:08111:109"\r\n'
+                             '"Zuffenhausen","","de:08111:109:0:4"\r\n')
+
+    mapper = DeVVSGtfsIdMapper(str(gtfsfile))
+
+    # stations are skipped, the parent of stops without one is implied by their stop_id,
+    # and missing trailing values are None
+    assert mapper.parent_stations_stops == {
+        'de:08111:100': {'de:08111:100:1:1', 'de:08111:100:2:3'},
+        'de:08111:109': {None, 'de:08111:109:0:4'},
+    }
+    assert mapper.route_ids == {'de:vvs:31263_:', 'de:vvs:34048_:'}
+
+def test_de_vvs_id_mapper_index_cache(tmp_path, monkeypatch):
+    gtfsfile = str(tmp_path / 'gtfs.zip')
+    write_gtfs_zip(gtfsfile, 'stop_id,location_type\nde:08111:109:0:3,\n')
+    cache_dir = tmp_path / 'cache'
+
+    mapper = DeVVSGtfsIdMapper(gtfsfile, cache_dir=str(cache_dir))
+    assert len(os.listdir(cache_dir)) == 1
+
+    def scan(self, gtfsfile):
+        raise AssertionError('scanned the GTFS feed')
+
+    with monkeypatch.context() as m:
+        m.setattr(DeVVSGtfsIdMapper, '_load_index', scan)
+        cached = DeVVSGtfsIdMapper(gtfsfile, cache_dir=str(cache_dir))
+        # the same content with a new mtime is recognized by its digest
+        os.utime(gtfsfile, ns=(0, 0))
+        touched = DeVVSGtfsIdMapper(gtfsfile, cache_dir=str(cache_dir))
+
+    assert cached.parent_stations_stops == touched.parent_stations_stops == mapper.parent_stations_stops
+    assert cached.route_ids == touched.route_ids == mapper.route_ids
+
+    write_gtfs_zip(gtfsfile, 'stop_id,location_type\nde:08111:109:0:4,\nde:08111:109:0:5,\n')
+    changed = DeVVSGtfsIdMapper(gtfsfile, cache_dir=str(cache_dir))
+    assert changed.parent_stations_stops == {'de:08111:109': {'de:08111:109:0:4', 'de:08111:109:0:5'}}
+
+def test_de_vvs_id_mapper_ignores_invalid_index_cache(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    mapper = DeVVSGtfsIdMapper('test/fixtures/de_vvs.gtfs.zip', cache_dir=str(cache_dir))
+    cache_file, = cache_dir.iterdir()
+    cache_file.write_bytes(cache_file.read_bytes()[:100])
+
+    rebuilt = DeVVSGtfsIdMapper('test/fixtures/de_vvs.gtfs.zip', cache_dir=str(cache_dir))
+    cached = DeVVSGtfsIdMapper('test/fixtures/de_vvs.gtfs.zip', cache_dir=str(cache_dir))
+
+    assert rebuilt.parent_stations_stops == cached.parent_stations_stops == mapper.parent_stations_stops
+    assert rebuilt.route_ids == cached.route_ids == mapper.route_ids
+
+def test_de_vvs_id_mapper_index_cache_is_data_only(tmp_path):
+    gtfsfile = str(tmp_path / 'gtfs.zip')
+    write_gtfs_zip(gtfsfile, 'stop_id,location_type\n:,\n,0\nde:08111:109:0:3,\n')
+    cache_dir = tmp_path / 'cache'
+    mapper = DeVVSGtfsIdMapper(gtfsfile, cache_dir=str(cache_dir))
+    cache_file, = cache_dir.iterdir()
+    assert json.loads(cache_file.read_bytes().splitlines()[0])[0] == DeVVSGtfsIdMapper.INDEX_VERSION
+
+    # null parent stations and empty stop ids survive the round trip
+    cached = DeVVSGtfsIdMapper(gtfsfile, cache_dir=str(cache_dir))
+    assert cached.parent_stations_stops == mapper.parent_stations_stops
+    assert None in cached.parent_stations_stops
+
+    # a pickled cache is rejected, not unpickled
+    sentinel = tmp_path / 'sentinel'
+    sentinel.touch()
+
+    class Payload:
+        def __reduce__(self):
+            return os.remove, (str(sentinel),)
+
+    cache_file.write_bytes(pickle.dumps(Payload()))
+    rebuilt = DeVVSGtfsIdMapper(gtfsfile, cache_dir=str(cache_dir))
+    assert sentinel.exists()
+    assert rebuilt.parent_stations_stops == mapper.parent_stations_stops
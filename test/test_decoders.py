@@ -0,0 +1,59 @@
+import json
+
+import pendulum
+import pytest
+
+from gtfs_realtime_translators.parsers import available_decoders, decode_json, get_default_decoder, \
+    set_default_decoder
+from translator_cases import TRANSLATOR_FIXTURES, read_fixture
+
+JSON_FIXTURES = [(make_translator, fixture) for make_translator, fixture in TRANSLATOR_FIXTURES
+                 if fixture.endswith('.json')]
+
+
+@pytest.mark.parametrize('decoder', available_decoders())
+@pytest.mark.parametrize('make_translator,fixture', JSON_FIXTURES)
+def test_decoders_produce_the_same_feed(make_translator, fixture, decoder):
+    raw = read_fixture(fixture)
+    reference = make_translator()
+    reference.JSON_DECODER = 'json'
+    translator = make_translator()
+    translator.JSON_DECODER = decoder
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 35), freeze=True):
+        assert translator(raw) == reference(raw)
+        assert translator(raw.encode('utf-8')) == reference(raw)
+
+
+@pytest.mark.parametrize('decoder', available_decoders())
+@pytest.mark.parametrize('data', [
+    '{"a": 1, "a": 2}',
+    '[NaN, Infinity, -Infinity]',
+    '[1e400, -0, 0.1234567890123456789]',
+    '"\\ud800"',
+    '{"stop": "Stra\\u00dfe", "name": "Straße"}',
+    '﻿{}'.encode('utf-8'),
+    '{"a": [1, 2.5, true, null]}'.encode('utf-16'),
+])
+def test_decoders_match_the_standard_library(decoder, data):
+    expected = json.loads(data)
+    actual = decode_json(data, decoder)
+    assert json.dumps(actual) == json.dumps(expected)
+
+
+@pytest.mark.parametrize('decoder', available_decoders())
+def test_invalid_json_raises_like_the_standard_library(decoder):
+    with pytest.raises(json.JSONDecodeError):
+        decode_json('{"a": ', decoder)
+
+
+def test_default_decoder_is_selectable():
+    default = get_default_decoder()
+    assert default == available_decoders()[0]
+    try:
+        set_default_decoder('json')
+        assert get_default_decoder() == 'json'
+        with pytest.raises(ValueError):
+            set_default_decoder('no-such-decoder')
+        assert get_default_decoder() == 'json'
+    finally:
+        set_default_decoder(default)
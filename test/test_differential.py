@@ -0,0 +1,82 @@
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.factories import DifferentialFeedMessage, FeedMessageBuilder
+from gtfs_realtime_translators.translators import CtaBusGtfsRealtimeTranslator
+
+
+def make_feed(*arrivals, group_by_trip=False):
+    builder = FeedMessageBuilder(group_by_trip=group_by_trip)
+    for idx, (trip_id, stop_id, arrival_time) in enumerate(arrivals):
+        builder.add_trip_update(entity_id=str(idx + 1),
+                                trip_id=trip_id,
+                                route_id='22',
+                                stop_id=stop_id,
+                                arrival_time=arrival_time)
+    return builder.build()
+
+
+def test_first_differential_feed_contains_all_entities():
+    differential = DifferentialFeedMessage()
+    message = differential.create('cta-bus', make_feed(('A', '1', 100), ('B', '1', 200)))
+
+    assert message.header.incrementality == gtfs_realtime.FeedHeader.DIFFERENTIAL
+    assert message.header.timestamp > 0
+    assert [entity.id for entity in message.entity] == ['A/22/1', 'B/22/1']
+
+
+def test_differential_feed_contains_only_changes():
+    differential = DifferentialFeedMessage()
+    differential.create('cta-bus', make_feed(('A', '1', 100), ('B', '1', 200), ('C', '1', 300)))
+
+    # upstream order shifted, B changed, C disappeared and D was added
+    message = differential.create('cta-bus', make_feed(('D', '1', 400), ('B', '1', 260), ('A', '1', 100)))
+
+    entities = {entity.id: entity for entity in message.entity}
+    assert set(entities) == {'B/22/1', 'C/22/1', 'D/22/1'}
+    assert entities['B/22/1'].trip_update.stop_time_update[0].arrival.time == 260
+    assert entities['C/22/1'].is_deleted
+    assert not entities['D/22/1'].is_deleted
+
+
+def test_differential_feed_state_is_kept_per_key():
+    differential = DifferentialFeedMessage()
+    differential.create('cta-bus', make_feed(('A', '1', 100)))
+
+    assert len(differential.create('cta-bus', make_feed(('A', '1', 100))).entity) == 0
+    assert len(differential.create('cta-subway', make_feed(('A', '1', 100))).entity) == 1
+
+
+def test_differential_feed_keys_entities_without_trip_id_uniquely():
+    differential = DifferentialFeedMessage()
+    message = differential.create('path-old', make_feed(('', '781715', 100), ('', '781715', 200)))
+
+    assert [entity.id for entity in message.entity] == ['/22/781715', '/22/781715#2']
+
+
+def test_differential_feed_updates_grouped_trip_that_drops_a_stop():
+    differential = DifferentialFeedMessage(group_by_trip=True)
+    first = differential.create('mbta', make_feed(('A', '1', 100), ('A', '2', 200), ('B', '2', 300),
+                                                  group_by_trip=True))
+    assert [entity.id for entity in first.entity] == ['A/22', 'B/22']
+
+    # A passed stop 1
+    message = differential.create('mbta', make_feed(('A', '2', 200), ('B', '2', 300), group_by_trip=True))
+
+    entity, = message.entity
+    assert entity.id == 'A/22'
+    assert not entity.is_deleted
+    assert [stop_time_update.stop_id for stop_time_update in entity.trip_update.stop_time_update] == ['2']
+
+
+def test_differential_feed_from_translator():
+    with open('test/fixtures/cta_bus.json') as f:
+        raw = f.read()
+
+    translator = CtaBusGtfsRealtimeTranslator()
+    differential = DifferentialFeedMessage()
+
+    first = differential.create('cta-bus', translator(raw))
+    second = differential.create('cta-bus', translator(raw))
+
+    assert len(first.entity) == len(translator(raw).entity)
+    assert len(second.entity) == 0
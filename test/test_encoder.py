@@ -0,0 +1,39 @@
+import pendulum
+import pytest
+
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.factories import FeedMessageBuilder, FeedBytesBuilder
+from translator_cases import TRANSLATOR_FIXTURES, read_fixture
+
+
+@pytest.mark.parametrize('make_translator,fixture', TRANSLATOR_FIXTURES)
+def test_bytes_builder_matches_message_builder(make_translator, fixture):
+    raw = read_fixture(fixture)
+    translator = make_translator()
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 35), freeze=True):
+        message = translator(raw)
+        feed_bytes = translator(raw, builder=FeedBytesBuilder)
+
+    parsed = gtfs_realtime.FeedMessage()
+    parsed.ParseFromString(feed_bytes)
+    assert parsed == message
+
+
+def test_bytes_builder_encodes_negative_delays_and_groups_trips():
+    records = [
+        dict(entity_id='1', trip_id='A', stop_id='10', arrival_delay=-60, departure_delay=None, run_number=7),
+        dict(entity_id='2', trip_id='A', stop_id='11', arrival_delay=30, departure_delay=45),
+        dict(entity_id='3', stop_id='12', arrival_time=1700000000, direction_id=0, scheduled_interval=600),
+    ]
+    message_builder = FeedMessageBuilder(group_by_trip=True)
+    bytes_builder = FeedBytesBuilder(group_by_trip=True)
+    for record in records:
+        message_builder.add_trip_update(**record)
+        bytes_builder.add_trip_update(**record)
+
+    message = message_builder.build()
+    parsed = gtfs_realtime.FeedMessage()
+    parsed.ParseFromString(bytes_builder.build())
+    assert len(message.entity) == 2
+    assert parsed == message
@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.factories import FeedBytesBuilder
+from gtfs_realtime_translators.registry import BatchTranslator, TranslatorRegistry
+from translator_cases import read_fixture
+
+
+@pytest.fixture(scope='module')
+def batch():
+    with BatchTranslator(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as batch:
+        yield batch
+
+
+def translate_in_process(key, config, payload):
+    return TranslatorRegistry.get(key)(**config)(payload)
+
+
+def test_batch_returns_serialized_feeds_in_submission_order(batch):
+    jobs = [
+        ('cta-bus', {}, read_fixture('cta_bus.json')),
+        ('njt-bus', {'stop_list': '2916, 39787'}, read_fixture('njt_bus.xml')),
+        ('mbta', {}, read_fixture('mbta_subway.json')),
+        ('cta-subway', {}, read_fixture('cta_subway.json')),
+    ]
+    results = batch.translate(jobs)
+
+    assert [result.key for result in results] == ['cta-bus', 'njt-bus', 'mbta', 'cta-subway']
+    for job, result in zip(jobs, results):
+        assert result.ok
+        message = gtfs_realtime.FeedMessage()
+        message.ParseFromString(result.data)
+        assert message == translate_in_process(*job)
+
+
+def test_batch_isolates_failing_jobs(batch):
+    results = batch.translate([
+        ('unknown-translator', {}, '{}'),
+        ('cta-bus', {}, 'not json'),
+        ('njt-bus', {'unexpected': True}, read_fixture('njt_bus.xml')),
+        ('cta-bus', {}, read_fixture('cta_bus.json')),
+    ])
+
+    assert [result.ok for result in results] == [False, False, False, True]
+    assert results[0].error == 'ValueError: No translator registered for key=unknown-translator'
+    assert results[1].error.startswith('JSONDecodeError')
+    assert results[2].error.startswith('TypeError')
+
+
+def test_batch_forwards_builder():
+    payload = read_fixture('cta_bus.json')
+    with BatchTranslator(max_workers=1, builder=FeedBytesBuilder) as batch:
+        result, = batch.translate([('cta-bus', {}, payload)])
+
+    message = gtfs_realtime.FeedMessage()
+    message.ParseFromString(result.data)
+    assert message == translate_in_process('cta-bus', {}, payload)
+
+
+class CrashingTranslator:
+    def __init__(self, **config):
+        os._exit(1)
+
+
+def test_batch_replaces_a_broken_pool(monkeypatch):
+    # forked workers see the translator registered here
+    monkeypatch.setitem(TranslatorRegistry.TRANSLATORS, 'crash', CrashingTranslator)
+    shut_down = []
+    shutdown = ProcessPoolExecutor.shutdown
+
+    def recording_shutdown(executor, *args, **kwargs):
+        shut_down.append(executor)
+        return shutdown(executor, *args, **kwargs)
+
+    monkeypatch.setattr(ProcessPoolExecutor, 'shutdown', recording_shutdown)
+    payload = read_fixture('cta_bus.json')
+    with BatchTranslator(max_workers=1, mp_context=multiprocessing.get_context('fork')) as batch:
+        assert batch.translate([('cta-bus', {}, payload)])[0].ok
+        broken_executor = batch._BatchTranslator__executor
+
+        result, = batch.translate([('crash', {}, payload)])
+        assert result.error.startswith('BrokenProcessPool')
+        assert shut_down == [broken_executor]
+
+        result, = batch.translate([('cta-bus', {}, payload)])
+        assert result.ok
+        assert batch._BatchTranslator__executor is not broken_executor
+
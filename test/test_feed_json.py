@@ -0,0 +1,50 @@
+import json
+
+import pendulum
+import pytest
+
+from google.protobuf.json_format import MessageToJson
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.factories import FeedMessageBuilder, FeedJsonBuilder
+from translator_cases import ALERT_TRANSLATOR_FIXTURES, TRANSLATOR_FIXTURES, read_fixture
+
+
+@pytest.mark.parametrize('make_translator,fixture', TRANSLATOR_FIXTURES + ALERT_TRANSLATOR_FIXTURES)
+def test_json_builder_matches_message_to_json(make_translator, fixture):
+    raw = read_fixture(fixture)
+    translator = make_translator()
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 35), freeze=True):
+        message = translator(raw)
+        feed_json = translator(raw, builder=FeedJsonBuilder)
+
+    assert json.loads(feed_json) == json.loads(MessageToJson(message))
+
+
+def test_json_builder_encodes_delays_groups_trips_and_uses_custom_dumps():
+    records = [
+        dict(entity_id='1', trip_id='A', stop_id='10', arrival_delay=-60, departure_delay=None, run_number=7),
+        dict(entity_id='2', trip_id='A', stop_id='11', arrival_delay=30, departure_delay=45),
+        dict(entity_id='3', stop_id='12', arrival_time=1700000000, direction_id=0, scheduled_interval=600,
+             scheduled_arrival_time=1699999940, track='2'),
+        dict(entity_id='4', stop_id='13'),
+    ]
+    message_builder = FeedMessageBuilder(group_by_trip=True)
+    json_builder = FeedJsonBuilder(group_by_trip=True, dumps=lambda feed: json.dumps(feed).encode('utf-8'))
+    for record in records:
+        message_builder.add_trip_update(**record)
+        json_builder.add_trip_update(**record)
+
+    feed = json.loads(json_builder.build())
+    assert len(feed['entity']) == 3
+    assert feed['entity'][1]['tripUpdate']['stopTimeUpdate'][0]['arrival'] == {'time': '1700000000'}
+    assert feed == json.loads(MessageToJson(message_builder.build()))
+
+
+def test_json_builder_without_entities():
+    builder = FeedJsonBuilder()
+    builder.header.timestamp = 1700000000
+    builder.header.incrementality = gtfs_realtime.FeedHeader.FULL_DATASET
+
+    feed = json.loads(builder.build())
+    assert feed == json.loads(MessageToJson(gtfs_realtime.FeedMessage(header=builder.header)))
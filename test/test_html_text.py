@@ -0,0 +1,64 @@
+import pytest
+
+from gtfs_realtime_translators.parsers import HtmlTextCache, convert_html_to_text, html_to_text_reference
+from gtfs_realtime_translators.parsers import html_text
+from gtfs_realtime_translators.parsers.html_text import HtmlTextParser, UnsupportedMarkup
+
+
+@pytest.mark.parametrize('html', [
+    '<div>ab&nbsp;Hauptbahnhof<br />09:05 Uhr</div>',
+    '<p><strong>Stra&szlig;e</strong> &bdquo;gesperrt&ldquo;</p>',
+    '<table>\n<tbody>\n<tr>\n<td>U11</td>\n<td>&nbsp;</td>\n</tr>\n</tbody>\n</table>\n',
+    '<ul>\r\n<li>a</li>\r\n<li>b</li>\r\n</ul>',
+    '  \n<div>a</div>\t\n ',
+    ' Text &amp; &Auml &bogus; &#228;&#x41; ',
+    '',
+])
+def test_convert_html_to_text_matches_beautifulsoup(html):
+    assert convert_html_to_text(html) == html_to_text_reference(html)
+
+
+@pytest.mark.parametrize('html', [
+    '<!-- comment -->text',
+    '<script>var a = 1;</script>text',
+    '<p>a<div>b</div></p>',
+    '<li>a</li>',
+    'a</div>b',
+    'a <b',
+    '<div/>a',
+])
+def test_unsupported_markup_is_converted_by_beautifulsoup(html):
+    parser = HtmlTextParser()
+    with pytest.raises(UnsupportedMarkup):
+        parser.feed(html)
+        parser.close()
+
+    assert convert_html_to_text(html) == html_to_text_reference(html)
+
+
+@pytest.mark.parametrize('html', ['a&#13;b', 'a&#0;b', 'a&#x1F;b', 'a < b', 'a\x00b'])
+def test_replaced_characters_are_converted_by_beautifulsoup(html):
+    assert convert_html_to_text(html) == html_to_text_reference(html)
+
+
+def test_html_text_cache_evicts_least_recently_used(monkeypatch):
+    converted = []
+
+    def convert(html):
+        converted.append(html)
+        return convert_html_to_text(html)
+
+    monkeypatch.setattr(html_text, 'convert_html_to_text', convert)
+    cache = HtmlTextCache(maxsize=2)
+
+    assert cache('<b>a</b>') == 'a'
+    assert cache('<b>b</b>') == 'b'
+    assert cache('<b>a</b>') == 'a'
+    assert cache('<b>c</b>') == 'c'
+    assert cache('<b>a</b>') == 'a'
+    assert cache('<b>b</b>') == 'b'
+
+    assert converted == ['<b>a</b>', '<b>b</b>', '<b>c</b>', '<b>b</b>']
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
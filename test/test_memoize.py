@@ -0,0 +1,80 @@
+import pendulum
+import pytest
+
+from gtfs_realtime_translators.factories import FeedBytesBuilder
+from gtfs_realtime_translators.registry import MemoizedTranslator, TranslatorRegistry
+from gtfs_realtime_translators.translators import CtaBusGtfsRealtimeTranslator, \
+    LaMetroGtfsRealtimeTranslator
+
+
+@pytest.fixture
+def cta_bus():
+    with open('test/fixtures/cta_bus.json') as f:
+        raw = f.read()
+    return raw
+
+
+@pytest.fixture
+def la_metro_rail():
+    with open('test/fixtures/la_metro_rail.json') as f:
+        raw = f.read()
+    return raw
+
+
+def test_memoized_translator_returns_cached_result(cta_bus):
+    translator = MemoizedTranslator(TranslatorRegistry.get('cta-bus'))
+
+    message = translator(cta_bus)
+    assert translator(cta_bus) is message
+    assert message == CtaBusGtfsRealtimeTranslator()(cta_bus)
+    assert (translator.hits, translator.misses) == (1, 1)
+
+
+def test_memoized_translator_keys_on_payload_and_builder(cta_bus):
+    translator = MemoizedTranslator(CtaBusGtfsRealtimeTranslator)
+
+    message = translator(cta_bus)
+    feed_bytes = translator(cta_bus, builder=FeedBytesBuilder)
+    assert isinstance(feed_bytes, bytes)
+    assert translator(cta_bus.replace('"des"', ' "des"')) is not message
+    assert translator.misses == 3
+
+
+def test_memoized_translator_evicts_least_recently_used(cta_bus):
+    translator = MemoizedTranslator(CtaBusGtfsRealtimeTranslator, max_size=2)
+
+    payloads = [cta_bus, cta_bus + ' ', cta_bus + '  ']
+    for payload in payloads:
+        translator(payload)
+
+    assert len(translator) == 2
+    translator(payloads[0])
+    assert translator.misses == 4
+
+
+def test_memoized_translator_expires_entries(cta_bus):
+    translator = MemoizedTranslator(CtaBusGtfsRealtimeTranslator, ttl=0)
+
+    translator(cta_bus)
+    translator(cta_bus)
+    assert translator.hits == 0
+
+
+def test_clock_dependent_translator_requires_opt_in():
+    with pytest.raises(ValueError):
+        MemoizedTranslator(LaMetroGtfsRealtimeTranslator, stop_id='80122')
+
+
+def test_clock_dependent_translator_keys_on_time_slot(la_metro_rail):
+    translator = MemoizedTranslator(LaMetroGtfsRealtimeTranslator, clock_resolution=60, stop_id='80122')
+
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 0), freeze=True):
+        message = translator(la_metro_rail)
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 0), freeze=True):
+        assert translator(la_metro_rail) is message
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 15, 0), freeze=True):
+        later = translator(la_metro_rail)
+
+    assert later is not message
+    assert later.entity[0].trip_update.stop_time_update[0].arrival.time == \
+        message.entity[0].trip_update.stop_time_update[0].arrival.time + 60
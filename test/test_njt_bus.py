@@ -1,5 +1,8 @@
 import pytest
 
+from google.protobuf import text_format
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
 from gtfs_realtime_translators.factories import FeedMessage
 from gtfs_realtime_translators.translators import NjtBusGtfsRealtimeTranslator
 from gtfs_realtime_translators.bindings import intersection_pb2 as intersection_gtfs_realtime
@@ -42,3 +45,39 @@ def test_njt_data(njt_bus):
     assert intersection_stop_time_update.scheduled_departure.time == 1625143140
     assert intersection_stop_time_update.stop_name == 'Journal Square Transportation Center'
     assert intersection_stop_time_update.track == 'C-1'
+
+
+def read_expected(fixture):
+    with open(f'test/fixtures/{fixture}') as f:
+        return text_format.Parse(f.read(), gtfs_realtime.FeedMessage())
+
+
+@pytest.mark.parametrize('chunk_size', [1, 100, 1 << 20])
+def test_njt_data_matches_expected_feed(njt_bus, chunk_size):
+    # njt_bus_expected.pbtxt was generated by the former xmltodict based translator
+    translator = NjtBusGtfsRealtimeTranslator(stop_list='2916, 39787')
+    chunks = [njt_bus[i:i + chunk_size] for i in range(0, len(njt_bus), chunk_size)]
+
+    assert translator(njt_bus) == read_expected('njt_bus_expected.pbtxt')
+    assert translator(njt_bus.encode('utf-8')) == read_expected('njt_bus_expected.pbtxt')
+    assert translator(chunks) == read_expected('njt_bus_expected.pbtxt')
+
+
+def test_njt_data_with_single_trip(njt_bus):
+    end = njt_bus.index('</TRIP>') + len('</TRIP>')
+    raw = njt_bus[:end] + '</SCHEDULEROWSET>'
+
+    message = NjtBusGtfsRealtimeTranslator(stop_list='2916, 39787')(raw)
+
+    assert [entity.id for entity in message.entity] == ['1']
+
+
+def test_njt_data_skips_stops_outside_the_filter_while_parsing(njt_bus):
+    # a stop that is filtered out is never translated, so its invalid time does not matter
+    raw = njt_bus.replace('<scheduleddeparturetime>9:03 AM</scheduleddeparturetime>',
+                          '<scheduleddeparturetime>not a time</scheduleddeparturetime>')
+    translator = NjtBusGtfsRealtimeTranslator(stop_list='2916, 39787')
+
+    assert translator.filtered_stop_codes == {'20883'}
+    assert translator(raw) == translator(njt_bus)
+    assert len(NjtBusGtfsRealtimeTranslator(stop_list='43283')(njt_bus).entity) == 0
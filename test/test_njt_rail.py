@@ -1,5 +1,8 @@
 import pytest
 
+from google.protobuf import text_format
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
 from gtfs_realtime_translators.factories import FeedMessage
 from gtfs_realtime_translators.translators import NjtRailGtfsRealtimeTranslator
 from gtfs_realtime_translators.bindings import intersection_pb2 as intersection_gtfs_realtime
@@ -108,3 +111,31 @@ def test_njt_data_amtrak(njt_rail):
     assert intersection_stop_time_update.track == '3'
     assert intersection_stop_time_update.scheduled_arrival.time == 1570047420
     assert intersection_stop_time_update.scheduled_departure.time == 1570047420
+
+
+def read_expected(fixture):
+    with open(f'test/fixtures/{fixture}') as f:
+        return text_format.Parse(f.read(), gtfs_realtime.FeedMessage())
+
+
+@pytest.mark.parametrize('chunk_size', [1, 100, 1 << 20])
+def test_njt_data_matches_expected_feed(njt_rail, chunk_size):
+    # njt_rail_expected.pbtxt was generated by the former xmltodict based translator
+    translator = NjtRailGtfsRealtimeTranslator()
+    chunks = [njt_rail[i:i + chunk_size] for i in range(0, len(njt_rail), chunk_size)]
+
+    assert translator(njt_rail) == read_expected('njt_rail_expected.pbtxt')
+    assert translator(njt_rail.encode('utf-8')) == read_expected('njt_rail_expected.pbtxt')
+    assert translator(chunks) == read_expected('njt_rail_expected.pbtxt')
+
+
+def test_njt_data_with_single_item_and_station_fields_last(njt_rail):
+    start = njt_rail.index('<ITEM>')
+    end = njt_rail.index('</ITEM>') + len('</ITEM>')
+    station_fields = njt_rail[njt_rail.index('<STATION_2CHAR>'):njt_rail.index('<BANNERMSGS />')]
+    raw = '<STATION><ITEMS>' + njt_rail[start:end] + '</ITEMS>' + station_fields + '</STATION>'
+
+    message = NjtRailGtfsRealtimeTranslator()(raw)
+
+    assert [entity.id for entity in message.entity] == ['1']
+    assert message.entity[0].trip_update.stop_time_update[0].stop_id == 'NP'
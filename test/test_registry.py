@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import pytest
 
 from gtfs_realtime_translators.translators import LaMetroGtfsRealtimeTranslator, \
@@ -12,7 +15,8 @@ from gtfs_realtime_translators.translators import LaMetroGtfsRealtimeTranslator,
         PathGtfsRealtimeTranslator, \
         PathNewGtfsRealtimeTranslator, \
         WcdotGtfsRealTimeTranslator, \
-        MbtaGtfsRealtimeTranslator
+        MbtaGtfsRealtimeTranslator, \
+        MnmtGtfsRealtimeTranslator
 from gtfs_realtime_translators.registry import TranslatorRegistry, TranslatorKeyWarning
 
 def test_registry_for_valid_key():
@@ -28,8 +32,131 @@ def test_registry_for_valid_key():
     assert TranslatorRegistry.get('swiftly') == SwiftlyGtfsRealtimeTranslator
     assert TranslatorRegistry.get('wcdot-bus') == WcdotGtfsRealTimeTranslator
     assert TranslatorRegistry.get('mbta') == MbtaGtfsRealtimeTranslator
+    assert TranslatorRegistry.get('mnmt') == MnmtGtfsRealtimeTranslator
     assert TranslatorRegistry.get('de-vvs-alerts') == DeVVSAlertGtfsRealtimeTranslator
 
 def test_registry_for_invalid_key():
     with pytest.warns(TranslatorKeyWarning):
         TranslatorRegistry.get('unknown-translator')
+
+def test_registry_holds_lazy_references():
+    for key, reference in TranslatorRegistry.TRANSLATORS.items():
+        assert isinstance(reference, str)
+        assert TranslatorRegistry.get(key) is TranslatorRegistry.get(key)
+
+def test_registry_import_does_not_import_translators():
+    code = ('import sys\n'
+            'from gtfs_realtime_translators.registry import TranslatorRegistry\n'
+            'assert not any(m.startswith("gtfs_realtime_translators.translators.") for m in sys.modules)\n'
+            'assert "pendulum" not in sys.modules and "bs4" not in sys.modules\n'
+            'assert "asyncio" not in sys.modules and "concurrent.futures.process" not in sys.modules\n'
+            'assert "importlib.metadata" not in sys.modules\n'
+            'TranslatorRegistry.get("cta-bus")\n'
+            'assert "gtfs_realtime_translators.translators.cta_bus" in sys.modules\n'
+            'assert "bs4" not in sys.modules and "xmltodict" not in sys.modules\n'
+            'assert "pendulum" not in sys.modules\n')
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+def test_registry_accepts_translator_classes():
+    TranslatorRegistry.TRANSLATORS['custom'] = CtaBusGtfsRealtimeTranslator
+    try:
+        assert TranslatorRegistry.get('custom') == CtaBusGtfsRealtimeTranslator
+    finally:
+        del TranslatorRegistry.TRANSLATORS['custom']
+
+@pytest.fixture
+def plugin_distribution(tmp_path, monkeypatch):
+    (tmp_path / 'acme_translators.py').write_text(
+        'class AcmeTranslator:\n'
+        '    def __call__(self, data):\n'
+        '        return data\n'
+        'class Vendors:\n'
+        '    class NestedTranslator(AcmeTranslator):\n'
+        '        pass\n')
+    dist_info = tmp_path / 'acme_translators-1.0.dist-info'
+    dist_info.mkdir()
+    (dist_info / 'METADATA').write_text('Metadata-Version: 2.1\nName: acme-translators\nVersion: 1.0\n')
+    (dist_info / 'entry_points.txt').write_text(
+        '[gtfs_realtime_translators]\n'
+        'acme-bus = acme_translators:AcmeTranslator\n'
+        'acme-nested = acme_translators:Vendors.NestedTranslator [fast]\n'
+        'cta-bus = acme_translators:AcmeTranslator\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    TranslatorRegistry.clear_cache()
+    yield
+    TranslatorRegistry.clear_cache()
+    sys.modules.pop('acme_translators', None)
+
+def test_registry_discovers_entry_point_translators(plugin_distribution):
+    assert 'acme_translators' not in sys.modules
+    assert TranslatorRegistry.plugins()['acme-bus'].value == 'acme_translators:AcmeTranslator'
+    assert 'acme_translators' not in sys.modules
+
+    translator_klass = TranslatorRegistry.get('acme-bus')
+    assert translator_klass.__name__ == 'AcmeTranslator'
+    assert TranslatorRegistry.get('acme-bus') is translator_klass
+
+    # built-in keys take precedence over plugins
+    assert TranslatorRegistry.get('cta-bus') == CtaBusGtfsRealtimeTranslator
+
+def test_registry_loads_dotted_entry_points_with_extras(plugin_distribution):
+    translator_klass = TranslatorRegistry.get('acme-nested')
+    assert translator_klass.__qualname__ == 'Vendors.NestedTranslator'
+    assert TranslatorRegistry.get('acme-nested') is translator_klass
+
+def test_registry_caches_entry_point_discovery(plugin_distribution, monkeypatch):
+    TranslatorRegistry.plugins()
+    monkeypatch.setattr('importlib.metadata.entry_points', lambda: pytest.fail('rescanned entry points'))
+    assert TranslatorRegistry.get('acme-bus').__name__ == 'AcmeTranslator'
+    with pytest.warns(TranslatorKeyWarning):
+        TranslatorRegistry.get('unknown-translator')
+
+class CountingTranslator:
+    instances = 0
+
+    def __init__(self, **config):
+        CountingTranslator.instances += 1
+        self.config = config
+
+@pytest.fixture
+def counting_translator():
+    TranslatorRegistry.TRANSLATORS['counting'] = CountingTranslator
+    TranslatorRegistry.invalidate()
+    CountingTranslator.instances = 0
+    yield
+    del TranslatorRegistry.TRANSLATORS['counting']
+    TranslatorRegistry.invalidate()
+
+def test_registry_pools_instances_per_configuration(counting_translator):
+    hits, misses = TranslatorRegistry.instance_hits, TranslatorRegistry.instance_misses
+
+    translator = TranslatorRegistry.get_instance('counting', stop_id='1', filters={'a': 1, 'b': 2})
+    assert TranslatorRegistry.get_instance('counting', filters={'b': 2, 'a': 1}, stop_id='1') is translator
+    other = TranslatorRegistry.get_instance('counting', stop_id='2')
+
+    assert other is not translator
+    assert CountingTranslator.instances == 2
+    assert TranslatorRegistry.instance_hits - hits == 1
+    assert TranslatorRegistry.instance_misses - misses == 2
+
+def test_registry_instance_pool_is_bounded_and_invalidated(counting_translator, monkeypatch):
+    monkeypatch.setattr(TranslatorRegistry, 'INSTANCE_POOL_SIZE', 2)
+    first = TranslatorRegistry.get_instance('counting', stop_id='1')
+    TranslatorRegistry.get_instance('counting', stop_id='2')
+    TranslatorRegistry.get_instance('counting', stop_id='3')
+    assert TranslatorRegistry.get_instance('counting', stop_id='1') is not first
+
+    translator = TranslatorRegistry.get_instance('counting', stop_id='3')
+    TranslatorRegistry.invalidate('counting')
+    assert TranslatorRegistry.get_instance('counting', stop_id='3') is not translator
+
+def test_registry_pools_de_vvs_translator():
+    TranslatorRegistry.invalidate('de-vvs-alerts')
+    translator = TranslatorRegistry.get_instance('de-vvs-alerts', gtfsfile='test/fixtures/de_vvs.gtfs.zip')
+    assert isinstance(translator, DeVVSAlertGtfsRealtimeTranslator)
+    assert TranslatorRegistry.get_instance('de-vvs-alerts', gtfsfile='test/fixtures/de_vvs.gtfs.zip') is translator
+    TranslatorRegistry.invalidate('de-vvs-alerts')
+
+def test_registry_instance_for_invalid_key():
+    with pytest.warns(TranslatorKeyWarning):
+        assert TranslatorRegistry.get_instance('unknown-translator') is None
@@ -0,0 +1,97 @@
+import gzip
+import http.client
+import shutil
+import threading
+
+import pytest
+
+from google.transit import gtfs_realtime_pb2 as gtfs_realtime
+
+from gtfs_realtime_translators.registry import TranslatorRegistry
+from gtfs_realtime_translators.server import DirectorySource, FeedApp, FileSource, create_server
+
+
+@pytest.fixture
+def server(tmp_path):
+    shutil.copy('test/fixtures/cta_bus.json', tmp_path / 'cta-bus.json')
+    shutil.copy('test/fixtures/njt_rail.xml', tmp_path / 'njt-rail.xml')
+    (tmp_path / 'mbta.json').write_text('not json')
+    server = create_server(FeedApp(DirectorySource(str(tmp_path))), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, path, method='GET', headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=10)
+    connection.request(method, path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_server_serves_translated_feed_with_etag(server):
+    response, body = request(server, '/feeds/cta-bus')
+
+    with open('test/fixtures/cta_bus.json') as f:
+        expected = TranslatorRegistry.get('cta-bus')()(f.read())
+    message = gtfs_realtime.FeedMessage()
+    message.ParseFromString(body)
+
+    assert response.status == 200
+    assert response.getheader('Content-Type') == 'application/x-protobuf'
+    assert response.getheader('ETag').startswith('"')
+    assert message == expected
+
+
+def test_server_honors_if_none_match(server):
+    response, _ = request(server, '/feeds/njt-rail')
+    etag = response.getheader('ETag')
+
+    response, body = request(server, '/feeds/njt-rail', headers={'If-None-Match': f'"other", W/{etag}'})
+    assert response.status == 304
+    assert response.getheader('ETag') == etag
+    assert body == b''
+
+    response, _ = request(server, '/feeds/njt-rail', headers={'If-None-Match': '"other"'})
+    assert response.status == 200
+
+
+def test_server_serves_precompressed_gzip(server):
+    _, body = request(server, '/feeds/cta-bus')
+    response, gzip_body = request(server, '/feeds/cta-bus', headers={'Accept-Encoding': 'br, gzip'})
+
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert gzip.decompress(gzip_body) == body
+
+    response, _ = request(server, '/feeds/cta-bus', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert response.getheader('Content-Encoding') is None
+
+    response, head_body = request(server, '/feeds/cta-bus', method='HEAD', headers={'Accept-Encoding': 'gzip'})
+    assert response.status == 200
+    assert head_body == b''
+    assert int(response.getheader('Content-Length')) == len(gzip_body)
+
+
+def test_server_errors(server):
+    assert request(server, '/feeds/unknown-translator')[0].status == 404
+    assert request(server, '/feeds/cta-subway')[0].status == 404
+    assert request(server, '/other')[0].status == 404
+    response, body = request(server, '/feeds/mbta')
+    assert response.status == 502
+    assert body.startswith(b'JSONDecodeError')
+
+
+def test_feed_app_caches_serialized_feed_per_payload(tmp_path):
+    payload = tmp_path / 'cta_bus.json'
+    shutil.copy('test/fixtures/cta_bus.json', payload)
+    app = FeedApp(FileSource(str(payload), key='cta-bus'), cache_ttl=60)
+
+    feed = app.get_feed('cta-bus')
+    assert app.get_feed('cta-bus') is feed
+
+    payload.write_text('{"bustime-response": {"prd": []}}')
+    assert app.get_feed('cta-bus') is not feed
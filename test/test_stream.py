@@ -0,0 +1,157 @@
+import io
+import json
+
+import pendulum
+import pytest
+
+from gtfs_realtime_translators.factories import FeedMessageBuilder
+from gtfs_realtime_translators.parsers import JsonStream, iter_xml_elements, xml_dict, xml_text
+from gtfs_realtime_translators.translators import MbtaGtfsRealtimeTranslator, PathNewGtfsRealtimeTranslator
+from translator_cases import read_fixture
+
+STREAMING_FIXTURES = [
+    (MbtaGtfsRealtimeTranslator, 'mbta_bus.json'),
+    (MbtaGtfsRealtimeTranslator, 'mbta_subway.json'),
+    (MbtaGtfsRealtimeTranslator, 'mbta_subway_missing_static.json'),
+    (PathNewGtfsRealtimeTranslator, 'path_new.json'),
+]
+
+
+def chunked(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+def reversed_keys(value):
+    if isinstance(value, dict):
+        return {key: reversed_keys(value[key]) for key in reversed(list(value))}
+    if isinstance(value, list):
+        return [reversed_keys(item) for item in value]
+    return value
+
+
+def walk(stream):
+    char = stream.peek()
+    if char == '{':
+        return {key: walk(stream) for key in stream.iter_object()}
+    if char == '[':
+        return [walk(stream) for _ in stream.iter_array()]
+    return stream.read_value()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 64, 1 << 20])
+def test_json_stream_decodes_fixtures(chunk_size):
+    for fixture in ('mbta_subway.json', 'path_new.json', 'la_metro_rail.json'):
+        raw = read_fixture(fixture).encode('utf-8')
+        stream = JsonStream(chunked(raw, chunk_size))
+        assert walk(stream) == json.loads(raw)
+        stream.close()
+
+
+def test_json_stream_splits_numbers_and_characters_across_chunks():
+    stream = JsonStream([b'[12', b'34, -71.', b'03, 1e', b'3, "Stra\xc3', b'\x9fe", tr', b'ue]'])
+    assert list(stream.iter_items()) == [1234, -71.03, 1000.0, 'Straße', True]
+
+
+def test_json_stream_skips_unconsumed_values():
+    stream = JsonStream(io.BytesIO(b'{"a": [1, {"b": 2}], "c": {"d": [3]}, "e": 4}'), chunk_size=3)
+    keys = []
+    for key in stream.iter_object():
+        keys.append(key)
+        if key == 'e':
+            assert stream.read_value() == 4
+    stream.close()
+    assert keys == ['a', 'c', 'e']
+
+
+@pytest.mark.parametrize('document', ['{"a": 1,}', '[1 2]', '{"a" 1}', '[1]x', '', '[1,', '[1.]', '{"a": 1'])
+def test_json_stream_rejects_malformed_documents(document):
+    for chunk_size in (1, 100):
+        with pytest.raises(json.JSONDecodeError):
+            stream = JsonStream(chunked(document, chunk_size))
+            walk(stream)
+            stream.close()
+
+
+@pytest.mark.parametrize('translator_klass,fixture', STREAMING_FIXTURES)
+@pytest.mark.parametrize('chunk_size', [1, 100, 4096, 1 << 20])
+def test_streaming_matches_whole_document(translator_klass, fixture, chunk_size):
+    raw = read_fixture(fixture).encode('utf-8')
+    translator = translator_klass()
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 35), freeze=True):
+        assert translator.translate_stream(chunked(raw, chunk_size)) == translator(raw)
+
+
+@pytest.mark.parametrize('translator_klass,fixture', STREAMING_FIXTURES)
+def test_streaming_does_not_depend_on_key_order(translator_klass, fixture):
+    raw = json.dumps(reversed_keys(json.loads(read_fixture(fixture))))
+    translator = translator_klass()
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 35), freeze=True):
+        assert translator.translate_stream(io.StringIO(raw)) == translator(read_fixture(fixture))
+
+
+def recording_stream(raw, chunk_size):
+    """
+    Returns the chunks of `raw`, a body yielding them and a builder class
+    recording how many chunks had been received when its first entity was
+    added (in `first_entity_at`).
+    """
+    chunks = list(chunked(raw, chunk_size))
+    received = []
+
+    def body():
+        for chunk in chunks:
+            received.append(chunk)
+            yield chunk
+
+    class RecordingBuilder(FeedMessageBuilder):
+        first_entity_at = None
+
+        def add_trip_update(self, *args, **kwargs):
+            if RecordingBuilder.first_entity_at is None:
+                RecordingBuilder.first_entity_at = len(received)
+            return super().add_trip_update(*args, **kwargs)
+
+    return chunks, body(), RecordingBuilder
+
+
+def test_streaming_builds_entities_before_the_body_has_arrived():
+    chunks, body, RecordingBuilder = recording_stream(read_fixture('path_new.json').encode('utf-8'), 1024)
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 35), freeze=True):
+        PathNewGtfsRealtimeTranslator().translate_stream(body, builder=RecordingBuilder)
+    assert RecordingBuilder.first_entity_at < len(chunks) / 2
+
+
+def test_mbta_streaming_buffers_predictions_until_included():
+    raw = read_fixture('mbta_subway.json').encode('utf-8')
+    assert raw.index(b'"data"') < raw.index(b'"included"')
+    chunks, body, RecordingBuilder = recording_stream(raw, 64)
+
+    translator = MbtaGtfsRealtimeTranslator()
+    with pendulum.travel_to(pendulum.datetime(2024, 3, 17, 0, 14, 35), freeze=True):
+        feed = translator.translate_stream(body, builder=RecordingBuilder)
+        assert feed == translator(raw)
+    # with `data` first, no entity can be built before `included` has been read
+    assert RecordingBuilder.first_entity_at == len(chunks)
+
+
+def test_streaming_requires_stations():
+    with pytest.raises(KeyError):
+        PathNewGtfsRealtimeTranslator().translate_stream(b'{"messageTimestamp": "2021-11-01T19:51:31"}')
+
+
+def test_xml_elements_are_yielded_and_discarded_one_at_a_time():
+    document = (b'<ROOT><NAME> Station </NAME><SKIPPED><A>1</A></SKIPPED>'
+                b'<ITEMS><ITEM><ID>1</ID><EMPTY> </EMPTY></ITEM><ITEM><ID>2</ID></ITEM></ITEMS></ROOT>')
+    paths = {('ROOT', 'NAME'), ('ROOT', 'ITEMS', 'ITEM')}
+    results = []
+    elements = []
+    for path, element in iter_xml_elements(chunked(document, 3), paths):
+        results.append((path, xml_text(element) if path[-1] == 'NAME' else xml_dict(element)))
+        elements.append(element)
+
+    assert results == [
+        (('ROOT', 'NAME'), 'Station'),
+        (('ROOT', 'ITEMS', 'ITEM'), {'ID': '1', 'EMPTY': None}),
+        (('ROOT', 'ITEMS', 'ITEM'), {'ID': '2'}),
+    ]
+    assert all(len(element) == 0 and element.text is None for element in elements)
@@ -0,0 +1,94 @@
+import datetime
+
+import pendulum
+import pytest
+
+from gtfs_realtime_translators.parsers import FormatParser, LocalTimeZone, parse_iso8601
+
+NJT_RAIL = FormatParser('DD-MMM-YYYY HH:mm:ss A')
+NJT_BUS = FormatParser('DD-MMM-YY HH:mm A')
+
+TIMEZONES = ['America/New_York', 'America/Chicago', 'Europe/Berlin']
+
+
+def transition_days(timezone, years):
+    """
+    Yields the days around each UTC offset change of `timezone` in `years`.
+    """
+    zone = LocalTimeZone(timezone).zone
+    for year in years:
+        day = datetime.date(year, 1, 1)
+        while day.year == year:
+            start = datetime.datetime(day.year, day.month, day.day, tzinfo=zone).utcoffset()
+            end = datetime.datetime(day.year, day.month, day.day, 23, 59, tzinfo=zone).utcoffset()
+            if start != end:
+                yield from (day - datetime.timedelta(days=1), day, day + datetime.timedelta(days=1))
+            day += datetime.timedelta(days=1)
+
+
+def local_times(timezone, years=(2021, 2024), step_minutes=15):
+    for day in transition_days(timezone, years):
+        for minutes in range(0, 24 * 60, step_minutes):
+            yield datetime.datetime(day.year, day.month, day.day, minutes // 60, minutes % 60, minutes % 7)
+
+
+@pytest.mark.parametrize('timezone', TIMEZONES)
+def test_format_parsers_match_pendulum_around_dst_changes(timezone):
+    for local_time in local_times(timezone):
+        text = local_time.strftime('%d-%b-%Y %I:%M:%S %p')
+        assert NJT_RAIL.timestamp(text, tz=timezone) == \
+            int(pendulum.from_format(text, NJT_RAIL.fmt, tz=timezone).timestamp()), text
+
+        text = local_time.strftime('%d-%b-%y ') + str(int(local_time.strftime('%I'))) + local_time.strftime(':%M %p')
+        assert NJT_BUS.timestamp(text, tz=timezone) == \
+            int(pendulum.from_format(text, NJT_BUS.fmt, tz=timezone).timestamp()), text
+
+
+@pytest.mark.parametrize('timezone', TIMEZONES)
+def test_parse_iso8601_matches_pendulum_around_dst_changes(timezone):
+    for local_time in local_times(timezone):
+        for text in (local_time.strftime('%Y-%m-%d %H:%M:%S.000'), local_time.strftime('%Y%m%d %H:%M')):
+            assert parse_iso8601(text, tz=timezone) == int(pendulum.parse(text, tz=timezone).timestamp()), text
+
+
+@pytest.mark.parametrize('text', [
+    '20191008 10:38',
+    '2019-10-07T14:29:02',
+    '2019-10-07 14:29:02.5',
+    '2023-05-03T16:05:15-04:00',
+    '2023-05-03T16:05:15-0400',
+    '2023-05-03T16:05:15Z',
+    '2023-05-03T16:05+05:30',
+    '2019-10-07',
+    '2019-10-07T14',
+])
+def test_parse_iso8601_matches_pendulum(text):
+    assert parse_iso8601(text) == int(pendulum.parse(text).timestamp())
+    assert parse_iso8601(text, tz='America/Chicago') == \
+        int(pendulum.parse(text, tz='America/Chicago').timestamp())
+
+
+def test_format_without_date_uses_today():
+    parser = FormatParser('HH:mm')
+    with pendulum.travel_to(pendulum.datetime(2020, 11, 1, 12, 0, 0), freeze=True):
+        for text in ('0:30', '01:30', '13:05', '23:59'):
+            assert parser.timestamp(text, tz='America/New_York') == \
+                int(pendulum.from_format(text, 'HH:mm', tz='America/New_York').timestamp())
+
+
+@pytest.mark.parametrize('parser, text', [
+    (NJT_BUS, '31-Feb-21 8:39 AM'),
+    (NJT_BUS, '12-Jul-21 13:39 PM'),
+    (NJT_BUS, '01-JUL-21 8:39 AM'),
+    (NJT_RAIL, '02-Oct-2019 03:61:00 PM'),
+])
+def test_invalid_timestamps_raise_like_pendulum(parser, text):
+    with pytest.raises(ValueError):
+        pendulum.from_format(text, parser.fmt, tz='America/New_York')
+    with pytest.raises(ValueError):
+        parser.timestamp(text, tz='America/New_York')
+
+
+def test_unsupported_format_tokens_are_rejected():
+    with pytest.raises(ValueError):
+        FormatParser('dddd HH:mm')
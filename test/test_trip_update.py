@@ -2,7 +2,9 @@ from collections.abc import Iterable
 
 from google.transit import gtfs_realtime_pb2 as gtfs_realtime
 
-from gtfs_realtime_translators.factories import TripUpdate, FeedMessage
+from gtfs_realtime_translators.factories import TripUpdate, FeedMessage, FeedMessageBuilder, IntersectionExtensions, \
+    ArrivalRecord
+from gtfs_realtime_translators.bindings import intersection_pb2 as intersection_gtfs_realtime
 
 
 def test_models_schema_output():
@@ -73,3 +75,130 @@ def test_arrival_time_is_used_if_no_departure_time():
 
     assert entity.trip_update.stop_time_update[0].arrival.time == arrival_time
     assert entity.trip_update.stop_time_update[0].departure.time == arrival_time
+
+def test_feed_message_builder_matches_feed_message_create():
+    kwargs = dict(entity_id='1',
+                  arrival_time=1234,
+                  trip_id='1234',
+                  stop_id='2345',
+                  route_id='3456',
+                  headsign='Downtown',
+                  track='2',
+                  run_number=415)
+
+    expected = FeedMessage.create(entities=[TripUpdate.create(**kwargs)])
+
+    builder = FeedMessageBuilder()
+    entity = builder.add_trip_update(**kwargs)
+    message = builder.build()
+
+    assert entity is message.entity[0]
+    assert message.header.gtfs_realtime_version == FeedMessage.VERSION
+    assert message.SerializeToString() == expected.SerializeToString()
+
+def test_feed_message_builder_keeps_empty_stop_time_events():
+    builder = FeedMessageBuilder()
+    builder.add_trip_update(entity_id='1', stop_id='2345')
+    stop_time_update = builder.build().entity[0].trip_update.stop_time_update[0]
+
+    assert stop_time_update.HasField('arrival')
+    assert stop_time_update.HasField('departure')
+    assert not stop_time_update.arrival.HasField('time')
+
+def test_feed_message_builder_groups_stop_time_updates_by_trip():
+    builder = FeedMessageBuilder(group_by_trip=True)
+    builder.add_trip_update(entity_id='1', trip_id='A', route_id='1', stop_id='10', arrival_time=100, headsign='North')
+    builder.add_trip_update(entity_id='2', trip_id='B', route_id='1', stop_id='10', arrival_time=150)
+    builder.add_trip_update(entity_id='3', trip_id='A', route_id='1', stop_id='11', arrival_time=200, headsign='North')
+    message = builder.build()
+
+    assert len(message.entity) == 2
+    entity = message.entity[0]
+    assert entity.id == '1'
+    assert entity.trip_update.trip.trip_id == 'A'
+    assert [stu.stop_id for stu in entity.trip_update.stop_time_update] == ['10', '11']
+    assert [stu.arrival.time for stu in entity.trip_update.stop_time_update] == [100, 200]
+    assert len(message.entity[1].trip_update.stop_time_update) == 1
+
+def test_feed_message_builder_groups_by_block_id_without_trip_id():
+    builder = FeedMessageBuilder(group_by_trip=True)
+    builder.add_trip_update(entity_id='1', block_id='3821', stop_id='NY', arrival_time=100)
+    builder.add_trip_update(entity_id='2', block_id='3821', stop_id='NP', arrival_time=200)
+    builder.add_trip_update(entity_id='3', stop_id='NY', arrival_time=300)
+    builder.add_trip_update(entity_id='4', stop_id='NP', arrival_time=400)
+    message = builder.build()
+
+    assert [len(entity.trip_update.stop_time_update) for entity in message.entity] == [2, 1, 1]
+
+def test_extension_writer_fields_are_derived_from_descriptors():
+    assert IntersectionExtensions.STOP_TIME_UPDATE.keys == ('track',
+                                                            'scheduled_arrival_time',
+                                                            'scheduled_departure_time',
+                                                            'stop_name')
+    assert IntersectionExtensions.VEHICLE_DESCRIPTOR.keys == ('run_number',)
+    assert 'headsign' in IntersectionExtensions.TRIP_UPDATE.keys
+
+def test_extension_writer_only_sets_present_fields():
+    stop_time_update = gtfs_realtime.TripUpdate.StopTimeUpdate()
+    IntersectionExtensions.STOP_TIME_UPDATE.write(stop_time_update,
+                                                  ArrivalRecord(entity_id='1', stop_id='1', track='', stop_name='Maverick'))
+    assert stop_time_update.HasExtension(intersection_gtfs_realtime.intersection_stop_time_update)
+
+    extension = stop_time_update.Extensions[intersection_gtfs_realtime.intersection_stop_time_update]
+    assert extension.stop_name == 'Maverick'
+    assert not extension.HasField('track')
+    assert not extension.HasField('scheduled_arrival')
+
+    trip_update = gtfs_realtime.TripUpdate()
+    assert IntersectionExtensions.TRIP_UPDATE.write(trip_update, ArrivalRecord(entity_id='1', stop_id='1')) is None
+    assert not trip_update.HasExtension(intersection_gtfs_realtime.intersection_trip_update)
+
+def test_trip_update_from_arrival_record_matches_keyword_arguments():
+    kwargs = dict(entity_id='1',
+                  arrival_time=1234,
+                  departure_time=2345,
+                  trip_id='1234',
+                  stop_id='2345',
+                  route_id='3456',
+                  direction_id=0,
+                  scheduled_arrival_time=1200,
+                  stop_name='Maverick',
+                  run_number=415)
+
+    record = ArrivalRecord(**kwargs)
+    assert record.to_dict() == kwargs
+    assert TripUpdate.create(record) == TripUpdate.create(**kwargs)
+
+    builder = FeedMessageBuilder()
+    builder.add_trip_update(record)
+    assert builder.build().entity[0] == TripUpdate.create(**kwargs)
+
+def test_arrival_record_uses_delays_when_given():
+    record = ArrivalRecord(entity_id='1', stop_id='2345', arrival_delay=None, departure_delay=60)
+    stop_time_update = TripUpdate.create(record).trip_update.stop_time_update[0]
+
+    assert record.uses_delay
+    assert stop_time_update.HasField('arrival')
+    assert not stop_time_update.arrival.HasField('delay')
+    assert stop_time_update.departure.delay == 60
+
+def test_trip_update_ignores_unknown_keyword_arguments():
+    assert TripUpdate.create(entity_id='1', stop_id='2345', arrival_time=1234, platform='2') == \
+        TripUpdate.create(entity_id='1', stop_id='2345', arrival_time=1234)
+
+def test_trip_update_uses_delays_when_arrival_delay_is_passed():
+    # as before ArrivalRecord, the presence of `arrival_delay` selects delays
+    stop_time_update = TripUpdate.create(entity_id='1', stop_id='2345', arrival_time=1234,
+                                         arrival_delay=None).trip_update.stop_time_update[0]
+    assert stop_time_update.HasField('arrival') and stop_time_update.HasField('departure')
+    assert not stop_time_update.arrival.HasField('time')
+    assert not stop_time_update.arrival.HasField('delay')
+
+    stop_time_update = TripUpdate.create(entity_id='1', stop_id='2345', arrival_time=1234,
+                                         departure_delay=60).trip_update.stop_time_update[0]
+    assert stop_time_update.arrival.time == stop_time_update.departure.time == 1234
+    assert not stop_time_update.departure.HasField('delay')
+
+def test_arrival_record_is_slotted():
+    record = ArrivalRecord(entity_id='1', stop_id='2345')
+    assert not hasattr(record, '__dict__')
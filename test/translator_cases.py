@@ -0,0 +1,40 @@
+"""
+Translators with a fixture and configuration for each, shared by the tests
+that compare alternative output paths across all fixtures.
+"""
+from gtfs_realtime_translators.translators import CtaBusGtfsRealtimeTranslator, \
+    CtaSubwayGtfsRealtimeTranslator, DeVVSAlertGtfsRealtimeTranslator, LaMetroGtfsRealtimeTranslator, MbtaGtfsRealtimeTranslator, \
+    MnmtGtfsRealtimeTranslator, MtaSubwayGtfsRealtimeTranslator, NjtBusGtfsRealtimeTranslator, \
+    NjtRailGtfsRealtimeTranslator, PathGtfsRealtimeTranslator, PathNewGtfsRealtimeTranslator, \
+    SeptaRegionalRailTranslator, SwiftlyGtfsRealtimeTranslator, WcdotGtfsRealTimeTranslator
+
+
+TRANSLATOR_FIXTURES = [
+    (lambda: CtaBusGtfsRealtimeTranslator(), 'cta_bus.json'),
+    (lambda: CtaSubwayGtfsRealtimeTranslator(), 'cta_subway.json'),
+    (lambda: LaMetroGtfsRealtimeTranslator(stop_id='80122'), 'la_metro_rail.json'),
+    (lambda: MbtaGtfsRealtimeTranslator(), 'mbta_bus.json'),
+    (lambda: MbtaGtfsRealtimeTranslator(), 'mbta_subway.json'),
+    (lambda: MbtaGtfsRealtimeTranslator(), 'mbta_subway_missing_static.json'),
+    (lambda: MnmtGtfsRealtimeTranslator(), 'mnmt.json'),
+    (lambda: MtaSubwayGtfsRealtimeTranslator(), 'mta_subway.json'),
+    (lambda: NjtBusGtfsRealtimeTranslator(stop_list='2916, 39787'), 'njt_bus.xml'),
+    (lambda: NjtRailGtfsRealtimeTranslator(), 'njt_rail.xml'),
+    (lambda: PathGtfsRealtimeTranslator(), 'path_rail.json'),
+    (lambda: PathNewGtfsRealtimeTranslator(), 'path_new.json'),
+    (lambda: SeptaRegionalRailTranslator(stop_id='90004', filter_seconds=10**9), 'septa_regional_rail.json'),
+    (lambda: SwiftlyGtfsRealtimeTranslator(stop_id='1'), 'vta_rail.json'),
+    (lambda: SwiftlyGtfsRealtimeTranslator(stop_id='20646'), 'septa_trolley_lines.json'),
+    (lambda: WcdotGtfsRealTimeTranslator(stop_id='5142'), 'wcdot_bus.json'),
+]
+
+ALERT_TRANSLATOR_FIXTURES = [
+    (lambda: DeVVSAlertGtfsRealtimeTranslator('test/fixtures/de_vvs.gtfs.zip'),
+     'de_vvs_gtfsr-alerts_20240317001430.pb'),
+]
+
+
+def read_fixture(fixture):
+    # serialized GTFS-realtime fixtures are binary
+    with open(f'test/fixtures/{fixture}', 'rb' if fixture.endswith('.pb') else 'r') as f:
+        return f.read()